@@ -0,0 +1,13 @@
+import time
+
+
+def main():
+    "Point d'entrée : mesure le coût des imports avant de lancer l'appli"
+    import_start = time.perf_counter_ns()
+    from hapsight.mainwindow import main as run
+
+    run(import_ns=(import_start, time.perf_counter_ns()))
+
+
+if __name__ == "__main__":
+    main()
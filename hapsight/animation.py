@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from hapsight.tracing import traced
+
+# Palette séquentielle (du plus bas au plus haut score), dans les tons de la carte
+PALETTE = ["#EBF5FB", "#AED6F1", "#5DADE2", "#2E86C1", "#1F618D", "#154360"]
+NO_DATA = "-"
+
+# Noms des pays dans le GeoJSON -> noms dans les données
+GEO_NAME_ALIASES = {
+    "United States of America": "United States",
+    "Tanzania": "United Republic of Tanzania",
+    "Congo": "Congo (Brazzaville)",
+    "Democratic Republic of the Congo": "Congo (Kinshasa)",
+}
+DATA_TO_GEO = {data: geo for geo, data in GEO_NAME_ALIASES.items()}
+
+
+@dataclass
+class YearFrames:
+    """Images de l'animation, calculées une fois par version des données.
+
+    ``codes[year]`` contient un caractère par pays (indice de couleur ou
+    ``NO_DATA``), dans l'ordre de ``names`` ; ``frames[year]`` est l'appel
+    JavaScript complet correspondant, prêt à envoyer à la carte.
+    """
+
+    years: list[int]
+    names: list[str]
+    edges: list[float]
+    codes: dict[int, str] = field(default_factory=dict)
+    frames: dict[int, str] = field(default_factory=dict)
+
+    def legend(self) -> list[tuple[str, str]]:
+        "Libellés des classes et couleurs associées"
+        bounds = ["min", *(f"{e:.2f}" for e in self.edges), "max"]
+        return [
+            (f"{lo} – {hi}", color)
+            for lo, hi, color in zip(bounds[:-1], bounds[1:], PALETTE)
+        ]
+
+    def setup_js(self) -> str:
+        "Appel d'initialisation (noms, palette, légende) envoyé une seule fois"
+        labels = [label for label, _ in self.legend()]
+        return (
+            f"hapsightSetup({json.dumps(self.names)}, "
+            f"{json.dumps(PALETTE)}, {json.dumps(labels)});"
+        )
+
+
+@traced("animation.frames")
+def compute_year_frames(
+    df: pd.DataFrame, column: str = "happiness_score"
+) -> YearFrames:
+    """Couleurs de chaque pays pour chaque année.
+
+    Les bornes des classes sont des quantiles sur toutes les années, pour
+    que les couleurs restent comparables d'une image à l'autre.
+    """
+    table = df.pivot_table(
+        index="Year", columns="Country", values=column, aggfunc="first"
+    )
+    years = [int(y) for y in table.index]
+    names = [DATA_TO_GEO.get(str(c), str(c)) for c in table.columns]
+
+    values = table.to_numpy(dtype=float)
+    finite = values[np.isfinite(values)]
+    if finite.size == 0:
+        return YearFrames(years, names, [])
+    quantiles = np.linspace(0, 1, len(PALETTE) + 1)[1:-1]
+    edges = np.unique(np.quantile(finite, quantiles))
+
+    bins = np.searchsorted(edges, values, side="right")
+    chars = np.array([str(i) for i in range(len(PALETTE))] + [NO_DATA])
+    grid = chars[np.where(np.isfinite(values), bins, len(PALETTE))]
+
+    codes = {year: "".join(row) for year, row in zip(years, grid)}
+    frames = {year: f'hapsightFrame({year}, "{c}");' for year, c in codes.items()}
+    return YearFrames(years, names, [float(e) for e in edges], codes, frames)
+
+
+# Fonctions JavaScript injectées dans la page folium
+FRAME_JS = """
+var hapsightNames = [], hapsightPalette = [], hapsightColors = null, hapsightLegend = null;
+var hapsightYear = null, hapsightSelected = null, hapsightBrushed = null;
+function hapsightStyle(f) {
+    if (f.properties.name === hapsightSelected) {
+        return { fillColor: '#2E86C1', color: '#154360', weight: 2, fillOpacity: 0.9 };
+    }
+    var base = { color: '#5DADE2', weight: 0.7, fillOpacity: 0.7, fillColor: '#D6EAF8' };
+    if (hapsightColors) {
+        base.fillColor = hapsightColors[f.properties.name] || '#EEEEEE';
+        base.fillOpacity = 0.85;
+    }
+    if (hapsightBrushed && !hapsightBrushed[f.properties.name]) { base.fillOpacity = 0.15; }
+    return base;
+}
+function hapsightBrush(names) {
+    hapsightBrushed = null;
+    if (names) {
+        hapsightBrushed = {};
+        for (var i = 0; i < names.length; i++) { hapsightBrushed[names[i]] = true; }
+    }
+    geojsonLayer.setStyle(hapsightStyle);
+}
+function hapsightSetup(names, palette, labels) {
+    hapsightNames = names;
+    hapsightPalette = palette;
+    if (hapsightLegend) { hapsightLegend.remove(); }
+    hapsightLegend = L.control({ position: 'bottomright' });
+    hapsightLegend.onAdd = function () {
+        var div = L.DomUtil.create('div', 'hapsight-legend');
+        div.style.cssText = 'background: white; padding: 6px; font: 11px sans-serif; border-radius: 4px;';
+        var html = '<b id="hapsight-year"></b><br>';
+        for (var i = labels.length - 1; i >= 0; i--) {
+            html += '<i style="display:inline-block;width:12px;height:12px;background:' + palette[i] + '"></i> ' + labels[i] + '<br>';
+        }
+        div.innerHTML = html;
+        return div;
+    };
+    hapsightLegend.addTo(%(map)s);
+}
+function hapsightFrame(year, codes) {
+    var colors = {};
+    for (var i = 0; i < codes.length; i++) {
+        var c = codes.charCodeAt(i) - 48;
+        if (c >= 0 && c < hapsightPalette.length) { colors[hapsightNames[i]] = hapsightPalette[c]; }
+    }
+    hapsightColors = colors;
+    hapsightYear = year;
+    geojsonLayer.setStyle(hapsightStyle);
+    var label = document.getElementById('hapsight-year');
+    if (label) { label.textContent = year; }
+}
+"""
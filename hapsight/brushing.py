@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from matplotlib.path import Path
+from PySide6.QtCore import QObject, Signal
+
+COUNTRY_COL = "Country"
+YEAR_COL = "Year"
+
+
+@dataclass(frozen=True)
+class BrushSelection:
+    "Pays sélectionnés dans le nuage de points, pour une année"
+
+    countries: frozenset[str]
+    year: int | None = None
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        "Lignes (pays, année) sélectionnées, en une passe vectorisée"
+        keep = df[COUNTRY_COL].isin(self.countries).to_numpy()
+        if self.year is not None and YEAR_COL in df.columns:
+            years = pd.to_numeric(df[YEAR_COL], errors="coerce")
+            keep &= (years == self.year).to_numpy(dtype=bool, na_value=False)
+        return keep
+
+
+def points_in_polygon(points: np.ndarray, vertices) -> np.ndarray:
+    "Points (n × 2) à l'intérieur du polygone : un seul contains_points"
+    if len(vertices) < 3 or not len(points):
+        return np.zeros(len(points), dtype=bool)
+    return Path(np.asarray(vertices, dtype=float)).contains_points(points)
+
+
+def points_in_rect(points: np.ndarray, corner1, corner2) -> np.ndarray:
+    "Points (n × 2) dans le rectangle défini par deux coins opposés"
+    low = np.minimum(corner1, corner2)
+    high = np.maximum(corner1, corner2)
+    return np.all((points >= low) & (points <= high), axis=1)
+
+
+class Brush(QObject):
+    """Sélection partagée entre le nuage de points, la table et la carte.
+
+    ``changed`` transmet la nouvelle ``BrushSelection`` (None si effacée).
+    """
+
+    changed = Signal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.selection: BrushSelection | None = None
+
+    def select(self, countries, year: int | None = None):
+        self.selection = BrushSelection(frozenset(countries), year)
+        self.changed.emit(self.selection)
+
+    def clear(self):
+        if self.selection is not None:
+            self.selection = None
+            self.changed.emit(None)
@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+from urllib.parse import urlsplit
+
+ASSET_SCHEME = "hapsight"
+GEOJSON_URL = "https://raw.githubusercontent.com/python-visualization/folium/main/examples/data/world-countries.json"
+TILE_URL = "https://{s}.basemaps.cartocdn.com/light_all/{z}/{x}/{y}.png"
+TILES_FILE = "tiles.mbtiles"
+HTML_CACHE_LIMIT = 8
+
+# Tuiles CartoDB positron demandées par Leaflet (sous-domaine et @2x compris)
+TILE_RE = re.compile(
+    r"^https?://[a-d]\.basemaps\.cartocdn\.com/light_all/(\d+)/(\d+)/(\d+)(?:@2x)?\.png$"
+)
+
+
+def cache_dir() -> str:
+    "Dossier du cache local (HAPSIGHT_CACHE_DIR ou ~/.cache/hapsight)"
+    path = os.environ.get("HAPSIGHT_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "hapsight"
+    )
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+# --- Fichiers JS/CSS/GeoJSON ---
+
+
+def asset_name(url: str) -> str:
+    "Nom local stable d'une ressource distante"
+    base = os.path.basename(urlsplit(url).path) or "index"
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:10]
+    return f"{digest}-{base}"
+
+
+def asset_path(url: str) -> str:
+    return os.path.join(cache_dir(), "assets", asset_name(url))
+
+
+def local_asset_url(url: str) -> str:
+    "URL servie par le schéma local si la ressource est en cache, sinon ``url``"
+    if os.path.exists(asset_path(url)):
+        return f"{ASSET_SCHEME}://assets/{asset_name(url)}"
+    return url
+
+
+def read_asset(name: str) -> bytes | None:
+    if os.path.basename(name) != name:
+        return None
+    path = os.path.join(cache_dir(), "assets", name)
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def store_asset(url: str, data: bytes) -> str:
+    path = asset_path(url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return path
+
+
+# --- Page HTML de la carte ---
+
+
+def geometry_hash(url: str) -> str:
+    "Empreinte du GeoJSON : contenu si en cache, sinon son URL"
+    path = asset_path(url)
+    digest = hashlib.sha256()
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    else:
+        digest.update(url.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def map_cache_key(**parts) -> str:
+    "Clé stable à partir de valeurs sérialisables en JSON"
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _html_path(key: str) -> str:
+    return os.path.join(cache_dir(), "html", f"map-{key}.html")
+
+
+def read_cached_html(key: str) -> str | None:
+    try:
+        with open(_html_path(key), encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def store_cached_html(key: str, html: str):
+    "Écrit la page et ne garde que les HTML_CACHE_LIMIT plus récentes"
+    path = _html_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(html)
+    os.replace(tmp, path)
+
+    pages = sorted(
+        glob.glob(os.path.join(os.path.dirname(path), "map-*.html")),
+        key=os.path.getmtime,
+        reverse=True,
+    )
+    for old in pages[HTML_CACHE_LIMIT:]:
+        try:
+            os.remove(old)
+        except OSError:
+            pass
+
+
+# --- Tuiles (format MBTiles) ---
+
+
+class TileStore:
+    """Tuiles raster dans une base SQLite au format MBTiles.
+
+    Les clés présentes sont gardées en mémoire : ``has`` ne touche pas au
+    disque, ce qui permet de l'appeler depuis l'intercepteur de requêtes.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or os.path.join(cache_dir(), TILES_FILE)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS tiles (
+                zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER,
+                tile_data BLOB,
+                PRIMARY KEY (zoom_level, tile_column, tile_row)
+            );
+            """
+        )
+        self._conn.execute(
+            "INSERT OR IGNORE INTO metadata VALUES ('name', 'hapsight'), "
+            "('format', 'png')"
+        )
+        self._conn.commit()
+        self._keys = {
+            (z, x, self._flip(z, row))
+            for z, x, row in self._conn.execute(
+                "SELECT zoom_level, tile_column, tile_row FROM tiles"
+            )
+        }
+
+    @staticmethod
+    def _flip(z: int, y: int) -> int:
+        # MBTiles numérote les lignes depuis le bas (schéma TMS)
+        return (1 << z) - 1 - y
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def has(self, z: int, x: int, y: int) -> bool:
+        return (z, x, y) in self._keys
+
+    def get(self, z: int, x: int, y: int) -> bytes | None:
+        if not self.has(z, x, y):
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT tile_data FROM tiles WHERE zoom_level=? AND tile_column=? "
+                "AND tile_row=?",
+                (z, x, self._flip(z, y)),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, z: int, x: int, y: int, data: bytes):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?)",
+                (z, x, self._flip(z, y), sqlite3.Binary(data)),
+            )
+            self._conn.commit()
+        self._keys.add((z, x, y))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def parse_tile_url(url: str) -> tuple[int, int, int] | None:
+    "(z, x, y) d'une URL de tuile CartoDB, sinon None"
+    match = TILE_RE.match(url)
+    if match is None:
+        return None
+    z, x, y = (int(v) for v in match.groups())
+    return z, x, y
+
+
+# --- Préchargement (installation hors ligne) ---
+
+
+def prefetch(asset_urls, max_zoom: int = 4, min_zoom: int = 2, log=print) -> int:
+    "Télécharge ressources et tuiles manquantes ; renvoie le nombre d'échecs"
+    import requests
+
+    failures = 0
+    session = requests.Session()
+    for url in asset_urls:
+        if os.path.exists(asset_path(url)):
+            continue
+        try:
+            r = session.get(url, timeout=30)
+            r.raise_for_status()
+            store_asset(url, r.content)
+            log(f"ressource : {url}")
+        except Exception as e:
+            failures += 1
+            log(f"échec : {url} ({e})")
+
+    store = TileStore()
+    try:
+        for z in range(min_zoom, max_zoom + 1):
+            for x in range(1 << z):
+                for y in range(1 << z):
+                    if store.has(z, x, y):
+                        continue
+                    url = TILE_URL.format(s="abcd"[(x + y) % 4], z=z, x=x, y=y)
+                    try:
+                        r = session.get(url, timeout=30)
+                        r.raise_for_status()
+                        store.put(z, x, y, r.content)
+                    except Exception as e:
+                        failures += 1
+                        log(f"échec : {url} ({e})")
+            log(f"tuiles zoom {z} : ok")
+    finally:
+        store.close()
+    return failures
+
+
+def default_asset_urls() -> list[str]:
+    "JS/CSS chargés par folium et GeoJSON des pays"
+    import folium
+
+    m = folium.Map(tiles=None)
+    return [url for _, url in [*m.default_js, *m.default_css]] + [GEOJSON_URL]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="hapsight-offline",
+        description="Télécharge les ressources de la carte pour un usage hors ligne",
+    )
+    parser.add_argument("--max-zoom", type=int, default=4)
+    args = parser.parse_args(argv)
+    failures = prefetch(default_asset_urls(), max_zoom=args.max_zoom)
+    print(f"Cache : {cache_dir()}", file=sys.stderr)
+    if failures:
+        print(
+            f"{failures} téléchargement(s) en échec : relancer avec un accès "
+            "réseau (seuls les éléments manquants seront récupérés)",
+            file=sys.stderr,
+        )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
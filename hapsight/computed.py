@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import keyword
+
+import numpy as np
+import pandas as pd
+from PySide6.QtCore import QObject, Signal
+
+from hapsight.tracing import traced
+from hapsight.versioned import lookup, store
+
+CONTINENT_COL = "continent"
+YEAR_COL = "Year"
+
+# Colonnes dérivées utilisables dans les expressions : <col><suffixe>
+# (ex. happiness_score - happiness_score_continent_mean)
+GROUP_MEANS = {
+    "_continent_mean": [CONTINENT_COL, YEAR_COL],
+    "_year_mean": [YEAR_COL],
+}
+
+
+class _GroupMeans(dict):
+    """Moyennes par groupe (``GROUP_MEANS``), calculées à la demande :
+    ``DataFrame.eval`` ne lit que les noms présents dans l'expression."""
+
+    def __init__(self, df: pd.DataFrame):
+        super().__init__()
+        self.df = df
+
+    def __missing__(self, name: str) -> pd.Series:
+        for suffix, keys in GROUP_MEANS.items():
+            col = name.removesuffix(suffix)
+            if (
+                col != name
+                and col in self.df.columns
+                and all(k in self.df.columns for k in keys)
+            ):
+                values = pd.to_numeric(self.df[col], errors="coerce")
+                means = values.groupby([self.df[k] for k in keys]).transform("mean")
+                self[name] = means
+                return means
+        raise KeyError(name)
+
+
+@traced("computed.eval")
+def evaluate(df: pd.DataFrame, expression: str) -> pd.Series:
+    """Évalue une expression sur des colonnes entières (``DataFrame.eval``,
+    via numexpr s'il est installé). Lève ValueError si elle est invalide."""
+    try:
+        result = df.eval(expression, resolvers=[_GroupMeans(df)])
+    except Exception as exc:
+        raise ValueError(f"Expression invalide : {exc}") from exc
+    if np.isscalar(result):
+        return pd.Series(float(result), index=df.index)  # type: ignore
+    if not isinstance(result, pd.Series) or len(result) != len(df):
+        raise ValueError("L'expression doit donner une valeur par ligne")
+    if not pd.api.types.is_numeric_dtype(result):
+        raise ValueError("L'expression doit être numérique")
+    return result.astype(float)
+
+
+class ComputedColumns(QObject):
+    """Colonnes définies par une expression (nom -> expression).
+
+    Chaque colonne n'est évaluée qu'au premier accès, puis mémorisée pour
+    cette version des données (même DataFrame, même expression).
+    """
+
+    changed = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.definitions: dict[str, str] = {}
+
+    def names(self) -> list[str]:
+        return list(self.definitions)
+
+    def add(self, name: str, expression: str, df: pd.DataFrame | None = None):
+        "Ajoute (ou remplace) une colonne ; vérifiée sur ``df`` si fourni"
+        name = name.strip()
+        if not name.isidentifier() or keyword.iskeyword(name):
+            raise ValueError(f"Nom de colonne invalide : {name!r}")
+        if df is not None:
+            if name in df.columns:
+                raise ValueError(f"La colonne {name!r} existe déjà")
+            store(df, ("computed", expression), evaluate(df, expression))
+        self.definitions[name] = expression
+        self.changed.emit()
+
+    def remove(self, name: str):
+        if self.definitions.pop(name, None) is not None:
+            self.changed.emit()
+
+    def column(self, df: pd.DataFrame, name: str) -> pd.Series:
+        "Valeurs d'une colonne calculée, évaluée au premier accès"
+        key = ("computed", self.definitions[name])
+        values = lookup(df, key)
+        if values is not None:
+            return values
+        try:
+            values = evaluate(df, key[1])
+        except ValueError:
+            values = pd.Series(np.nan, index=df.index)  # colonne absente des données
+        return store(df, key, values)
+
+    def frame(self, df: pd.DataFrame) -> pd.DataFrame | None:
+        "Toutes les colonnes calculées, alignées sur ``df`` (None si aucune)"
+        names = [n for n in self.definitions if n not in df.columns]
+        if not names:
+            return None
+        return pd.DataFrame({n: self.column(df, n) for n in names}, index=df.index)
+
+    def augment(self, df: pd.DataFrame) -> pd.DataFrame:
+        "``df`` complété par les colonnes calculées"
+        frame = self.frame(df)
+        return df if frame is None else pd.concat([df, frame], axis=1)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import pandas as pd
+from PySide6.QtWidgets import (
+    QFormLayout,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QListWidget,
+    QPushButton,
+    QVBoxLayout,
+    QWidget,
+)
+
+from hapsight.computed import GROUP_MEANS, ComputedColumns
+
+HINT = "Moyennes par groupe : <colonne>" + ", <colonne>".join(GROUP_MEANS)
+
+
+class ComputedPanel(QWidget):
+    "Définition des colonnes calculées (nom + expression)"
+
+    def __init__(self, computed: ComputedColumns, parent=None):
+        super().__init__(parent)
+        self.computed = computed
+        self.df: pd.DataFrame | None = None
+
+        layout = QVBoxLayout(self)
+        self.list = QListWidget()
+        layout.addWidget(self.list, 1)
+
+        form = QFormLayout()
+        self.name_input = QLineEdit()
+        self.name_input.setPlaceholderText("ex. richesse_sante")
+        self.expression_input = QLineEdit()
+        self.expression_input.setPlaceholderText("ex. gdp_per_capita * health")
+        form.addRow("Nom :", self.name_input)
+        form.addRow("Expression :", self.expression_input)
+        layout.addLayout(form)
+
+        hint = QLabel(HINT)
+        hint.setWordWrap(True)
+        hint.setStyleSheet("color: #555;")
+        layout.addWidget(hint)
+
+        self.error_label = QLabel("")
+        self.error_label.setWordWrap(True)
+        self.error_label.setStyleSheet("color: #C0392B;")
+        layout.addWidget(self.error_label)
+
+        buttons = QHBoxLayout()
+        self.add_btn = QPushButton("Ajouter")
+        self.add_btn.clicked.connect(self.add_column)
+        self.remove_btn = QPushButton("Supprimer")
+        self.remove_btn.clicked.connect(self.remove_selected)
+        buttons.addWidget(self.add_btn)
+        buttons.addWidget(self.remove_btn)
+        layout.addLayout(buttons)
+
+        self.expression_input.returnPressed.connect(self.add_column)
+        computed.changed.connect(self._refresh_list)
+
+    def set_data(self, df: pd.DataFrame):
+        self.df = df
+
+    def add_column(self):
+        try:
+            self.computed.add(
+                self.name_input.text(), self.expression_input.text(), self.df
+            )
+        except ValueError as exc:
+            self.error_label.setText(str(exc))
+            return
+        self.error_label.setText("")
+        self.name_input.clear()
+        self.expression_input.clear()
+
+    def remove_selected(self):
+        item = self.list.currentItem()
+        if item is not None:
+            self.computed.remove(item.text().split(" = ", 1)[0])
+
+    def _refresh_list(self):
+        self.list.clear()
+        for name, expression in self.computed.definitions.items():
+            self.list.addItem(f"{name} = {expression}")
@@ -1,20 +1,46 @@
 from __future__ import annotations
 
+import threading
+import warnings
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import numpy as np
 import pandas as pd
-from PySide6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QModelIndex,
+    QSortFilterProxyModel,
+    QStringListModel,
+    Qt,
+    QTimer,
+    Signal,
+)
 from PySide6.QtWidgets import (
+    QCheckBox,
     QComboBox,
-    QDoubleSpinBox,
+    QCompleter,
     QGroupBox,
     QHBoxLayout,
     QLabel,
     QLineEdit,
     QPushButton,
+    QStackedWidget,
     QTableView,
     QVBoxLayout,
     QWidget,
 )
 
+from hapsight.brushing import Brush, BrushSelection
+from hapsight.computed import ComputedColumns
+from hapsight.cube import STATS, cube_for
+from hapsight.dataset import DatasetDiff
+from hapsight.range_slider import RangeFilter
+from hapsight.ranking import TIE_METHODS, ranks_for, update_ranks
+from hapsight.search_index import SearchIndex
+from hapsight.tracing import traced
+from hapsight.workers import Worker, run_in_background
+
 COUNTRY_COL = "Country"
 CONTINENT_COL = "continent"
 YEAR_COL = "Year"
@@ -22,30 +48,62 @@ HAPPINESS_COL = "happiness_score"
 GDP_COL = "gdp_per_capita"
 HEALTH_COL = "health"
 
+MAX_SUGGESTIONS = 10
+# Délai sans changement avant d'évaluer les filtres
+FILTER_DEBOUNCE_MS = 80
+
+# Pied de tableau : libellé -> réduction sur les lignes filtrées (NaN ignorés)
+FOOTER_STATS = {
+    "Moyenne": np.nanmean,
+    "Min": np.nanmin,
+    "Max": np.nanmax,
+    "Médiane": np.nanmedian,
+}
+LABEL_WIDTH = 70
+
+# Valeur brute (numérique) utilisée pour le tri
+SORT_ROLE = Qt.ItemDataRole.UserRole
+
 
 class PandasTableModel(QAbstractTableModel):
     def __init__(self, df: pd.DataFrame):
         super().__init__()
         self._df = df
+        # Colonnes calculées affichées après celles du DataFrame
+        self._virtual: pd.DataFrame | None = None
+        self._table: pd.DataFrame | None = None
 
     def rowCount(self, parent=QModelIndex()):
         return len(self._df)
 
     def columnCount(self, parent=QModelIndex()):
-        return len(self._df.columns)
+        n_virtual = 0 if self._virtual is None else len(self._virtual.columns)
+        return len(self._df.columns) + n_virtual
+
+    def _value(self, row: int, col: int):
+        n = len(self._df.columns)
+        if col < n:
+            return self._df.iat[row, col]
+        return self._virtual.iat[row, col - n]  # type: ignore
 
     def data(self, index: QModelIndex, role=Qt.DisplayRole):  # type: ignore
         if not index.isValid():
             return None
 
         if role in (Qt.DisplayRole, Qt.EditRole):  # type: ignore
-            value = self._df.iat[index.row(), index.column()]
+            value = self._value(index.row(), index.column())
             if pd.isna(value):
                 return ""
             if isinstance(value, float):
                 return f"{value:.3f}"
             return str(value)
 
+        if role == SORT_ROLE:
+            value = self._value(index.row(), index.column())
+            if pd.isna(value):
+                return None
+            return value.item() if hasattr(value, "item") else value
+
         return None
 
     def headerData(
@@ -57,91 +115,402 @@ class PandasTableModel(QAbstractTableModel):
         if role != Qt.ItemDataRole.DisplayRole:  # type: ignore
             return None
         if orientation == Qt.Horizontal:  # type: ignore
-            return str(self._df.columns[section])
+            n = len(self._df.columns)
+            if section < n:
+                return str(self._df.columns[section])
+            return str(self._virtual.columns[section - n])  # type: ignore
         return str(section + 1)
 
     def df(self) -> pd.DataFrame:
         return self._df
 
+    def table(self) -> pd.DataFrame:
+        "DataFrame suivi des colonnes virtuelles (mêmes positions que la vue)"
+        if self._virtual is None:
+            return self._df
+        if self._table is None:
+            self._table = pd.concat([self._df, self._virtual], axis=1)
+        return self._table
+
+    def set_dataframe(self, df: pd.DataFrame):
+        self.beginResetModel()
+        self._df = df
+        self._align_virtual()
+        self.endResetModel()
+
+    def virtual_columns(self) -> list[str]:
+        return [] if self._virtual is None else list(self._virtual.columns)
+
+    def set_virtual_columns(self, frame: pd.DataFrame | None):
+        "Colonnes virtuelles alignées sur l'index du DataFrame (ex. rangs)"
+        if frame is None and self._virtual is None:
+            return
+        if (
+            frame is not None
+            and self._virtual is not None
+            and list(frame.columns) == list(self._virtual.columns)
+        ):
+            # Mêmes colonnes : simple mise à jour des valeurs
+            self._virtual = frame.reindex(self._df.index)
+            self._table = None
+            n = len(self._df.columns)
+            self.dataChanged.emit(
+                self.index(0, n),
+                self.index(self.rowCount() - 1, self.columnCount() - 1),
+            )
+            return
+        self.beginResetModel()
+        self._virtual = frame
+        self._align_virtual()
+        self.endResetModel()
+
+    def _align_virtual(self):
+        self._table = None
+        if self._virtual is not None:
+            self._virtual = self._virtual.reindex(self._df.index)
+
+    def apply_diff(self, diff: DatasetDiff):
+        "Applique un diff sans reset : suppressions, dataChanged, insertions"
+        if diff.full_reload:
+            self.set_dataframe(diff.merged)
+            return
+
+        # Suppressions par blocs contigus, de la fin vers le début
+        for first, last in reversed(_contiguous_blocks(diff.removed_rows)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            self._df = pd.concat([self._df.iloc[:first], self._df.iloc[last + 1 :]])
+            self._align_virtual()
+            self.endRemoveRows()
+
+        n_kept = len(diff.merged) - diff.inserted
+        self._df = diff.merged.iloc[:n_kept]
+        self._align_virtual()
+        if diff.changed_rows:
+            top_left = self.index(min(diff.changed_rows), 0)
+            bottom_right = self.index(max(diff.changed_rows), self.columnCount() - 1)
+            self.dataChanged.emit(top_left, bottom_right)
+
+        if diff.inserted:
+            self.beginInsertRows(QModelIndex(), n_kept, len(diff.merged) - 1)
+            self._df = diff.merged
+            self._align_virtual()
+            self.endInsertRows()
+        else:
+            self._df = diff.merged
+            self._align_virtual()
+
+
+def _contiguous_blocks(rows: list[int]) -> list[tuple[int, int]]:
+    blocks: list[tuple[int, int]] = []
+    for row in sorted(rows):
+        if blocks and row == blocks[-1][1] + 1:
+            blocks[-1] = (blocks[-1][0], row)
+        else:
+            blocks.append((row, row))
+    return blocks
+
+
+class FooterModel(PandasTableModel):
+    "Statistiques des lignes filtrées, une ligne par réduction"
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role=Qt.ItemDataRole.DisplayRole,
+    ):  # type: ignore
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Vertical:  # type: ignore
+            return list(FOOTER_STATS)[section]
+        return super().headerData(section, orientation, role)
+
+
+def column_summary(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    "Réductions (FOOTER_STATS × colonnes) sur les lignes retenues par le masque"
+    selected = values[mask]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # colonnes vides
+        if not len(selected):
+            return np.full((len(FOOTER_STATS), values.shape[1]), np.nan)
+        return np.vstack([f(selected, axis=0) for f in FOOTER_STATS.values()])
+
+
+@dataclass(frozen=True)
+class FilterState:
+    "Instantané des filtres, transmis tel quel au thread d'évaluation"
+
+    name_contains: str
+    name_matches: frozenset[str] | None
+    continent: str
+    year: int | None
+    ranges: tuple[tuple[str, float | None, float | None], ...]
+    brush: BrushSelection | None = None
+
+    def parts(self) -> list[str]:
+        ranges = [f"range:{c}" for c, *_ in self.ranges]
+        return ["name", "continent", "year", "brush", *ranges]
+
+
+def part_mask(df: pd.DataFrame, state: FilterState, part: str) -> np.ndarray | None:
+    "Masque vectorisé d'un filtre (None si le filtre est inactif)"
+    if part == "name":
+        if state.name_matches is not None:
+            return df[COUNTRY_COL].isin(state.name_matches).to_numpy()
+        if state.name_contains:
+            names = df[COUNTRY_COL].astype(str).str.lower()
+            return names.str.contains(state.name_contains, regex=False).to_numpy()
+        return None
+    if part == "continent":
+        if state.continent == "Tous":
+            return None
+        return (df[CONTINENT_COL].astype(str) == state.continent).to_numpy()
+    if part == "year":
+        if state.year is None:
+            return None
+        years = pd.to_numeric(df[YEAR_COL], errors="coerce")
+        return (years == int(state.year)).to_numpy(dtype=bool, na_value=False)
+    if part == "brush":
+        return None if state.brush is None else state.brush.mask(df)
+    col = part.removeprefix("range:")
+    vmin, vmax = next(
+        ((lo, hi) for c, lo, hi in state.ranges if c == col), (None, None)
+    )
+    if col not in df.columns or (vmin is None and vmax is None):
+        return None
+    values = pd.to_numeric(df[col], errors="coerce").to_numpy(
+        dtype=float, na_value=np.nan
+    )
+    keep = ~np.isnan(values)
+    if vmin is not None:
+        keep &= values >= vmin
+    if vmax is not None:
+        keep &= values <= vmax
+    return keep
+
+
+def evaluate_filters(
+    df: pd.DataFrame,
+    state: FilterState,
+    cached: dict[str, np.ndarray | None],
+    cancelled: threading.Event | None = None,
+):
+    """Masques par filtre et masque combiné ; seuls les filtres absents de
+    ``cached`` sont recalculés. Renvoie None si l'évaluation est périmée."""
+    masks = dict(cached)
+    combined = np.ones(len(df), dtype=bool)
+    for part in state.parts():
+        if cancelled is not None and cancelled.is_set():
+            return None
+        if part not in masks:
+            masks[part] = part_mask(df, state, part)
+        if masks[part] is not None:
+            combined &= masks[part]
+    return masks, combined
+
 
 class CountriesFilterProxy(QSortFilterProxyModel):
+    """Filtres de la table, appliqués par transactions.
+
+    Les ``set_*`` ne font que noter le changement ; après ``FILTER_DEBOUNCE_MS``
+    sans nouveau changement, le masque est évalué sur le pool de threads puis
+    appliqué en un seul passage. Une évaluation dépassée par un changement
+    plus récent est annulée. ``flush()`` applique immédiatement (tests).
+    """
+
+    # Émis après chaque application d'un nouveau masque
+    filtersApplied = Signal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._name_contains = ""
+        self._name_matches: frozenset[str] | None = None
+        self._search_index: SearchIndex | None = None
         self._continent = "Tous"
         self._year: int | None = None
         self._ranges: dict[str, tuple[float | None, float | None]] = {}
+        self._brush: BrushSelection | None = None
+        # Masque des lignes acceptées, un morceau par filtre (recalculé
+        # seulement pour le filtre modifié, ou en entier si les données changent)
+        self._mask_df: pd.DataFrame | None = None
+        self._masks: dict[str, np.ndarray | None] = {}
+        self._mask: np.ndarray | None = None
         self.setFilterCaseSensitivity(Qt.CaseInsensitive)  # type: ignore
 
+        # Transactions : changements en attente, évaluation en cours
+        self._dirty = False
+        self._batch_depth = 0
+        self._cancel = threading.Event()
+        self._workers: dict[int, Worker] = {}
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(FILTER_DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._evaluate)
+
+    def set_search_index(self, index: SearchIndex | None):
+        self._search_index = index
+        self._update_name_matches()
+        self._refilter("name")
+
+    @traced("filter.name")
     def set_name_contains(self, text: str):
         self._name_contains = (text or "").strip().lower()
-        self.invalidateFilter()
+        self._update_name_matches()
+        self._refilter("name")
+
+    def _update_name_matches(self):
+        # Sur le thread GUI : l'index garde un cache de la dernière requête
+        if self._search_index is None or not self._name_contains:
+            self._name_matches = None
+        else:
+            self._name_matches = frozenset(
+                self._search_index.search(self._name_contains)
+            )
 
+    @traced("filter.continent")
     def set_continent(self, continent: str):
         self._continent = continent or "Tous"
-        self.invalidateFilter()
+        self._refilter("continent")
 
+    @traced("filter.year")
     def set_year(self, year: int | None):
         self._year = year
-        self.invalidateFilter()
+        self._refilter("year")
 
+    @traced("filter.range")
     def set_range(self, col: str, vmin: float | None, vmax: float | None):
         self._ranges[col] = (vmin, vmax)
-        self.invalidateFilter()
+        self._refilter(f"range:{col}")
 
+    @traced("filter.brush")
+    def set_brush(self, selection: BrushSelection | None):
+        "Lignes sélectionnées au lasso dans le nuage de points (None : toutes)"
+        self._brush = selection
+        self._refilter("brush")
+
+    @traced("filter.clear_ranges")
     def clear_ranges(self):
         self._ranges = {}
+        for key in [k for k in self._masks if k.startswith("range:")]:
+            del self._masks[key]
+        self._refilter(None)
+
+    @contextmanager
+    def transaction(self):
+        "Regroupe plusieurs changements de filtres en une seule évaluation"
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._dirty:
+                self._debounce.start()
+
+    def _refilter(self, part: str | None):
+        if part is not None:
+            self._masks.pop(part, None)
+        # Le masque affiché reste valable jusqu'à l'application du nouveau
+        self._dirty = True
+        self._cancel.set()
+        if self._batch_depth == 0:
+            self._debounce.start()
+
+    def _state(self) -> FilterState:
+        return FilterState(
+            self._name_contains,
+            self._name_matches,
+            self._continent,
+            self._year,
+            tuple((col, lo, hi) for col, (lo, hi) in self._ranges.items()),
+            self._brush,
+        )
+
+    def _source_df(self) -> pd.DataFrame | None:
+        model = self.sourceModel()
+        return None if model is None else model.table()  # type: ignore
+
+    def _evaluate(self):
+        "Lance l'évaluation du masque sur le pool de threads"
+        df = self._source_df()
+        if not self._dirty or df is None:
+            return
+        if df is not self._mask_df:
+            self.flush()  # données remplacées : tout est à recalculer
+            return
+        self._cancel = cancel = threading.Event()
+        key = id(cancel)
+        self._workers[key] = run_in_background(
+            evaluate_filters,
+            df,
+            self._state(),
+            dict(self._masks),
+            cancel,
+            on_done=lambda result: self._apply(key, cancel, df, result),
+            on_error=lambda _: self._apply(key, cancel, df, None),
+        )
+
+    @traced("filter.apply")
+    def _apply(self, key: int, cancel: threading.Event, df: pd.DataFrame, result):
+        self._workers.pop(key, None)
+        if cancel.is_set() or df is not self._source_df():
+            return  # dépassée par un changement plus récent
+        if result is None:
+            self.flush()  # échec du worker : évaluation synchrone
+            return
+        self._masks, self._mask = result
+        self._dirty = False
         self.invalidateFilter()
+        self.filtersApplied.emit()
+
+    def flush(self):
+        "Applique tout de suite les changements en attente"
+        self._debounce.stop()
+        if self._dirty:
+            self._mask = None
+            self.invalidateFilter()
+            self.filtersApplied.emit()
+
+    def accepted_mask(self) -> np.ndarray:
+        "Lignes de la source acceptées par les filtres (dernière transaction)"
+        df = self._source_df()
+        if df is not self._mask_df:
+            self._mask_df = df
+            self._masks = {}
+            self._mask = None
+        if self._mask is None:
+            # Évaluation synchrone (données remplacées ou flush) : elle
+            # rend caduques les évaluations en cours
+            self._cancel.set()
+            self._debounce.stop()
+            self._dirty = False
+            self._masks, self._mask = evaluate_filters(df, self._state(), self._masks)
+        return self._mask
 
     def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
-        model = self.sourceModel()
-        if model is None:
+        if self.sourceModel() is None:
             return True
-
-        df = model.df()  # type: ignore
-        row = df.iloc[source_row]
-
-        if self._name_contains:
-            if self._name_contains not in str(row[COUNTRY_COL]).lower():
-                return False
-
-        if self._continent != "Tous":
-            if str(row[CONTINENT_COL]) != self._continent:
-                return False
-
-        if self._year is not None:
-            try:
-                if int(row[YEAR_COL]) != int(self._year):
-                    return False
-            except Exception:
-                return False
-
-        for col, (vmin, vmax) in self._ranges.items():
-            if col not in df.columns:
-                continue
-            val = row[col]
-            if pd.isna(val):
-                return False
-            try:
-                val = float(val)
-            except Exception:
-                return False
-            if vmin is not None and val < vmin:
-                return False
-            if vmax is not None and val > vmax:
-                return False
-
-        return True
+        mask = self.accepted_mask()
+        return bool(mask[source_row]) if source_row < len(mask) else True
 
 
 class CountriesWidget(QWidget):
-    def __init__(self, df: pd.DataFrame, parent=None):
+    # Pays de la ligne courante (préchargement du dashboard de la carte)
+    countryHighlighted = Signal(str)
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        parent=None,
+        computed: ComputedColumns | None = None,
+        brush: Brush | None = None,
+    ):
         super().__init__(parent)
         self.df = df
+        self.computed = computed
+        self.brush = brush
 
         self.model = PandasTableModel(df)
         self.proxy = CountriesFilterProxy(self)
         self.proxy.setSourceModel(self.model)
+        self.proxy.setSortRole(SORT_ROLE)
 
         layout = QVBoxLayout(self)
 
@@ -152,18 +521,22 @@ class CountriesWidget(QWidget):
         self.name_input.setPlaceholderText("Rechercher un pays…")
         self.name_input.textChanged.connect(self.proxy.set_name_contains)
 
+        # Suggestions classées par l'index de recherche
+        self.name_suggestions = QStringListModel(self)
+        completer = QCompleter(self.name_suggestions, self)
+        completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.name_input.setCompleter(completer)
+        self.name_input.textEdited.connect(self._update_suggestions)
+        self._rebuild_search_index()
+
         self.continent_combo = QComboBox()
         self.continent_combo.addItem("Tous")
-        continents = sorted([c for c in df[CONTINENT_COL].dropna().unique().tolist()])
-        for c in continents:
-            self.continent_combo.addItem(str(c))
+        self.continent_combo.addItems(self._continents())
         self.continent_combo.currentTextChanged.connect(self.proxy.set_continent)
 
         self.year_combo = QComboBox()
         self.year_combo.addItem("Toutes")
-        years = sorted([int(y) for y in df[YEAR_COL].dropna().unique().tolist()])
-        for y in years:
-            self.year_combo.addItem(str(y))
+        self.year_combo.addItems(self._years())
 
         def on_year_change(text: str):
             if text == "Toutes":
@@ -176,12 +549,34 @@ class CountriesWidget(QWidget):
         self.reset_btn = QPushButton("Reset")
         self.reset_btn.clicked.connect(self.reset_filters)
 
+        # Colonnes de rang / centile par année (calculées à la demande)
+        self.chk_ranks = QCheckBox("Rangs")
+        self.tie_combo = QComboBox()
+        self.tie_combo.addItems(TIE_METHODS)
+        self.tie_combo.setToolTip("Traitement des ex æquo")
+        self.tie_combo.setEnabled(False)
+        self.chk_ranks.toggled.connect(self.tie_combo.setEnabled)
+        self.chk_ranks.toggled.connect(self._update_virtual_columns)
+        self.tie_combo.currentTextChanged.connect(self._update_virtual_columns)
+        if computed is not None:
+            computed.changed.connect(self._on_computed_changed)
+            self._update_virtual_columns()
+        if brush is not None:
+            brush.changed.connect(self.proxy.set_brush)
+            self.proxy.set_brush(brush.selection)
+
+        # Vue pivot continent × année (agrégats lus dans le cube)
+        self.chk_pivot = QCheckBox("Vue pivot")
+
         filters_layout.addWidget(QLabel("Pays:"))
         filters_layout.addWidget(self.name_input, 2)
         filters_layout.addWidget(QLabel("Continent:"))
         filters_layout.addWidget(self.continent_combo, 1)
         filters_layout.addWidget(QLabel("Année:"))
         filters_layout.addWidget(self.year_combo, 1)
+        filters_layout.addWidget(self.chk_ranks)
+        filters_layout.addWidget(self.tie_combo)
+        filters_layout.addWidget(self.chk_pivot)
         filters_layout.addWidget(self.reset_btn)
 
         layout.addWidget(filters_box)
@@ -191,7 +586,7 @@ class CountriesWidget(QWidget):
         numeric_layout = QHBoxLayout(numeric_box)
 
         # Filtres fixes (bonheur/PIB/santé)
-        self.fixed_spins = {}
+        self.range_filters: dict[str, RangeFilter] = {}
         self._add_range_filter(
             numeric_layout, label="Bonheur", col=HAPPINESS_COL, store=True
         )
@@ -204,66 +599,41 @@ class CountriesWidget(QWidget):
         self.custom_col_combo = QComboBox()
         self.custom_col_combo.addItem("— colonne —")
 
-        numeric_cols = []
-        for col in df.columns:
-            if col == YEAR_COL:
-                continue
-            if pd.api.types.is_numeric_dtype(df[col]):
-                numeric_cols.append(col)
-        numeric_cols = sorted(numeric_cols)
-
-        for col in numeric_cols:
-            self.custom_col_combo.addItem(col)
-
-        self.custom_min = QDoubleSpinBox()
-        self.custom_min.setRange(-1e9, 1e9)
-        self.custom_min.setDecimals(3)
-        self.custom_min.setSpecialValueText("—")
-        self.custom_min.setValue(self.custom_min.minimum())
-
-        self.custom_max = QDoubleSpinBox()
-        self.custom_max.setRange(-1e9, 1e9)
-        self.custom_max.setDecimals(3)
-        self.custom_max.setSpecialValueText("—")
-        self.custom_max.setValue(self.custom_max.minimum())
-
-        def apply_custom_range():
-            col = self.custom_col_combo.currentText()
-            if col == "— colonne —":
+        self.custom_col_combo.addItems(self._numeric_columns())
+        self.custom_range = RangeFilter()
+        self._custom_col: str | None = None
+
+        def apply_custom_range(vmin, vmax):
+            if self._custom_col is None:
                 return
-            vmin = (
-                None
-                if self.custom_min.value() == self.custom_min.minimum()
-                else float(self.custom_min.value())
-            )
-            vmax = (
-                None
-                if self.custom_max.value() == self.custom_max.minimum()
-                else float(self.custom_max.value())
-            )
-            self.proxy.set_range(col, vmin, vmax)
+            self.proxy.set_range(self._custom_col, vmin, vmax)
+            self._update_results_label()
 
-        def on_custom_col_change(_):
-            self.custom_min.blockSignals(True)
-            self.custom_max.blockSignals(True)
-            self.custom_min.setValue(self.custom_min.minimum())
-            self.custom_max.setValue(self.custom_max.minimum())
-            self.custom_min.blockSignals(False)
-            self.custom_max.blockSignals(False)
+        def on_custom_col_change(col: str):
+            # L'ancienne colonne ne filtre plus
+            if self._custom_col is not None:
+                self.proxy.set_range(self._custom_col, None, None)
+            self._custom_col = col if col in self.model.table().columns else None
+            self.custom_range.reset()
+            self._refresh_custom_range()
+            self._update_results_label()
 
         self.custom_col_combo.currentTextChanged.connect(on_custom_col_change)
-        self.custom_min.valueChanged.connect(apply_custom_range)
-        self.custom_max.valueChanged.connect(apply_custom_range)
+        self.custom_range.rangeCommitted.connect(apply_custom_range)
 
         numeric_layout.addWidget(QLabel("Filtre custom:"))
-        numeric_layout.addWidget(self.custom_col_combo, 1)
-        numeric_layout.addWidget(QLabel("min"))
-        numeric_layout.addWidget(self.custom_min)
-        numeric_layout.addWidget(QLabel("max"))
-        numeric_layout.addWidget(self.custom_max)
+        numeric_layout.addWidget(self.custom_col_combo)
+        numeric_layout.addWidget(self.custom_range, 1)
 
         layout.addWidget(numeric_box)
 
+        # Pied de tableau (recalculé une fois par rafale de changements)
+        self._footer_df: pd.DataFrame | None = None
+        self._footer_timer = QTimer(self)
+        self._footer_timer.setSingleShot(True)
+        self._footer_timer.setInterval(0)
+        self._footer_timer.timeout.connect(self.update_footer)
+
         # Compteur de résultats
         self.results_label = QLabel("")
         layout.addWidget(self.results_label)
@@ -283,36 +653,249 @@ class CountriesWidget(QWidget):
         self.table.setSelectionBehavior(QTableView.SelectRows)  # type: ignore
         self.table.setSelectionMode(QTableView.SingleSelection)  # type: ignore
         self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.selectionModel().currentRowChanged.connect(
+            self._on_current_row_changed
+        )
+        self.table.verticalHeader().setFixedWidth(LABEL_WIDTH)
+
+        self.footer_model = FooterModel(pd.DataFrame())
+        self.footer = QTableView()
+        self.footer.setModel(self.footer_model)
+        self.footer.horizontalHeader().hide()
+        self.footer.verticalHeader().setFixedWidth(LABEL_WIDTH)
+        self.footer.horizontalHeader().setStretchLastSection(True)
+        self.footer.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.footer.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.footer.setFixedHeight(
+            self.footer.verticalHeader().defaultSectionSize() * len(FOOTER_STATS) + 4
+        )
+        self.table.horizontalScrollBar().valueChanged.connect(
+            self.footer.horizontalScrollBar().setValue
+        )
+        self.table.horizontalHeader().sectionResized.connect(
+            lambda col, _old, width: self.footer.setColumnWidth(col, width)
+        )
+        self.update_footer()
+
+        table_page = QWidget()
+        table_layout = QVBoxLayout(table_page)
+        table_layout.setContentsMargins(0, 0, 0, 0)
+        table_layout.setSpacing(0)
+        table_layout.addWidget(self.table, 1)
+        table_layout.addWidget(self.footer)
+
+        self.pivot_indicator = QComboBox()
+        self.pivot_indicator.addItems(self._numeric_columns(computed=False))
+        self.pivot_indicator.setCurrentText(HAPPINESS_COL)
+        self.pivot_stat = QComboBox()
+        self.pivot_stat.addItems(list(STATS))
+        self.pivot_model = PandasTableModel(pd.DataFrame())
+        self.pivot_table = QTableView()
+        self.pivot_table.setModel(self.pivot_model)
+        self.pivot_table.horizontalHeader().setStretchLastSection(True)
+
+        pivot_box = QWidget()
+        pivot_layout = QVBoxLayout(pivot_box)
+        pivot_layout.setContentsMargins(0, 0, 0, 0)
+        pivot_controls = QHBoxLayout()
+        pivot_controls.addWidget(QLabel("Indicateur:"))
+        pivot_controls.addWidget(self.pivot_indicator, 1)
+        pivot_controls.addWidget(QLabel("Statistique:"))
+        pivot_controls.addWidget(self.pivot_stat, 1)
+        pivot_layout.addLayout(pivot_controls)
+        pivot_layout.addWidget(self.pivot_table, 1)
+
+        self.views = QStackedWidget()
+        self.views.addWidget(table_page)
+        self.views.addWidget(pivot_box)
+        self.chk_pivot.toggled.connect(self._show_pivot)
+        self.pivot_indicator.currentTextChanged.connect(self._update_pivot)
+        self.pivot_stat.currentTextChanged.connect(self._update_pivot)
+
+        layout.addWidget(self.views, 1)
+
+    def _on_current_row_changed(self, current: QModelIndex, _previous=None):
+        if not current.isValid():
+            return
+        row = self.proxy.mapToSource(current).row()
+        df = self.model.df()
+        if COUNTRY_COL in df.columns and 0 <= row < len(df):
+            self.countryHighlighted.emit(str(df[COUNTRY_COL].iat[row]))
+
+    def _show_pivot(self, checked: bool):
+        self.views.setCurrentIndex(1 if checked else 0)
+        self._update_pivot()
+
+    @traced("countries.pivot")
+    def _update_pivot(self, *_):
+        "Recalcule la vue pivot (uniquement si elle est affichée)"
+        if not self.chk_pivot.isChecked():
+            return
+        indicator = self.pivot_indicator.currentText()
+        cube = cube_for(self.df)
+        if indicator not in cube.indicators:
+            self.pivot_model.set_dataframe(pd.DataFrame())
+            return
+        stat = STATS[self.pivot_stat.currentText()]
+        self.pivot_model.set_dataframe(cube.pivot(indicator, stat))
+
+    def _continents(self) -> list[str]:
+        return sorted(str(c) for c in self.df[CONTINENT_COL].dropna().unique())
+
+    def _years(self) -> list[str]:
+        return [
+            str(y) for y in sorted(int(y) for y in self.df[YEAR_COL].dropna().unique())
+        ]
+
+    def _numeric_columns(self, computed: bool = True) -> list[str]:
+        columns = sorted(
+            col
+            for col in self.df.columns
+            if col != YEAR_COL and pd.api.types.is_numeric_dtype(self.df[col])
+        )
+        if computed and self.computed is not None:
+            columns += [c for c in self.computed.names() if c not in columns]
+        return columns
 
-        layout.addWidget(self.table, 1)
+    def set_data(self, df: pd.DataFrame):
+        "Remplace le jeu de données (reset complet du modèle)"
+        self.df = df
+        self.model.set_dataframe(df)
+        self._rebuild_search_index()
+        self._update_virtual_columns()
+        self._refresh_choices()
+        self._refresh_range_filters()
+        self._update_results_label()
+        self._update_pivot()
+
+    def apply_diff(self, diff: DatasetDiff):
+        "Mise à jour incrémentale après un rechargement du fichier"
+        previous = self.df
+        self.model.apply_diff(diff)
+        self.df = diff.merged
+        self._rebuild_search_index()
+        ranks = None
+        if self.chk_ranks.isChecked():
+            ranks = update_ranks(
+                previous, self.df, diff.years, self.tie_combo.currentText()
+            )
+        self._set_virtual_columns(ranks)
+        self._refresh_choices()
+        self._refresh_range_filters()
+        self._update_results_label()
+        self._update_pivot()
+
+    def _rebuild_search_index(self):
+        self.search_index = SearchIndex(self.df[COUNTRY_COL])
+        self.proxy.set_search_index(self.search_index)
+
+    def _update_suggestions(self, text: str):
+        names = self.search_index.search(text) if text.strip() else []
+        self.name_suggestions.setStringList(names[:MAX_SUGGESTIONS])
+
+    def _update_virtual_columns(self, *_):
+        ranks = None
+        if self.chk_ranks.isChecked():
+            ranks = ranks_for(self.df, self.tie_combo.currentText())
+        self._set_virtual_columns(ranks)
+
+    def _set_virtual_columns(self, ranks: pd.DataFrame | None):
+        "Rangs (si affichés) puis colonnes calculées"
+        computed = None if self.computed is None else self.computed.frame(self.df)
+        frames = [f for f in (ranks, computed) if f is not None]
+        self.model.set_virtual_columns(pd.concat(frames, axis=1) if frames else None)
+
+    def _on_computed_changed(self):
+        self._update_virtual_columns()
+        self._refresh_choices()
+        self._refresh_range_filters()
+
+    def _refresh_choices(self):
+        "Met à jour les choix des combos en gardant la sélection si possible"
+        for combo, first, values, reset in (
+            (
+                self.continent_combo,
+                "Tous",
+                self._continents(),
+                self.proxy.set_continent,
+            ),
+            (
+                self.year_combo,
+                "Toutes",
+                self._years(),
+                lambda _: self.proxy.set_year(None),
+            ),
+            (self.custom_col_combo, "— colonne —", self._numeric_columns(), None),
+            (self.pivot_indicator, None, self._numeric_columns(computed=False), None),
+        ):
+            current = combo.currentText()
+            combo.blockSignals(True)
+            combo.clear()
+            if first is not None:
+                combo.addItem(first)
+            combo.addItems(values)
+            idx = combo.findText(current)
+            combo.setCurrentIndex(max(idx, 0))
+            combo.blockSignals(False)
+            if idx < 0 and reset is not None:
+                reset(first)
 
     def _update_results_label(self):
         shown = self.proxy.rowCount()
         total = self.model.rowCount()
         self.results_label.setText(f"{shown} ligne(s) affichée(s) / {total} total")
-
+        self._footer_timer.start()
+
+    def _footer_columns(self):
+        "Positions et valeurs (float) des colonnes numériques, par version des données"
+        df = self.model.table()
+        if df is not self._footer_df:
+            self._footer_df = df
+            self._footer_positions = [
+                i
+                for i, col in enumerate(df.columns)
+                if col != YEAR_COL and pd.api.types.is_numeric_dtype(df[col])
+            ]
+            self._footer_values = df.iloc[:, self._footer_positions].to_numpy(
+                dtype=float, na_value=np.nan
+            )
+        return self._footer_positions, self._footer_values
+
+    @traced("countries.footer")
+    def update_footer(self):
+        "Moyenne/min/max/médiane des lignes filtrées (réductions vectorisées)"
+        positions, values = self._footer_columns()
+        stats = column_summary(values, self.proxy.accepted_mask())
+        headers = [str(c) for c in self.model.table().columns]
+        grid = np.full((len(FOOTER_STATS), len(headers)), np.nan)
+        grid[:, positions] = stats
+        self.footer_model.set_dataframe(pd.DataFrame(grid, columns=headers))
+        header = self.table.horizontalHeader()
+        for col in range(len(headers)):
+            self.footer.setColumnWidth(col, header.sectionSize(col))
+
+    @traced("countries.reset_filters")
     def reset_filters(self):
-        # Texte / combos
-        self.name_input.setText("")
-        self.continent_combo.setCurrentText("Tous")
-        self.year_combo.setCurrentText("Toutes")
-
-        # Reset ranges (proxy)
-        self.proxy.clear_ranges()
-
-        # Reset spins fixes
-        for col, (min_spin, max_spin) in self.fixed_spins.items():
-            min_spin.blockSignals(True)
-            max_spin.blockSignals(True)
-            min_spin.setValue(min_spin.minimum())
-            max_spin.setValue(max_spin.minimum())
-            min_spin.blockSignals(False)
-            max_spin.blockSignals(False)
-
-        # Reset custom
-        self.custom_col_combo.setCurrentIndex(0)
-        self.custom_min.setValue(self.custom_min.minimum())
-        self.custom_max.setValue(self.custom_max.minimum())
+        # Une seule transaction : un seul passage de filtrage
+        with self.proxy.transaction():
+            # Texte / combos
+            self.name_input.setText("")
+            self.continent_combo.setCurrentText("Tous")
+            self.year_combo.setCurrentText("Toutes")
+
+            # Reset ranges et sélection du nuage de points (proxy)
+            self.proxy.clear_ranges()
+            if self.brush is not None:
+                self.brush.clear()
+            self.proxy.set_brush(None)
+
+            # Reset curseurs
+            for range_filter in self.range_filters.values():
+                range_filter.reset()
+
+            # Reset custom
+            self.custom_col_combo.setCurrentIndex(0)
+            self.custom_range.reset()
 
         self._update_results_label()
 
@@ -322,41 +905,30 @@ class CountriesWidget(QWidget):
         if col not in self.df.columns:
             return
 
-        box = QHBoxLayout()
-        box.addWidget(QLabel(f"{label} min"))
-        min_spin = QDoubleSpinBox()
-        min_spin.setRange(-1e9, 1e9)
-        min_spin.setDecimals(3)
-        min_spin.setSpecialValueText("—")
-        min_spin.setValue(min_spin.minimum())
-        box.addWidget(min_spin)
-
-        box.addWidget(QLabel("max"))
-        max_spin = QDoubleSpinBox()
-        max_spin.setRange(-1e9, 1e9)
-        max_spin.setDecimals(3)
-        max_spin.setSpecialValueText("—")
-        max_spin.setValue(max_spin.minimum())
-        box.addWidget(max_spin)
-
-        def on_change():
-            vmin = (
-                None
-                if min_spin.value() == min_spin.minimum()
-                else float(min_spin.value())
-            )
-            vmax = (
-                None
-                if max_spin.value() == max_spin.minimum()
-                else float(max_spin.value())
-            )
+        range_filter = RangeFilter(label)
+        range_filter.set_values(self.df[col])
+
+        # Le glissement ne met à jour que le compteur du curseur ;
+        # le tableau n'est refiltré qu'au relâchement
+        def on_commit(vmin, vmax):
             self.proxy.set_range(col, vmin, vmax)
             self._update_results_label()
 
-        min_spin.valueChanged.connect(on_change)
-        max_spin.valueChanged.connect(on_change)
-
-        parent_layout.addLayout(box)
+        range_filter.rangeCommitted.connect(on_commit)
+        parent_layout.addWidget(range_filter, 1)
 
         if store:
-            self.fixed_spins[col] = (min_spin, max_spin)
+            self.range_filters[col] = range_filter
+
+    def _refresh_custom_range(self):
+        if self._custom_col not in self.model.table().columns:
+            self._custom_col = None
+        if self._custom_col is not None:
+            self.custom_range.set_values(self.model.table()[self._custom_col])
+
+    def _refresh_range_filters(self):
+        "Histogrammes et valeurs triées recalculés par version des données"
+        for col, range_filter in self.range_filters.items():
+            if col in self.df.columns:
+                range_filter.set_values(self.df[col])
+        self._refresh_custom_range()
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from hapsight.panel import Panel, panel_for
+from hapsight.tracing import traced
+from hapsight.versioned import cached
+
+WORLD = "Monde"
+# Quantiles conservés par cellule (déciles) ; les autres sont interpolés
+SKETCH_QUANTILES = np.linspace(0.0, 1.0, 11)
+
+# Statistiques proposées dans la vue pivot : libellé -> nom
+STATS = {
+    "Moyenne": "mean",
+    "Médiane": "median",
+    "Écart-type": "std",
+    "Min": "min",
+    "Max": "max",
+    "Nombre": "count",
+}
+
+
+@dataclass
+class RollupCube:
+    """Agrégats pré-calculés par (continent, année, indicateur).
+
+    Chaque cellule garde effectif, somme, somme des carrés, min, max et un
+    résumé de la distribution (déciles) ; moyenne, écart-type et quantiles
+    se lisent sans revenir aux lignes. ``WORLD`` regroupe tous les pays.
+    """
+
+    continents: list[str]
+    years: np.ndarray
+    indicators: list[str]
+    count: np.ndarray
+    total: np.ndarray
+    total_sq: np.ndarray
+    low: np.ndarray
+    high: np.ndarray
+    sketch: np.ndarray
+
+    @classmethod
+    @traced("cube.build")
+    def from_panel(cls, panel: Panel) -> RollupCube:
+        codes, names = pd.factorize(pd.Series(panel.continents).replace("", None))
+        groups = [codes == k for k in range(len(names))]
+        groups.append(np.ones(len(panel.countries), dtype=bool))
+        shape = (len(groups), len(panel.years), len(panel.indicators))
+
+        count = np.zeros(shape)
+        total = np.zeros(shape)
+        total_sq = np.zeros(shape)
+        low = np.full(shape, np.nan)
+        high = np.full(shape, np.nan)
+        sketch = np.full((*shape, len(SKETCH_QUANTILES)), np.nan)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # cellules vides
+            for g, members in enumerate(groups):
+                block = panel.values[members]
+                count[g] = (~np.isnan(block)).sum(axis=0)
+                total[g] = np.nansum(block, axis=0)
+                total_sq[g] = np.nansum(block**2, axis=0)
+                if len(block):
+                    low[g] = np.nanmin(block, axis=0)
+                    high[g] = np.nanmax(block, axis=0)
+                    sketch[g] = np.moveaxis(
+                        np.nanquantile(block, SKETCH_QUANTILES, axis=0), 0, -1
+                    )
+
+        return cls(
+            [str(n) for n in names] + [WORLD],
+            panel.years,
+            panel.indicators,
+            count,
+            total,
+            total_sq,
+            low,
+            high,
+            sketch,
+        )
+
+    def _cell(self, continent: str, year: int, indicator: str):
+        "Indices (continent, année, indicateur), None si la cellule n'existe pas"
+        if continent not in self.continents or indicator not in self.indicators:
+            return None
+        y = int(np.searchsorted(self.years, year))
+        if y >= len(self.years) or self.years[y] != year:
+            return None
+        return self.continents.index(continent), y, self.indicators.index(indicator)
+
+    def stat_grid(self, stat: str) -> np.ndarray:
+        "Tableau (continent × année × indicateur) d'une statistique"
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if stat == "count":
+                return self.count
+            if stat == "mean":
+                return np.where(self.count > 0, self.total / self.count, np.nan)
+            if stat == "std":
+                mean = self.total / self.count
+                var = self.total_sq / self.count - mean**2
+                return np.where(self.count > 0, np.sqrt(np.maximum(var, 0)), np.nan)
+        if stat == "min":
+            return self.low
+        if stat == "max":
+            return self.high
+        if stat == "median":
+            return self.sketch[..., len(SKETCH_QUANTILES) // 2]
+        raise ValueError(f"Statistique inconnue : {stat}")
+
+    def value(self, continent: str, year: int, indicator: str, stat: str) -> float:
+        "Agrégat d'une cellule (ex. moyenne du bonheur en Afrique en 2018)"
+        cell = self._cell(continent, year, indicator)
+        if cell is None:
+            return float("nan")
+        return float(self.stat_grid(stat)[cell])
+
+    def quantile(self, continent: str, year: int, indicator: str, q: float) -> float:
+        "Quantile approché, interpolé entre les déciles conservés"
+        cell = self._cell(continent, year, indicator)
+        if cell is None:
+            return float("nan")
+        return float(np.interp(q, SKETCH_QUANTILES, self.sketch[cell]))
+
+    def pivot(self, indicator: str, stat: str) -> pd.DataFrame:
+        "Vue pivot : une ligne par continent, une colonne par année"
+        grid = self.stat_grid(stat)[:, :, self.indicators.index(indicator)]
+        if stat == "count":
+            grid = grid.astype(int)
+        frame = pd.DataFrame(grid, columns=[str(y) for y in self.years])
+        frame.insert(0, "Continent", self.continents)
+        return frame
+
+
+def cube_for(df: pd.DataFrame) -> RollupCube:
+    "Cube construit une seule fois par version des données"
+    panel = panel_for(df)
+    return cached(panel, "cube", lambda: RollupCube.from_panel(panel))
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_integer_dtype
+
+from hapsight.tracing import traced
+
+DATASET_PATH = "dataset/happiness.csv"
+
+NUMERIC_COLUMNS = [
+    "happiness_score",
+    "gdp_per_capita",
+    "family",
+    "health",
+    "freedom",
+    "generosity",
+    "government_trust",
+    "dystopia_residual",
+    "social_support",
+    "cpi_score",
+]
+
+
+@traced("data.load")
+def load_data(path: str = DATASET_PATH) -> pd.DataFrame:
+    return pd.read_csv(path)
+
+
+@traced("data.normalize")
+def normalize_data(df: pd.DataFrame) -> pd.DataFrame:
+    "Nettoie les noms de colonnes et les types une seule fois pour tous les onglets"
+    df = df.copy()
+    df.columns = df.columns.str.strip()
+    if "year" in df.columns and "Year" not in df.columns:
+        df = df.rename(columns={"year": "Year"})
+    if "country" in df.columns and "Country" not in df.columns:
+        df = df.rename(columns={"country": "Country"})
+
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    if "Year" in df.columns:
+        df["Year"] = pd.to_numeric(df["Year"], errors="coerce").fillna(0).astype(int)
+    return df
+
+
+def load_normalized(path: str = DATASET_PATH) -> pd.DataFrame:
+    return normalize_data(load_data(path))
+
+
+@dataclass
+class DatasetDiff:
+    """Différence entre les données chargées et une nouvelle version.
+
+    ``merged`` garde l'ordre des lignes existantes (mises à jour), les lignes
+    supprimées en moins et les nouvelles lignes ajoutées à la fin.
+    """
+
+    merged: pd.DataFrame
+    inserted: int = 0
+    changed_rows: list[int] = field(default_factory=list)
+    removed_rows: list[int] = field(default_factory=list)
+    years: set[int] = field(default_factory=set)
+    full_reload: bool = False
+
+    @property
+    def is_empty(self) -> bool:
+        return not (
+            self.full_reload or self.inserted or self.changed_rows or self.removed_rows
+        )
+
+
+def diff_frames(
+    old: pd.DataFrame, new: pd.DataFrame, key: tuple[str, ...] = ("Country", "Year")
+) -> DatasetDiff:
+    "Compare deux versions ligne à ligne via la clé (pays, année), en vectoriel"
+    keys = list(key)
+    if (
+        list(old.columns) != list(new.columns)
+        or not set(keys).issubset(new.columns)
+        or old.duplicated(keys).any()
+        or new.duplicated(keys).any()
+    ):
+        years = set(old.get("Year", [])) | set(new.get("Year", []))
+        return DatasetDiff(new, years={int(y) for y in years}, full_reload=True)
+
+    old_idx = pd.MultiIndex.from_frame(old[keys])
+    new_idx = pd.MultiIndex.from_frame(new[keys])
+
+    kept = old_idx.isin(new_idx)
+    removed_rows = np.flatnonzero(~kept).tolist()
+    inserted_mask = ~new_idx.isin(old_idx)
+
+    # Lignes conservées, dans l'ordre actuel, avec les nouvelles valeurs
+    old_kept = old[kept]
+    positions = new_idx.get_indexer(old_idx[kept])
+    updated = new.iloc[positions].set_axis(old_kept.index)
+    same = (old_kept == updated) | (old_kept.isna() & updated.isna())
+    changed = ~same.all(axis=1).to_numpy()
+
+    inserted = new[inserted_mask]
+    start = int(old.index.max()) + 1 if len(old) and is_integer_dtype(old.index) else 0
+    inserted = inserted.set_axis(pd.RangeIndex(start, start + len(inserted)))
+    merged = pd.concat([updated, inserted])
+
+    year_col = "Year" if "Year" in keys else None
+    years: set[int] = set()
+    if year_col:
+        years |= set(old.loc[~kept, year_col].tolist())
+        years |= set(updated.loc[changed, year_col].tolist())
+        years |= set(inserted[year_col].tolist())
+
+    return DatasetDiff(
+        merged,
+        inserted=len(inserted),
+        changed_rows=np.flatnonzero(changed).tolist(),
+        removed_rows=removed_rows,
+        years={int(y) for y in years},
+    )
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+from collections.abc import Callable
+
+import pandas as pd
+from PySide6.QtCore import QObject, QThreadPool, Signal
+
+from hapsight.dataset import normalize_data
+from hapsight.tracing import span
+from hapsight.workers import Worker
+
+CHUNK_ROWS = 50_000
+
+# Colonnes attendues par les widgets -> noms rencontrés dans les sources
+COLUMN_ALIASES = {
+    "Country": ["country", "country name", "country or region", "entity", "nation"],
+    "Year": ["year", "annee"],
+    "happiness_score": [
+        "happiness score",
+        "happiness",
+        "score",
+        "ladder score",
+        "life ladder",
+    ],
+    "gdp_per_capita": [
+        "gdp per capita",
+        "economy gdp per capita",
+        "logged gdp per capita",
+        "log gdp per capita",
+        "gdp",
+    ],
+    "family": ["family"],
+    "social_support": ["social support"],
+    "health": [
+        "health",
+        "health life expectancy",
+        "healthy life expectancy",
+        "healthy life expectancy at birth",
+        "life expectancy",
+    ],
+    "freedom": ["freedom", "freedom to make life choices"],
+    "generosity": ["generosity"],
+    "government_trust": [
+        "government trust",
+        "trust government corruption",
+        "perceptions of corruption",
+    ],
+    "dystopia_residual": ["dystopia residual"],
+    "continent": ["continent", "region", "regional indicator"],
+    "cpi_score": ["cpi score", "cpi"],
+}
+REQUIRED_COLUMNS = ("Country", "Year", "happiness_score")
+SUPPORTED_FORMATS = (
+    "Données (*.csv *.parquet *.pq);;CSV (*.csv);;Parquet (*.parquet *.pq)"
+)
+
+
+class IngestError(ValueError):
+    pass
+
+
+class IngestCancelled(Exception):
+    pass
+
+
+def _norm(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", str(name).lower()).strip()
+
+
+_ALIAS_LOOKUP = {
+    _norm(alias): canonical
+    for canonical, aliases in COLUMN_ALIASES.items()
+    for alias in [canonical, *aliases]
+}
+
+
+def map_columns(columns) -> dict[str, str]:
+    "Associe les colonnes sources au schéma attendu (première occurrence)"
+    mapping: dict[str, str] = {}
+    for col in columns:
+        canonical = _ALIAS_LOOKUP.get(_norm(col))
+        if canonical is not None and canonical not in mapping.values():
+            mapping[col] = canonical
+    missing = [c for c in REQUIRED_COLUMNS if c not in mapping.values()]
+    if missing:
+        raise IngestError(f"Colonnes introuvables : {', '.join(missing)}")
+    return mapping
+
+
+def _iter_csv(path: str, chunk_rows: int):
+    size = max(os.path.getsize(path), 1)
+    with open(path, "rb") as f:
+        header = pd.read_csv(f, nrows=0).columns
+        mapping = map_columns(header)
+        f.seek(0)
+        reader = pd.read_csv(f, chunksize=chunk_rows, usecols=list(mapping))
+        for chunk in reader:
+            yield chunk.rename(columns=mapping), f.tell() / size
+
+
+def _iter_parquet(path: str, chunk_rows: int):
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(path)
+    mapping = map_columns(parquet.schema_arrow.names)
+    total = max(parquet.metadata.num_rows, 1)
+    done = 0
+    for batch in parquet.iter_batches(batch_size=chunk_rows, columns=list(mapping)):
+        done += batch.num_rows
+        yield batch.to_pandas().rename(columns=mapping), done / total
+
+
+def read_dataset(
+    path: str,
+    progress: Callable[[int], None] | None = None,
+    cancel: threading.Event | None = None,
+    chunk_rows: int = CHUNK_ROWS,
+) -> pd.DataFrame:
+    """Lit un CSV ou Parquet par blocs et le ramène au schéma des widgets.
+
+    ``progress`` reçoit un pourcentage ; ``cancel`` interrompt la lecture
+    entre deux blocs (``IngestCancelled``).
+    """
+    ext = os.path.splitext(path)[1].lower()
+    chunks_iter = _iter_parquet if ext in (".parquet", ".pq") else _iter_csv
+
+    chunks = []
+    with span("data.load"):
+        for chunk, fraction in chunks_iter(path, chunk_rows):
+            if cancel is not None and cancel.is_set():
+                raise IngestCancelled()
+            chunks.append(chunk)
+            if progress is not None:
+                progress(min(int(fraction * 100), 99))
+    if not chunks:
+        raise IngestError("Fichier vide")
+
+    df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    if "continent" not in df.columns:
+        df["continent"] = "Inconnu"
+    df = normalize_data(df)
+    if progress is not None:
+        progress(100)
+    return df
+
+
+def _read_or_cancel(path: str, progress, cancel) -> pd.DataFrame | None:
+    try:
+        return read_dataset(path, progress=progress, cancel=cancel)
+    except IngestCancelled:
+        return None
+
+
+class IngestController(QObject):
+    "Lecture en arrière-plan avec progression et annulation"
+
+    progress = Signal(int)
+    loaded = Signal(object)
+    failed = Signal(str)
+    cancelled = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._worker: Worker | None = None
+        self._cancel = threading.Event()
+
+    def is_running(self) -> bool:
+        return self._worker is not None
+
+    def start(self, path: str):
+        self.cancel()
+        self._cancel = threading.Event()
+        cancel = self._cancel
+        worker = Worker(_read_or_cancel, path, self.progress.emit, cancel)
+        worker.signals.finished.connect(lambda df: self._on_finished(worker, df))
+        worker.signals.failed.connect(lambda msg: self._on_failed(worker, msg))
+        self._worker = worker
+        QThreadPool.globalInstance().start(worker)
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _on_finished(self, worker, df):
+        # Résultat d'une lecture remplacée par une plus récente : ignoré
+        if worker is not self._worker:
+            return
+        self._worker = None
+        if df is None or self._cancel.is_set():
+            self.cancelled.emit()
+        else:
+            self.loaded.emit(df)
+
+    def _on_failed(self, worker, message: str):
+        if worker is not self._worker:
+            return
+        self._worker = None
+        self.failed.emit(message.strip().splitlines()[-1])
@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import numpy as np
+
+# Interactions scriptées mesurées par le harnais
+INTERACTIONS = {
+    "search_keystroke": "Frappe dans name_input -> filtre appliqué -> repaint",
+    "map_click": "Clic carte (QWebChannel) -> mise à jour du dashboard",
+    "year_change": "Changement de combo_annee -> redessin du graphique",
+    "multi_toggle": "Case cochée dans cmb_multi -> graphique comparatif",
+}
+
+SEARCH_SCRIPT = ["F", "r", "a", "n", "BACK", "BACK", "BACK", "BACK", "G", "e", "r"]
+MAP_SCRIPT = ["France", "Germany", "Japan", "Brazil", "United States of America"]
+MULTI_SCRIPT = ["France", "Germany", "Japan", "Brazil", "Canada", "Norway"]
+# Attente maximale d'un résultat asynchrone (filtre évalué hors thread GUI)
+APPLY_TIMEOUT_MS = 5000
+
+
+@dataclass
+class LatencyStats:
+    samples_ms: list[float] = field(default_factory=list)
+
+    def add(self, value_ms: float):
+        self.samples_ms.append(value_ms)
+
+    def summary(self) -> dict[str, float]:
+        "Résumé p50/p95/p99 (en millisecondes)"
+        if not self.samples_ms:
+            return {"n": 0}
+        arr = np.asarray(self.samples_ms, dtype=float)
+        p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+        return {
+            "n": int(arr.size),
+            "p50_ms": round(float(p50), 3),
+            "p95_ms": round(float(p95), 3),
+            "p99_ms": round(float(p99), 3),
+            "mean_ms": round(float(arr.mean()), 3),
+            "max_ms": round(float(arr.max()), 3),
+        }
+
+
+def _settle(app, target):
+    "Vide la file d'événements et force le repaint synchrone de la cible"
+    app.processEvents()
+    target.repaint()
+    app.processEvents()
+
+
+def _timed(app, stats: LatencyStats, trigger: Callable[[], None], target, done=None):
+    "``done`` : signal du résultat appliqué, attendu avant le repaint"
+    from PySide6.QtCore import QEventLoop, QTimer
+
+    loop = QEventLoop()
+    applied = []
+
+    def slot():
+        applied.append(True)
+        loop.quit()
+
+    if done is not None:
+        done.connect(slot)
+    t0 = time.perf_counter()
+    trigger()
+    if done is not None:
+        if not applied:
+            QTimer.singleShot(APPLY_TIMEOUT_MS, loop.quit)
+            loop.exec()
+        done.disconnect(slot)
+    _settle(app, target)
+    stats.add((time.perf_counter() - t0) * 1000.0)
+
+
+def _type(widget, key):
+    "Frappe dans le champ de recherche (le filtre suit après le délai)"
+    from PySide6.QtTest import QTest
+
+    if isinstance(key, str):
+        QTest.keyClicks(widget.name_input, key)
+    else:
+        QTest.keyClick(widget.name_input, key)
+
+
+def _run_search(app, df, repeat: int, stats: LatencyStats):
+    from PySide6.QtCore import Qt
+
+    from hapsight.countrieswidget import CountriesWidget
+
+    widget = CountriesWidget(df)
+    widget.resize(1200, 800)
+    widget.show()
+    _settle(app, widget)
+
+    viewport = widget.table.viewport()
+    for _ in range(repeat):
+        for key in SEARCH_SCRIPT:
+            if key == "BACK":
+                _timed(
+                    app,
+                    stats,
+                    lambda: _type(widget, Qt.Key.Key_Backspace),
+                    viewport,
+                    widget.proxy.filtersApplied,
+                )
+            else:
+                _timed(
+                    app,
+                    stats,
+                    lambda k=key: _type(widget, k),
+                    viewport,
+                    widget.proxy.filtersApplied,
+                )
+        widget.name_input.clear()
+        widget.proxy.flush()
+        _settle(app, viewport)
+    widget.close()
+
+
+def _run_map(app, df, repeat: int, click: LatencyStats, year: LatencyStats):
+    from hapsight.mapwidget import MapWidget
+
+    widget = MapWidget(df)
+    widget.resize(1400, 900)
+    widget.show()
+    _settle(app, widget)
+
+    dashboard = widget.infogroupbox
+    for _ in range(repeat):
+        for country in MAP_SCRIPT:
+            _timed(
+                app,
+                click,
+                lambda c=country: widget.bridge.select(c),
+                dashboard,
+            )
+            # On balaie les années pour le pays sélectionné
+            for idx in range(widget.combo_annee.count()):
+                _timed(
+                    app,
+                    year,
+                    lambda i=idx: widget.combo_annee.setCurrentIndex(i),
+                    widget.canvas,
+                )
+    widget.close()
+
+
+def _run_multi(app, df, repeat: int, stats: LatencyStats):
+    from PySide6.QtCore import Qt
+
+    from hapsight.stats_widget import StatsWidget
+
+    widget = StatsWidget(df)
+    widget.resize(1400, 900)
+    widget.show()
+    _settle(app, widget)
+
+    model = widget._multi_model
+    items = {model.item(i).text(): model.item(i) for i in range(model.rowCount())}
+    script = [items[c] for c in MULTI_SCRIPT if c in items]
+    for _ in range(repeat):
+        for state in (Qt.CheckState.Checked, Qt.CheckState.Unchecked):
+            for item in script:
+                _timed(
+                    app,
+                    stats,
+                    lambda it=item, s=state: it.setCheckState(s),
+                    widget.canvasautre,
+                )
+    widget.close()
+
+
+def _version_info(label: str | None) -> dict[str, str]:
+    info = {"label": label or ""}
+    try:
+        from importlib.metadata import version
+
+        info["package"] = version("HapSight")
+    except Exception:
+        info["package"] = "dev"
+    try:
+        info["commit"] = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        ).stdout.strip()
+    except Exception:
+        info["commit"] = ""
+    return info
+
+
+def run_harness(
+    df=None, interactions=None, repeat: int = 5, label: str | None = None
+) -> dict:
+    "Pilote les widgets hors écran et retourne le rapport de latences"
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    import PySide6
+    from PySide6.QtWidgets import QApplication
+
+    from hapsight.countrieswidget import FILTER_DEBOUNCE_MS
+
+    app = QApplication.instance() or QApplication([])
+    if df is None:
+        from hapsight.mainwindow import load_data
+
+        df = load_data()
+
+    selected = list(interactions or INTERACTIONS)
+    stats = {name: LatencyStats() for name in selected}
+
+    if "search_keystroke" in selected:
+        _run_search(app, df, repeat, stats["search_keystroke"])
+    if "map_click" in selected or "year_change" in selected:
+        click = stats.get("map_click", LatencyStats())
+        year = stats.get("year_change", LatencyStats())
+        _run_map(app, df, repeat, click, year)
+    if "multi_toggle" in selected:
+        _run_multi(app, df, repeat, stats["multi_toggle"])
+
+    return {
+        "version": _version_info(label),
+        "environment": {
+            "python": platform.python_version(),
+            "qt": PySide6.__version__,
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM", ""),
+        },
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "repeat": repeat,
+        # Inclus dans search_keystroke : délai de regroupement des frappes
+        "filter_debounce_ms": FILTER_DEBOUNCE_MS,
+        "interactions": {name: stats[name].summary() for name in selected},
+    }
+
+
+def compare_reports(
+    baseline: dict, current: dict, threshold: float = 0.10
+) -> list[dict]:
+    "Compare deux rapports interaction par interaction (p50/p95/p99)"
+    rows = []
+    for name, cur in current.get("interactions", {}).items():
+        base = baseline.get("interactions", {}).get(name)
+        if not base or not base.get("n") or not cur.get("n"):
+            continue
+        row = {"interaction": name, "regression": False}
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            before, after = base[key], cur[key]
+            ratio = after / before if before > 0 else float("inf")
+            row[key] = (before, after, ratio)
+            if key != "p50_ms" and ratio > 1.0 + threshold:
+                row["regression"] = True
+        rows.append(row)
+    return rows
+
+
+def format_report(report: dict) -> str:
+    lines = [f"{'interaction':<18} {'n':>5} {'p50':>9} {'p95':>9} {'p99':>9}"]
+    for name, s in report["interactions"].items():
+        if not s.get("n"):
+            lines.append(f"{name:<18} {0:>5} {'-':>9} {'-':>9} {'-':>9}")
+            continue
+        lines.append(
+            f"{name:<18} {s['n']:>5} {s['p50_ms']:>8.2f}ms"
+            f" {s['p95_ms']:>7.2f}ms {s['p99_ms']:>7.2f}ms"
+        )
+    return "\n".join(lines)
+
+
+def format_comparison(rows: list[dict]) -> str:
+    lines = [f"{'interaction':<18} {'p50':>16} {'p95':>16} {'p99':>16}"]
+    for row in rows:
+        cells = [
+            f"{row[k][0]:.1f}->{row[k][1]:.1f} ({row[k][2]:.2f}x)"
+            for k in ("p50_ms", "p95_ms", "p99_ms")
+        ]
+        flag = "  <-- REGRESSION" if row["regression"] else ""
+        lines.append(f"{row['interaction']:<18} " + " ".join(cells) + flag)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Mesure des latences d'interaction de HapSight (hors écran)"
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=sorted(INTERACTIONS),
+        help="Interactions à mesurer (toutes par défaut)",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--label", help="Nom de la version mesurée")
+    parser.add_argument("--output", "-o", help="Fichier JSON du rapport")
+    parser.add_argument("--compare", help="Rapport JSON de référence à comparer")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Hausse relative de p95/p99 considérée comme une régression",
+    )
+    args = parser.parse_args(argv)
+
+    report = run_harness(interactions=args.only, repeat=args.repeat, label=args.label)
+    print(format_report(report))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare_reports(baseline, report, args.threshold)
+        print()
+        print(format_comparison(rows))
+        if any(row["regression"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
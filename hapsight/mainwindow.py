@@ -1,44 +1,402 @@
+import argparse
+import logging
+import os
 import sys
 
 import pandas as pd
-from PySide6.QtGui import QIcon
-from PySide6.QtWidgets import QApplication, QMainWindow, QTabWidget
+from PySide6.QtCore import QObject, Qt
+from PySide6.QtGui import QAction, QIcon, QKeySequence, QPixmap, QShortcut
+from PySide6.QtWidgets import (
+    QApplication,
+    QDockWidget,
+    QFileDialog,
+    QLabel,
+    QMainWindow,
+    QMessageBox,
+    QProgressDialog,
+    QSplashScreen,
+    QTabWidget,
+)
 
+from hapsight.brushing import Brush
+from hapsight.computed import ComputedColumns
+from hapsight.computed_panel import ComputedPanel
 from hapsight.countrieswidget import CountriesWidget
+from hapsight.dataset import (  # noqa: F401
+    DATASET_PATH,
+    DatasetDiff,
+    load_data,
+    load_normalized,
+)
+from hapsight.ingest import SUPPORTED_FORMATS, IngestController, read_dataset
 from hapsight.mapwidget import MapWidget
+from hapsight.movers_panel import MoversPanel
+from hapsight.perf_panel import PerformancePanel
+from hapsight.reload import DatasetWatcher
+from hapsight.startup_profiler import StartupProfiler
 from hapsight.stats_widget import StatsWidget
+from hapsight.tracing import span
+from hapsight.watchdog import StallWatchdog
+from hapsight.workers import run_in_background
 
-
-def load_data() -> pd.DataFrame:
-    return pd.read_csv("dataset/happiness.csv")
+TABS = ["Carte du Monde", "Stats et Corrélations", "Pays"]
 
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(
+        self,
+        df: pd.DataFrame | None = None,
+        deferred: bool = False,
+        native_map: bool = False,
+    ):
+        """Fenêtre principale.
+
+        Avec ``deferred=True``, seule la carte est construite (le moteur web
+        démarre tout de suite) ; les autres onglets sont remplis par
+        ``populate`` quand les données sont prêtes. ``native_map`` remplace
+        la carte QtWebEngine par le rendu Qt natif.
+        """
         super().__init__()
 
         self.setWindowTitle("HappySight")
         self.setGeometry(100, 100, 1200, 600)
 
-        df = load_data()
+        if df is None and not deferred:
+            df = load_normalized()
 
         self.tab_manager = QTabWidget()
-        self.map_tab = MapWidget(df)
-        self.countries_tab = CountriesWidget(df)
-        self.PaoloStats_tab = StatsWidget(df)
+        with span("window.MapWidget"):
+            self.map_tab = MapWidget(df, native=native_map)
+        self.tab_manager.addTab(self.map_tab, TABS[0])
+        self.countries_tab = None
+        self.PaoloStats_tab = None
+        self.df = df
+        self.watcher = None
+        self.dataset_path = DATASET_PATH
+
+        # Menu Fichier -> Ouvrir (lecture en arrière-plan)
+        self.ingest = IngestController(self)
+        self.ingest.progress.connect(self._on_open_progress)
+        self.ingest.loaded.connect(self._on_open_loaded)
+        self.ingest.failed.connect(self._on_open_failed)
+        self.ingest.cancelled.connect(self._close_progress)
+        self.progress_dialog: QProgressDialog | None = None
+        self._opening_path = ""
 
-        self.tab_manager.addTab(self.map_tab, "Carte du Monde")
-        self.tab_manager.addTab(self.PaoloStats_tab, "Stats et Corrélations")
-        self.tab_manager.addTab(self.countries_tab, "Pays")
+        file_menu = self.menuBar().addMenu("Fichier")
+        self.open_action = QAction("Ouvrir…", self)
+        self.open_action.setShortcut(QKeySequence.StandardKey.Open)
+        self.open_action.triggered.connect(self.open_dataset_dialog)
+        file_menu.addAction(self.open_action)
+        for name in TABS[1:]:
+            placeholder = QLabel("Chargement des données…")
+            placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.tab_manager.addTab(placeholder, name)
 
         self.setCentralWidget(self.tab_manager)
 
+        # Panneau "Performance" caché, affiché avec Ctrl+Shift+P
+        self.perf_dock = QDockWidget("Performance", self)
+        self.perf_dock.setWidget(PerformancePanel(self.perf_dock))
+        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.perf_dock)
+        self.perf_dock.hide()
+        self.perf_shortcut = QShortcut(QKeySequence("Ctrl+Shift+P"), self)
+        self.perf_shortcut.activated.connect(self.toggle_perf_panel)
+
+        # Menu Analyse -> pays ayant le plus progressé / reculé
+        self.movers_dock = QDockWidget("Plus fortes évolutions", self)
+        self.movers_panel = MoversPanel(self.movers_dock)
+        self.movers_dock.setWidget(self.movers_panel)
+        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.movers_dock)
+        self.movers_dock.hide()
+        analysis_menu = self.menuBar().addMenu("Analyse")
+        analysis_menu.addAction(self.movers_dock.toggleViewAction())
+
+        # Menu Analyse -> colonnes calculées (partagées par tous les onglets)
+        self.computed = ComputedColumns(self)
+        self.computed_dock = QDockWidget("Colonnes calculées", self)
+        self.computed_panel = ComputedPanel(self.computed, self.computed_dock)
+        self.computed_dock.setWidget(self.computed_panel)
+        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.computed_dock)
+        self.computed_dock.hide()
+        analysis_menu.addAction(self.computed_dock.toggleViewAction())
+
+        # Sélection du nuage de points, partagée avec la table et la carte
+        self.brush = Brush(self)
+        self.brush.changed.connect(self.map_tab.set_brush)
+
+        if df is not None:
+            self.populate(df, with_map=False)
+
+    def populate(self, df: pd.DataFrame, with_map: bool = True):
+        "Remplit les onglets de données (remplace les placeholders)"
+        self.df = df
+        if with_map:
+            self.map_tab.set_data(df)
+        with span("window.CountriesWidget"):
+            self.countries_tab = CountriesWidget(
+                df, computed=self.computed, brush=self.brush
+            )
+        self.countries_tab.countryHighlighted.connect(self.map_tab.prefetch)
+        self.movers_panel.set_data(df)
+        self.computed_panel.set_data(df)
+        with span("window.StatsWidget"):
+            self.PaoloStats_tab = StatsWidget(
+                df, computed=self.computed, brush=self.brush
+            )
+        self._replace_tab(1, self.PaoloStats_tab)
+        self._replace_tab(2, self.countries_tab)
+
+    def _replace_tab(self, index: int, widget):
+        current = self.tab_manager.currentIndex()
+        old = self.tab_manager.widget(index)
+        self.tab_manager.removeTab(index)
+        self.tab_manager.insertTab(index, widget, TABS[index])
+        self.tab_manager.setCurrentIndex(current)
+        if old is not None:
+            old.deleteLater()
+
+    def set_dataset(self, df: pd.DataFrame):
+        "Remplace complètement les données de tous les onglets"
+        self.df = df
+        if self.countries_tab is None:
+            self.populate(df)
+            return
+        self.map_tab.set_data(df)
+        self.countries_tab.set_data(df)
+        self.movers_panel.set_data(df)
+        self.computed_panel.set_data(df)
+        self.PaoloStats_tab.set_data(df)  # type: ignore
+
+    def open_dataset_dialog(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Ouvrir un jeu de données", "", SUPPORTED_FORMATS
+        )
+        if path:
+            self.open_dataset(path)
+
+    def open_dataset(self, path: str):
+        "Lit le fichier sur un thread ; les onglets basculent quand il est prêt"
+        self._opening_path = path
+        if self.progress_dialog is None:
+            self.progress_dialog = QProgressDialog(
+                "Chargement…", "Annuler", 0, 100, self
+            )
+            self.progress_dialog.setWindowTitle("Ouverture")
+            self.progress_dialog.setMinimumDuration(300)
+            self.progress_dialog.setAutoClose(False)
+            self.progress_dialog.setAutoReset(False)
+            self.progress_dialog.canceled.connect(self.ingest.cancel)
+        self.progress_dialog.setLabelText(f"Chargement de {path}…")
+        self.progress_dialog.setValue(0)
+        self.ingest.start(path)
+
+    def _on_open_progress(self, percent: int):
+        if self.progress_dialog is not None:
+            self.progress_dialog.setValue(percent)
+
+    def _on_open_loaded(self, df: pd.DataFrame):
+        self._close_progress()
+        self.set_dataset(df)
+        self.dataset_path = self._opening_path
+        if self.watcher is not None:
+            self.watcher.deleteLater()
+            self.watcher = None
+            self.enable_live_reload(self.dataset_path)
+        self.statusBar().showMessage(
+            f"{self.dataset_path} : {len(df)} ligne(s) chargée(s)", 5000
+        )
+
+    def _on_open_failed(self, message: str):
+        self._close_progress()
+        QMessageBox.critical(
+            self, "Erreur", f"Impossible d'ouvrir le fichier.\n\n{message}"
+        )
+
+    def _close_progress(self):
+        if self.progress_dialog is not None:
+            self.progress_dialog.reset()
+            self.progress_dialog.hide()
+
+    def enable_live_reload(self, path: str | None = None):
+        "Recharge le fichier à chaque modification, de façon incrémentale"
+        if self.df is None:
+            return
+        path = path or self.dataset_path
+        self.watcher = DatasetWatcher(path, self.df, self)
+        self.watcher.datasetChanged.connect(self.apply_dataset_diff)
+        self.watcher.failed.connect(
+            lambda msg: self.statusBar().showMessage("Rechargement impossible", 5000)
+        )
+
+    def apply_dataset_diff(self, diff: DatasetDiff):
+        self.df = diff.merged
+        if diff.full_reload or self.countries_tab is None:
+            self.set_dataset(diff.merged)
+        else:
+            self.map_tab.update_years(diff.merged, diff.years)
+            self.countries_tab.apply_diff(diff)
+            self.PaoloStats_tab.set_data(diff.merged)  # type: ignore
+            self.movers_panel.set_data(diff.merged)
+            self.computed_panel.set_data(diff.merged)
+        self.statusBar().showMessage(
+            f"Données rechargées : {diff.inserted} ajout(s), "
+            f"{len(diff.changed_rows)} modification(s), "
+            f"{len(diff.removed_rows)} suppression(s)",
+            5000,
+        )
+
+    def toggle_perf_panel(self):
+        self.perf_dock.setVisible(not self.perf_dock.isVisible())
+
+
+class StartupPipeline(QObject):
+    """Démarrage en parallèle : splash immédiat, CSV lu et normalisé sur un
+    thread pendant que QtWebEngine démarre et charge la carte."""
 
-def main():
-    app = QApplication(sys.argv)
+    def __init__(
+        self,
+        app: QApplication,
+        path: str = DATASET_PATH,
+        watch: bool = False,
+        native_map: bool = False,
+    ):
+        super().__init__()
+        self.app = app
+        self.path = path
+        self.watch = watch
+        self.native_map = native_map
+        self.window: MainWindow | None = None
+        self._df: pd.DataFrame | None = None
+
+        self.splash = QSplashScreen(QPixmap("dataset/iconapp.png"))
+        self.splash.show()
+        self.splash.showMessage(
+            "Chargement des données…",
+            Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignHCenter,
+        )
+        app.processEvents()
+
+        # Lancé avant de construire la fenêtre pour recouvrir les deux
+        self._loader = run_in_background(
+            read_dataset, path, on_done=self._on_data, on_error=self._on_error
+        )
+
+    def build_window(self) -> MainWindow:
+        self.splash.showMessage(
+            "Démarrage de la carte…",
+            Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignHCenter,
+        )
+        self.window = MainWindow(deferred=True, native_map=self.native_map)
+        if self._df is not None:
+            self._fill()
+        return self.window
+
+    def show(self):
+        assert self.window is not None
+        self.window.showMaximized()
+        self.splash.finish(self.window)
+
+    def _on_data(self, df: pd.DataFrame):
+        self._df = df
+        if self.window is not None:
+            self._fill()
+
+    def _fill(self):
+        assert self.window is not None and self._df is not None
+        self.window.populate(self._df)
+        self.window.dataset_path = self.path
+        if self.watch:
+            self.window.enable_live_reload(self.path)
+
+    def _on_error(self, message: str):
+        self.splash.close()
+        QMessageBox.critical(
+            self.window, "Erreur", f"Impossible de charger les données.\n\n{message}"
+        )
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="hapsight")
+    parser.add_argument(
+        "dataset",
+        nargs="?",
+        default=DATASET_PATH,
+        help="Fichier CSV ou Parquet à ouvrir (défaut : %(default)s)",
+    )
+    parser.add_argument(
+        "--watchdog",
+        type=float,
+        nargs="?",
+        const=50.0,
+        metavar="MS",
+        help="Détecte les blocages de la boucle Qt au-delà de MS ms (défaut 50)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Recharge le jeu de données quand le fichier change",
+    )
+    parser.add_argument(
+        "--native-map",
+        action="store_true",
+        default=bool(os.environ.get("HAPSIGHT_NATIVE_MAP")),
+        help="Carte dessinée par Qt, sans QtWebEngine (démarrage plus léger)",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Mesure les phases du démarrage, écrit un rapport JSON puis quitte",
+    )
+    parser.add_argument(
+        "--profile-output",
+        default="startup-profile.json",
+        metavar="FICHIER",
+        help="Fichier JSON du profil de démarrage",
+    )
+    # Les options non reconnues sont laissées à Qt
+    return parser.parse_known_args(argv)
+
+
+def main(import_ns: tuple[int, int] | None = None):
+    args, qt_args = parse_args(sys.argv[1:])
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
+    if not args.native_map:
+        # Schéma local des ressources hors ligne : avant la QApplication
+        from hapsight.offline import register_scheme
+
+        register_scheme()
+
+    profiler = None
+    if args.profile_startup:
+        profiler = StartupProfiler(args.profile_output, import_ns=import_ns)
+
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setWindowIcon(QIcon("dataset/iconapp.png"))
-    window = MainWindow()
-    window.showMaximized()
+
+    watchdog = None
+    if args.watchdog:
+        watchdog = StallWatchdog(threshold_ms=args.watchdog)
+        watchdog.start()
+
+    pipeline = StartupPipeline(
+        app, args.dataset, watch=args.watch, native_map=args.native_map
+    )
+    window = pipeline.build_window()
+    if watchdog is not None:
+        window.perf_dock.widget().set_watchdog(watchdog)  # type: ignore
+
+        def dump_report():
+            watchdog.stop()
+            logging.getLogger("hapsight.watchdog").info(
+                "Rapport :\n%s", watchdog.report()
+            )
+
+        app.aboutToQuit.connect(dump_report)
+
+    if profiler is not None:
+        profiler.watch(window, window.map_tab.web_view)
+    pipeline.show()
     sys.exit(app.exec())
 
 
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pandas as pd
+from PySide6.QtCore import QObject, Signal, Slot
+
+from hapsight.animation import DATA_TO_GEO
+from hapsight.tracing import traced
+
+
+class MapBridge(QObject):
+    "Objet exposé à la page de la carte via QWebChannel"
+
+    countrySelected = Signal(str)
+    countryHovered = Signal(str)
+
+    @Slot(str)
+    def select(self, name: str):
+        self.countrySelected.emit(name)
+
+    @Slot(str)
+    def hover(self, name: str):
+        "Survol prolongé d'un pays (déjà temporisé côté page)"
+        self.countryHovered.emit(name)
+
+
+@traced("map.tooltip_table")
+def tooltip_payload(df: pd.DataFrame, columns: list[tuple[str, str]]) -> str:
+    """Appel ``hapsightSetData`` avec les valeurs de chaque pays et année.
+
+    Table compacte envoyée une fois par version des données : pour chaque
+    année, une liste par indicateur alignée sur ``names`` (noms du GeoJSON).
+    Les infobulles sont ensuite construites en JavaScript au survol.
+    """
+    cols = [col for _, col in columns if col in df.columns]
+    labels = [label for label, col in columns if col in df.columns]
+    table = df.pivot_table(
+        index="Year", columns="Country", values=cols, aggfunc="first"
+    )
+    countries = sorted(df["Country"].dropna().astype(str).unique())
+    table = table.reindex(columns=pd.MultiIndex.from_product([cols, countries]))
+
+    values = {}
+    for year, row in table.iterrows():
+        grid = row.to_numpy(dtype=float, na_value=np.nan).reshape(
+            len(cols), len(countries)
+        )
+        rounded = np.round(grid, 3).astype(object)
+        rounded[np.isnan(grid)] = None
+        values[str(int(year))] = rounded.tolist()  # type: ignore
+
+    payload = {
+        "names": [DATA_TO_GEO.get(c, c) for c in countries],
+        "labels": labels,
+        "values": values,
+    }
+    return f"hapsightSetData({json.dumps(payload, separators=(',', ':'))});"
@@ -1,17 +1,17 @@
 import io
+import json
+import logging
 
 import folium
 import matplotlib
 import pandas as pd
 import pycountry
-import requests
 
 matplotlib.use("QtAgg")  # Obligatoire pour PySide6
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
 from matplotlib.figure import Figure
-from PySide6.QtCore import Qt, QUrl
+from PySide6.QtCore import Qt, QTimer, QUrl
 from PySide6.QtGui import QPixmap
-from PySide6.QtWebEngineWidgets import QWebEngineView
 from PySide6.QtWidgets import (
     QComboBox,
     QFrame,
@@ -19,20 +19,150 @@ from PySide6.QtWidgets import (
     QGroupBox,
     QHBoxLayout,
     QLabel,
+    QPushButton,
+    QStackedWidget,
     QVBoxLayout,
     QWidget,
 )
 
+from hapsight.animation import (
+    DATA_TO_GEO,
+    FRAME_JS,
+    GEO_NAME_ALIASES,
+    YearFrames,
+    compute_year_frames,
+)
+from hapsight.brushing import BrushSelection
+from hapsight.cache import (
+    GEOJSON_URL,
+    geometry_hash,
+    local_asset_url,
+    map_cache_key,
+    read_cached_html,
+    store_cached_html,
+)
+from hapsight.map_bridge import MapBridge, tooltip_payload
+from hapsight.native_map import NativeMapView
+from hapsight.panel import panel_for
+from hapsight.prefetch import (
+    HOVER_DELAY_MS,
+    DashboardPrefetcher,
+    draw_sparkline,
+    fetch_flag,
+)
+from hapsight.ranking import pct_column, rank_column, ranks_for, update_ranks
+from hapsight.tracing import span, traced
+
+logger = logging.getLogger("hapsight.mapwidget")
+
+# Indicateurs du dashboard : (icône, libellé, colonne)
+DASHBOARD_STATS = [
+    ("💰", "PIB/Hab", "gdp_per_capita"),
+    ("❤️", "Espérance", "health"),
+    ("⚖️", "Corruption", "cpi_score"),
+    ("👨‍👩‍👧", "Social", "family"),
+    ("🕊️", "Liberté", "freedom"),
+    ("🎁", "Générosité", "generosity"),
+]
+
+# Durée d'une image de l'animation des années
+FRAME_MS = 800
+
+# Options et scripts de la carte folium (entrent dans la clé du cache HTML)
+MAP_OPTIONS = {
+    "location": [20, 0],
+    "zoom_start": 2,
+    "min_zoom": 2,
+    "max_zoom": 6,
+    "tiles": "CartoDB positron",
+    "max_bounds": True,
+}
+MAP_HEAD = (
+    "<style>.leaflet-interactive:focus { outline: none !important; }</style>"
+    '<script src="qrc:///qtwebchannel/qwebchannel.js"></script>'
+)
+LAYER_JS = """
+var geojsonLayer = L.geoJson(null, {
+    style: hapsightStyle,
+    onEachFeature: onEachFeature
+});
+fetch("%(geo_url)s").then(r => r.json()).then(d => { geojsonLayer.addData(d); geojsonLayer.addTo(%(map)s); });
+"""
+# Survol (infobulle, surbrillance) entièrement en JavaScript ; le clic et le
+# survol prolongé (préchargement du dashboard) remontent via QWebChannel
+CLICK_JS = """
+var hapsightData = null, hapsightBridge = null, hapsightHoverTimer = null;
+if (typeof QWebChannel !== 'undefined' && window.qt) {
+    new QWebChannel(qt.webChannelTransport, function (channel) {
+        hapsightBridge = channel.objects.bridge;
+    });
+}
+function hapsightSetData(data) {
+    data.index = {};
+    for (var i = 0; i < data.names.length; i++) { data.index[data.names[i]] = i; }
+    hapsightData = data;
+}
+function hapsightSetYear(year) { hapsightYear = year; }
+function hapsightTooltip(layer) {
+    var name = layer.feature.properties.name;
+    var html = '<b>' + name + '</b>';
+    if (!hapsightData || hapsightYear === null) { return html; }
+    var i = hapsightData.index[name], rows = hapsightData.values[hapsightYear];
+    if (i === undefined || !rows) { return html + '<br><i>Pas de données ' + hapsightYear + '</i>'; }
+    html += ' (' + hapsightYear + ')';
+    for (var c = 0; c < hapsightData.labels.length; c++) {
+        var v = rows[c][i];
+        if (v !== null) { html += '<br>' + hapsightData.labels[c] + ' : ' + v; }
+    }
+    return html;
+}
+function hapsightHover(name) {
+    clearTimeout(hapsightHoverTimer);
+    if (name === null || !hapsightBridge) { return; }
+    hapsightHoverTimer = setTimeout(function () { hapsightBridge.hover(name); }, HOVER_DELAY_MS);
+}
+function onEachFeature(feature, layer) {
+    layer.bindTooltip(hapsightTooltip, { sticky: true });
+    layer.on({
+        mouseover: function (e) {
+            e.target.setStyle({ weight: 2, color: '#154360' });
+            e.target.bringToFront();
+            hapsightHover(feature.properties.name);
+        },
+        mouseout: function (e) {
+            geojsonLayer.resetStyle(e.target);
+            hapsightHover(null);
+        },
+        click: function (e) {
+            hapsightSelected = feature.properties.name;
+            geojsonLayer.resetStyle();
+            if (hapsightBridge) { hapsightBridge.select(hapsightSelected); }
+        }
+    });
+}
+""".replace("HOVER_DELAY_MS", str(HOVER_DELAY_MS))
+
 
 class MapWidget(QWidget):
-    def __init__(self, df: pd.DataFrame, parent=None):
+    def __init__(self, df: pd.DataFrame | None, parent=None, native: bool = False):
         super().__init__(parent)
 
         self.pays_actuel = None
+        # Carte dessinée par Qt au lieu de QtWebEngine (pas de Chromium)
+        self.native = native
 
+        # df peut arriver plus tard (chargement en arrière-plan) : set_data
         self.df = df
         self.data_happiness = None
-        self.load_df_data()
+        self.ranks: pd.DataFrame | None = None
+        self.frames: YearFrames | None = None
+        self._tooltip_js: str | None = None
+        self._colors_active = False
+        # Pays sélectionnés dans le nuage de points (noms GeoJSON)
+        self._brushed: list[str] | None = None
+        self.prefetcher = DashboardPrefetcher(parent=self)
+        if df is not None:
+            self.load_df_data()
 
         layout = QHBoxLayout(self)
         layout.setContentsMargins(10, 10, 10, 10)
@@ -46,10 +176,35 @@ class MapWidget(QWidget):
         carte_layout = QVBoxLayout()
         carte_layout.setContentsMargins(1, 1, 1, 1)
 
-        self.web_view = QWebEngineView()
-        self.web_view.titleChanged.connect(self.on_country_clicked)
-
-        carte_layout.addWidget(self.web_view)
+        # Clic sur un pays -> Python ; le survol (temporisé) sert au préchargement
+        self.bridge = MapBridge(self)
+        self.bridge.countrySelected.connect(self.on_country_clicked)
+        self.bridge.countryHovered.connect(self.prefetch)
+        self._page_ready = False
+
+        if native:
+            self.web_view = None
+            self.map_view = NativeMapView()
+            self.map_view.countryClicked.connect(self.bridge.select)
+            self.map_view.countryHovered.connect(self.bridge.hover)
+            self.map_view.geometryLoaded.connect(self._push_map_data)
+            carte_layout.addWidget(self.map_view)
+        else:
+            # QtWebEngine n'est chargé qu'ici : le mode natif s'en passe
+            from PySide6.QtWebChannel import QWebChannel
+            from PySide6.QtWebEngineWidgets import QWebEngineView
+
+            from hapsight.offline import install_offline_assets
+
+            self.map_view = None
+            self.web_view = QWebEngineView()
+            # JS/CSS, GeoJSON et tuiles servis depuis le cache local si présents
+            install_offline_assets(self.web_view.page().profile())
+            self.web_view.loadFinished.connect(self._on_page_loaded)
+            self.channel = QWebChannel(self)
+            self.channel.registerObject("bridge", self.bridge)
+            self.web_view.page().setWebChannel(self.channel)
+            carte_layout.addWidget(self.web_view)
         self.cartegroupbox.setLayout(carte_layout)
         layout.addWidget(self.cartegroupbox)
 
@@ -75,8 +230,21 @@ class MapWidget(QWidget):
         )
         self.combo_annee.currentTextChanged.connect(self.on_year_changed)
 
+        # Lecture animée des années
+        self.btn_play = QPushButton("▶")
+        self.btn_play.setFixedWidth(32)
+        self.btn_play.setToolTip("Animer les années")
+        self.btn_play.setCheckable(True)
+        self.btn_play.toggled.connect(self.set_playing)
+        self.play_timer = QTimer(self)
+        self.play_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.play_timer.setInterval(FRAME_MS)
+        self.play_timer.timeout.connect(self.next_frame)
+        self._frames_sent = False
+
         year_layout.addWidget(lbl_annee)
         year_layout.addWidget(self.combo_annee)
+        year_layout.addWidget(self.btn_play)
         year_layout.addStretch()
         info_layout.addLayout(year_layout)
 
@@ -171,12 +339,24 @@ class MapWidget(QWidget):
         details_group.setLayout(grid_stats)
         info_layout.addWidget(details_group)
 
+        # CLASSEMENTS (rang de l'année pour chaque indicateur)
+        self.lbl_classements = QLabel("")
+        self.lbl_classements.setStyleSheet("color: #555; font-size: 12px;")
+        self.lbl_classements.setWordWrap(True)
+        info_layout.addWidget(self.lbl_classements)
+
         # GRAPHIQUE
+        self.year_marker = None
         self.figure = Figure(figsize=(4, 3), dpi=100)
         self.figure.patch.set_facecolor("none")
         self.canvas = FigureCanvasQTAgg(self.figure)
         self.canvas.setStyleSheet("background-color: transparent;")
-        info_layout.addWidget(self.canvas)
+        self.lbl_sparkline = QLabel()
+        self.lbl_sparkline.setAlignment(Qt.AlignCenter)  # type: ignore
+        self.graph_stack = QStackedWidget()
+        self.graph_stack.addWidget(self.canvas)
+        self.graph_stack.addWidget(self.lbl_sparkline)
+        info_layout.addWidget(self.graph_stack)
 
         info_layout.addStretch()
         self.infogroupbox.setLayout(info_layout)
@@ -186,45 +366,219 @@ class MapWidget(QWidget):
         layout.setStretch(1, 3)
 
         # --- Carte ---
-        self.load_folium_map()
+        if native:
+            self.map_view.load_async()  # type: ignore
+        else:
+            self.load_folium_map()
 
+    def set_data(self, df: pd.DataFrame):
+        "Remplace les données du dashboard (la carte n'en dépend pas)"
+        self.df = df
+        self.load_df_data()
+        self._refresh_years()
+        self._push_map_data()
+
+        if self.pays_actuel:
+            self.afficher_donnees_pays()
+
+    @traced("map.update_years")
+    def update_years(self, df: pd.DataFrame, years: set[int]):
+        "Recalcule les rangs uniquement pour les années modifiées"
+        previous, self.df = self.df, df
+        if self.data_happiness is None or previous is None:
+            self.load_df_data()
+        else:
+            self.ranks = update_ranks(previous, df, years)
+            self._invalidate_map_payloads()
+            kept = self.data_happiness[~self.data_happiness["Year"].isin(years)]
+            fresh = self._prepare_df(df[df["Year"].isin(years)], self.ranks)
+            self.data_happiness = pd.concat([kept, fresh]).sort_values(
+                by=["Year", "happiness_score"], ascending=[True, False], kind="stable"
+            )
+        self._refresh_years()
+        self._push_map_data()
+
+        if self.pays_actuel:
+            self.afficher_donnees_pays()
+
+    def _refresh_years(self):
+        years = sorted(self.data_happiness["Year"].unique().tolist())  # type: ignore
+        current = self.combo_annee.currentText()
+        self.combo_annee.blockSignals(True)
+        self.combo_annee.clear()
+        self.combo_annee.addItems([str(y) for y in years])
+        idx = self.combo_annee.findText(current)
+        self.combo_annee.setCurrentIndex(
+            idx if idx >= 0 else self.combo_annee.count() - 1
+        )
+        self.combo_annee.blockSignals(False)
+
+    @traced("map.load_df_data")
     def load_df_data(self):
-        df = self.df.copy()
+        self.ranks = ranks_for(self.df)
+        self.data_happiness = self._prepare_df(self.df, self.ranks)
+        self._invalidate_map_payloads()
+        logger.debug("Données chargées : %d lignes", len(self.data_happiness))
+
+    @staticmethod
+    def _prepare_df(df: pd.DataFrame, ranks: pd.DataFrame) -> pd.DataFrame:
+        df = df.copy()
         df.columns = df.columns.str.strip()
 
         df["happiness_score"] = pd.to_numeric(df["happiness_score"], errors="coerce")
         df["Year"] = pd.to_numeric(df["Year"], errors="coerce").fillna(0).astype(int)
 
         df = df.sort_values(by=["Year", "happiness_score"], ascending=[True, False])
-        df["Calculated Rank"] = df.groupby("Year").cumcount() + 1
-
-        self.data_happiness = df
-        print("Données DF chargées! Ouverture de l'application.")
+        df["Calculated Rank"] = ranks[rank_column("happiness_score")].reindex(df.index)
+        return df
 
     # EVENTS
-    def on_country_clicked(self, title):
-        if not title or "qrc:/" in title or "http" in title:
+    @traced("map.country_clicked")
+    def on_country_clicked(self, name):
+        if not name:
             return
 
-        self.pays_actuel = title
+        self.pays_actuel = name
         self.afficher_donnees_pays()
 
+    @traced("map.year_changed")
     def on_year_changed(self, new_year):
+        if self._colors_active:
+            self._show_frame(int(new_year))
+        else:
+            self._run_js(f"hapsightSetYear({int(new_year)});")
         if self.pays_actuel:
             self.afficher_donnees_pays()
 
+    # DONNÉES CÔTÉ PAGE
+    def _run_js(self, code: str):
+        if self._page_ready and self.web_view is not None:
+            self.web_view.page().runJavaScript(code)
+
+    def _on_page_loaded(self, ok: bool):
+        self._page_ready = ok
+        self._frames_sent = False
+        self._push_map_data()
+
+    def _invalidate_map_payloads(self):
+        self.prefetcher.invalidate()
+        self.frames = None
+        self._frames_sent = False
+        self._tooltip_js = None
+
+    def _push_map_data(self):
+        "Table des infobulles (une fois par version des données) et année"
+        if self.map_view is not None and self._colors_active:
+            self._show_frame(int(self.combo_annee.currentText()))
+        if not self._page_ready or self.data_happiness is None:
+            return
+        if self._tooltip_js is None:
+            columns = [
+                ("Bonheur", "happiness_score"),
+                ("Rang", "Calculated Rank"),
+                *((label, col) for _, label, col in DASHBOARD_STATS),
+            ]
+            self._tooltip_js = tooltip_payload(self.data_happiness, columns)
+        self._run_js(self._tooltip_js)
+        year = int(self.combo_annee.currentText())
+        self._run_js(f"hapsightSetYear({year});")
+        if self._colors_active:
+            self._show_frame(year)
+        if self._brushed is not None:
+            self._push_brush()
+
+    def set_brush(self, selection: BrushSelection | None):
+        "Pays sélectionnés dans le nuage de points ; les autres sont estompés"
+        self._brushed = (
+            None
+            if selection is None
+            else sorted(DATA_TO_GEO.get(c, c) for c in selection.countries)
+        )
+        self._push_brush()
+
+    def _push_brush(self):
+        if self.map_view is not None:
+            self.map_view.set_brushed(
+                None if self._brushed is None else set(self._brushed)
+            )
+            return
+        self._run_js(f"hapsightBrush({json.dumps(self._brushed)});")
+
+    # ANIMATION
+
+    def ensure_frames(self) -> YearFrames | None:
+        "Précalcule couleurs et légende de toutes les années (une fois)"
+        if self.frames is None and self.data_happiness is not None:
+            self.frames = compute_year_frames(self.data_happiness)
+        return self.frames
+
+    def _show_frame(self, year: int):
+        frames = self.ensure_frames()
+        if frames is None or year not in frames.frames:
+            return
+        if self.map_view is not None:
+            self.map_view.show_frame(frames, year)
+            self._colors_active = True
+            return
+        if not self._frames_sent:
+            self._run_js(frames.setup_js())
+            self._frames_sent = self._page_ready
+        self._run_js(frames.frames[year])
+        self._colors_active = True
+
+    def set_playing(self, playing: bool):
+        if playing:
+            if self.ensure_frames() is None:
+                self.btn_play.setChecked(False)
+                return
+            # Relance depuis le début si on est sur la dernière année
+            if self.combo_annee.currentIndex() == self.combo_annee.count() - 1:
+                self._set_year_index(0)
+            self._show_frame(int(self.combo_annee.currentText()))
+            self.btn_play.setText("⏸")
+            self.play_timer.start()
+        else:
+            self.play_timer.stop()
+            self.btn_play.setText("▶")
+            # Dashboard complet seulement à l'arrêt (drapeau, classements…)
+            if self.pays_actuel:
+                self.afficher_donnees_pays()
+
+    def next_frame(self):
+        "Image suivante : envoi de la chaîne précalculée et du marqueur"
+        idx = self.combo_annee.currentIndex() + 1
+        if idx >= self.combo_annee.count():
+            self.btn_play.setChecked(False)
+            return
+        self._set_year_index(idx)
+        year = int(self.combo_annee.currentText())
+        self._show_frame(year)
+        self._move_year_marker(year)
+        if idx == self.combo_annee.count() - 1:
+            self.btn_play.setChecked(False)
+
+    def _set_year_index(self, idx: int):
+        self.combo_annee.blockSignals(True)
+        self.combo_annee.setCurrentIndex(idx)
+        self.combo_annee.blockSignals(False)
+
+    def _move_year_marker(self, year: int):
+        if self.graph_stack.currentWidget() is self.lbl_sparkline and self.pays_actuel:
+            # Image préchargée : on repasse au graphique interactif
+            self.update_graph(GEO_NAME_ALIASES.get(self.pays_actuel, self.pays_actuel))
+            return
+        if self.year_marker is None:
+            return
+        self.year_marker.set_xdata([year, year])
+        self.canvas.draw_idle()
+
     # AFFICHER PAYS
+    @traced("map.dashboard")
     def afficher_donnees_pays(self):
         if not self.pays_actuel or self.data_happiness is None:
             return
 
-        mapping_noms = {
-            "United States of America": "United States",
-            "Tanzania": "United Republic of Tanzania",
-            "Congo": "Congo (Brazzaville)",
-            "Democratic Republic of the Congo": "Congo (Kinshasa)",
-        }
-        nom_recherche = mapping_noms.get(self.pays_actuel, self.pays_actuel)
+        nom_recherche = GEO_NAME_ALIASES.get(self.pays_actuel, self.pays_actuel)
         annee = int(self.combo_annee.currentText())
 
         resultat = self.data_happiness[
@@ -246,7 +600,10 @@ class MapWidget(QWidget):
                 self.val_generosity,
             ]:
                 label.setText("-")
+            self.lbl_classements.setText("")
+            self.year_marker = None
             self.figure.clear()
+            self.graph_stack.setCurrentWidget(self.canvas)
             self.canvas.draw()
             return
 
@@ -256,27 +613,12 @@ class MapWidget(QWidget):
             f"{self.pays_actuel.upper()} ({data.get('continent', '-')})"
         )
 
-        # Drapeau
-        iso_code = self.get_country_code(nom_recherche)
-        if iso_code:
-            url = f"https://flagcdn.com/h80/{iso_code}.png"
-            try:
-                r = requests.get(url, timeout=2)
-                if r.status_code == 200:
-                    pix = QPixmap()
-                    pix.loadFromData(r.content)
-                    pix = pix.scaled(
-                        self.lbl_drapeau.size(),
-                        Qt.KeepAspectRatio,  # type: ignore
-                        Qt.SmoothTransformation,  # type: ignore
-                    )  # type: ignore
-                    self.lbl_drapeau.setPixmap(pix)
-                else:
-                    self.lbl_drapeau.setText("🏳️")
-            except Exception:  # noqa: E722
-                self.lbl_drapeau.setText("🏳️")
+        # Drapeau et historique : préparés au survol si possible
+        entry = self.prefetcher.get(nom_recherche, annee)
+        if entry is not None:
+            self._show_flag(entry.flag)
         else:
-            self.lbl_drapeau.setText("🏳️")
+            self._show_flag(fetch_flag(self.get_country_code(nom_recherche)))
 
         # Score & Rang
         try:
@@ -305,54 +647,78 @@ class MapWidget(QWidget):
         set_val(self.val_freedom, "freedom")
         set_val(self.val_generosity, "generosity")
 
-        self.update_graph(nom_recherche)
+        self.lbl_classements.setText(self._ranks_text(data.name, annee))
+
+        if entry is not None and entry.sparkline is not None:
+            self._show_sparkline_image(entry.sparkline)
+        else:
+            self.update_graph(nom_recherche)
 
+    def _show_flag(self, content: bytes | None):
+        if content is None:
+            self.lbl_drapeau.setText("🏳️")
+            return
+        pix = QPixmap()
+        pix.loadFromData(content)
+        pix = pix.scaled(
+            self.lbl_drapeau.size(),
+            Qt.KeepAspectRatio,  # type: ignore
+            Qt.SmoothTransformation,  # type: ignore
+        )  # type: ignore
+        self.lbl_drapeau.setPixmap(pix)
+
+    def _show_sparkline_image(self, png: bytes):
+        "Courbe déjà rendue par le préchargement : simple échange d'image"
+        pix = QPixmap()
+        pix.loadFromData(png)
+        self.lbl_sparkline.setPixmap(pix)
+        self.graph_stack.setCurrentWidget(self.lbl_sparkline)
+        self.year_marker = None
+
+    def _ranks_text(self, row_label, annee: int) -> str:
+        "Lignes « rang pour PIB/santé/… » lues dans la table précalculée"
+        if self.ranks is None or row_label not in self.ranks.index:
+            return ""
+        row = self.ranks.loc[row_label]
+        lines = [f"<b>Classements {annee}</b>"]
+        for icon, label, col in DASHBOARD_STATS:
+            rank = row.get(rank_column(col))
+            if rank is None or pd.isna(rank):
+                continue
+            pct = row.get(pct_column(col))
+            lines.append(f"{icon} {label} : #{int(rank)} (centile {pct:.0f})")
+        return "<br>".join(lines) if len(lines) > 1 else ""
+
+    @traced("map.sparkline")
     def update_graph(self, nom_pays_csv):
         self.figure.clear()
+        self.year_marker = None
+        self.graph_stack.setCurrentWidget(self.canvas)
 
-        histo = self.data_happiness[
-            self.data_happiness["Country"] == nom_pays_csv
-        ].sort_values("Year")
+        histo = panel_for(self.data_happiness).history(
+            nom_pays_csv, ["happiness_score", "Calculated Rank"]
+        )
         if not histo.empty:
-            ax = self.figure.add_subplot(111)
-            if ax is not None:
-                ax.plot(
-                    histo["Year"],
-                    histo["happiness_score"],
-                    marker="o",
-                    linestyle="-",
-                    color="#2E86C1",
-                    linewidth=2,
-                    markersize=5,
-                )
-
-                for _, row in histo.iterrows():
-                    try:
-                        rank_val = int(row["Calculated Rank"])
-                        ax.annotate(
-                            f"#{rank_val}",
-                            xy=(row["Year"], row["happiness_score"]),
-                            xytext=(0, 8),
-                            textcoords="offset points",
-                            ha="center",
-                            va="bottom",
-                            fontsize=7,
-                            color="#333",
-                            fontweight="bold",
-                        )
-                    except Exception:  # noqa: E722
-                        continue
-
-                ax.set_title("Évolution (2015-2020)", fontsize=6, color="#444")
-                ax.spines["top"].set_visible(False)
-                ax.spines["right"].set_visible(False)
-                ax.tick_params(labelsize=7, colors="#555")
-                ax.set_xticks(histo["Year"].unique())
-                ax.set_facecolor("#FAFAFA")
-                self.figure.tight_layout()
+            year = int(self.combo_annee.currentText())
+            self.year_marker = draw_sparkline(self.figure, histo, year)
 
         self.canvas.draw()
 
+    # PRÉCHARGEMENT
+    def prefetch(self, name: str):
+        "Prépare en arrière-plan le dashboard d'un pays survolé ou sélectionné"
+        if not name or self.data_happiness is None or not self.combo_annee.count():
+            return
+        size = (max(self.canvas.width(), 1), max(self.canvas.height(), 1))
+        self.prefetcher.request(
+            self.data_happiness,
+            GEO_NAME_ALIASES.get(name, name),
+            int(self.combo_annee.currentText()),
+            self.get_country_code,
+            size,
+            self.figure.dpi,
+        )
+
     def get_country_code(self, name):
         corrections = {
             "United States": "US",
@@ -381,48 +747,46 @@ class MapWidget(QWidget):
             pass
         return None
 
+    @traced("map.load_folium")
     def load_folium_map(self):
-        geo_url = "https://raw.githubusercontent.com/python-visualization/folium/main/examples/data/world-countries.json"
-
-        m = folium.Map(
-            location=[20, 0],
-            zoom_start=2,
-            min_zoom=2,
-            max_zoom=6,
-            tiles="CartoDB positron",
-            max_bounds=True,
+        "Page de la carte, relue depuis le cache disque si rien n'a changé"
+        geo_url = local_asset_url(GEOJSON_URL)
+        assets = [
+            local_asset_url(url)
+            for _, url in (*folium.Map.default_js, *folium.Map.default_css)
+        ]
+        key = map_cache_key(
+            folium=folium.__version__,
+            options=MAP_OPTIONS,
+            geometry=geometry_hash(GEOJSON_URL),
+            geo_url=geo_url,
+            assets=assets,
+            scripts=[MAP_HEAD, CLICK_JS, LAYER_JS, FRAME_JS],
         )
+        html = read_cached_html(key)
+        if html is None:
+            html = self.render_folium_html(geo_url)
+            store_cached_html(key, html)
+        self.web_view.setHtml(html, baseUrl=QUrl("qrc:/"))
+
+    @staticmethod
+    def render_folium_html(geo_url: str) -> str:
+        m = folium.Map(**MAP_OPTIONS)
         map_id = m.get_name()
+        m.default_js = [(name, local_asset_url(url)) for name, url in m.default_js]
+        m.default_css = [(name, local_asset_url(url)) for name, url in m.default_css]
 
-        click_js = """
-        function onEachFeature(feature, layer) {
-            layer.on({
-                click: function (e) {
-                    geojsonLayer.resetStyle();
-                    e.target.setStyle({ fillColor: '#2E86C1', color: '#154360', weight: 2, fillOpacity: 0.9 });
-                    document.title = feature.properties.name;
-                }
-            });
-        }
-        """
+        m.get_root().header.add_child(folium.Element(MAP_HEAD))  # type: ignore
 
-        m.get_root().header.add_child(  # type: ignore
+        m.get_root().script.add_child(  # type: ignore
             folium.Element(
-                "<style>.leaflet-interactive:focus { outline: none !important; }</style>"
+                LAYER_JS % {"geo_url": geo_url, "map": map_id}
+                + CLICK_JS
+                + FRAME_JS % {"map": map_id}
             )
         )
 
-        m.get_root().script.add_child(  # type: ignore
-            folium.Element(f"""
-            var geojsonLayer = L.geoJson(null, {{
-                style: function(f) {{ return {{ fillColor: '#D6EAF8', color: '#5DADE2', weight: 0.7, fillOpacity: 0.7 }}; }},
-                onEachFeature: onEachFeature
-            }});
-            fetch("{geo_url}").then(r => r.json()).then(d => {{ geojsonLayer.addData(d); geojsonLayer.addTo({map_id}); }});
-            {click_js}
-        """)
-        )
-
         data = io.BytesIO()
-        m.save(data, close_file=False)
-        self.web_view.setHtml(data.getvalue().decode("utf-8"), baseUrl=QUrl("qrc:/"))
+        with span("map.folium_render"):
+            m.save(data, close_file=False)
+        return data.getvalue().decode("utf-8")
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from hapsight.panel import Panel
+from hapsight.ranking import DEFAULT_METHOD
+from hapsight.tracing import traced
+from hapsight.versioned import cached
+
+# Mesures proposées : libellé -> attribut de YearChange
+METRICS = {
+    "Écart": "delta",
+    "Variation (%)": "pct",
+    "Places gagnées": "rank_shift",
+}
+
+
+def top_k(values: np.ndarray, k: int, largest: bool = True) -> np.ndarray:
+    """Indices des ``k`` plus grandes (ou plus petites) valeurs, triés.
+
+    ``argpartition`` isole les k candidats en O(n) ; seul ce sous-ensemble
+    est ensuite trié. Les NaN sont ignorés.
+    """
+    candidates = np.flatnonzero(~np.isnan(values))
+    if k <= 0 or not len(candidates):
+        return np.array([], dtype=int)
+    keyed = values[candidates] if largest else -values[candidates]
+    if k < len(candidates):
+        part = np.argpartition(-keyed, k - 1)[:k]
+        candidates, keyed = candidates[part], keyed[part]
+    return candidates[np.argsort(-keyed, kind="stable")]
+
+
+def _year_ranks(block: np.ndarray) -> np.ndarray:
+    "Rangs (1 = meilleur) de chaque pays, pour toutes les colonnes à la fois"
+    ranks = pd.DataFrame(block).rank(method=DEFAULT_METHOD, ascending=False)
+    return ranks.to_numpy(dtype=float)
+
+
+@dataclass
+class YearChange:
+    """Évolution de chaque pays entre deux années, pour tous les indicateurs.
+
+    Tableaux (pays × indicateur) calculés en une seule passe vectorisée ;
+    les classements demandés à ``top`` sont mémorisés par indicateur.
+    """
+
+    countries: list[str]
+    indicator_index: dict[str, int]
+    start: int
+    end: int
+    first: np.ndarray
+    last: np.ndarray
+    delta: np.ndarray
+    pct: np.ndarray
+    rank_start: np.ndarray
+    rank_end: np.ndarray
+    rank_shift: np.ndarray
+    _orders: dict = field(default_factory=dict, repr=False)
+
+    @classmethod
+    @traced("movers.compute")
+    def compute(cls, panel: Panel, start: int, end: int) -> YearChange:
+        first = panel.values[:, panel.year_index[start], :]
+        last = panel.values[:, panel.year_index[end], :]
+        delta = last - first
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct = np.where(first != 0, delta / np.abs(first) * 100, np.nan)
+        rank_start = _year_ranks(first)
+        rank_end = _year_ranks(last)
+        return cls(
+            panel.countries,
+            panel.indicator_index,
+            start,
+            end,
+            first,
+            last,
+            delta,
+            pct,
+            rank_start,
+            rank_end,
+            rank_start - rank_end,
+        )
+
+    def top(
+        self, indicator: str, metric: str = "delta", k: int = 10, largest: bool = True
+    ) -> np.ndarray:
+        "Indices des pays aux plus fortes hausses (ou baisses)"
+        key = (indicator, metric, k, largest)
+        order = self._orders.get(key)
+        if order is None:
+            column = getattr(self, metric)[:, self.indicator_index[indicator]]
+            order = top_k(column, k, largest)
+            self._orders[key] = order
+        return order
+
+    def rows(self, indicator: str, order: np.ndarray) -> list[dict]:
+        "Lignes affichables (pays, valeurs et écarts) pour des indices donnés"
+        i = self.indicator_index[indicator]
+        return [
+            {
+                "country": self.countries[c],
+                "first": self.first[c, i],
+                "last": self.last[c, i],
+                "delta": self.delta[c, i],
+                "pct": self.pct[c, i],
+                "rank_start": self.rank_start[c, i],
+                "rank_end": self.rank_end[c, i],
+                "rank_shift": self.rank_shift[c, i],
+            }
+            for c in order
+        ]
+
+
+def year_change(panel: Panel, start: int, end: int) -> YearChange | None:
+    "Évolution entre deux années, calculée une seule fois par version des données"
+    if start not in panel.year_index or end not in panel.year_index:
+        return None
+    return cached(
+        panel,
+        ("year_change", start, end),
+        lambda: YearChange.compute(panel, start, end),
+    )
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from PySide6.QtWidgets import (
+    QComboBox,
+    QGridLayout,
+    QGroupBox,
+    QHeaderView,
+    QLabel,
+    QSpinBox,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from hapsight.movers import METRICS, YearChange, year_change
+from hapsight.panel import panel_for
+
+DEFAULT_TOP = 10
+HEADERS = ["Pays", "Début", "Fin", "Écart", "Variation (%)", "Rang"]
+
+
+def _fmt(value: float, pattern: str = "{:.2f}") -> str:
+    return "-" if np.isnan(value) else pattern.format(value)
+
+
+class MoversPanel(QWidget):
+    "Pays ayant le plus progressé ou reculé entre deux années"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.df: pd.DataFrame | None = None
+        self._dirty = False
+
+        layout = QVBoxLayout(self)
+        controls = QGridLayout()
+        self.combo_start = QComboBox()
+        self.combo_end = QComboBox()
+        self.combo_indicator = QComboBox()
+        self.combo_metric = QComboBox()
+        self.combo_metric.addItems(list(METRICS))
+        self.spin_top = QSpinBox()
+        self.spin_top.setRange(1, 100)
+        self.spin_top.setValue(DEFAULT_TOP)
+
+        controls.addWidget(QLabel("De :"), 0, 0)
+        controls.addWidget(self.combo_start, 0, 1)
+        controls.addWidget(QLabel("À :"), 0, 2)
+        controls.addWidget(self.combo_end, 0, 3)
+        controls.addWidget(QLabel("Indicateur :"), 1, 0)
+        controls.addWidget(self.combo_indicator, 1, 1, 1, 3)
+        controls.addWidget(QLabel("Mesure :"), 2, 0)
+        controls.addWidget(self.combo_metric, 2, 1)
+        controls.addWidget(QLabel("Nombre :"), 2, 2)
+        controls.addWidget(self.spin_top, 2, 3)
+        layout.addLayout(controls)
+
+        self.risers_table = self._make_table()
+        self.fallers_table = self._make_table()
+        for title, table in (
+            ("Plus fortes hausses", self.risers_table),
+            ("Plus fortes baisses", self.fallers_table),
+        ):
+            box = QGroupBox(title)
+            QVBoxLayout(box).addWidget(table)
+            layout.addWidget(box, 1)
+
+        for combo in (
+            self.combo_start,
+            self.combo_end,
+            self.combo_indicator,
+            self.combo_metric,
+        ):
+            combo.currentTextChanged.connect(self.refresh)
+        self.spin_top.valueChanged.connect(self.refresh)
+
+    @staticmethod
+    def _make_table() -> QTableWidget:
+        table = QTableWidget(0, len(HEADERS))
+        table.setHorizontalHeaderLabels(HEADERS)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        return table
+
+    def set_data(self, df: pd.DataFrame):
+        "Nouvelles données ; calcul différé tant que le panneau est caché"
+        self.df = df
+        self._dirty = True
+        if self.isVisible():
+            self._reload_choices()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._dirty:
+            self._reload_choices()
+
+    def _reload_choices(self):
+        self._dirty = False
+        panel = panel_for(self.df)  # type: ignore
+        years = [str(y) for y in panel.years]
+        combos = [
+            (self.combo_start, years, 0),
+            (self.combo_end, years, len(years) - 1),
+            (self.combo_indicator, panel.indicators, 0),
+        ]
+        for combo, items, default in combos:
+            current = combo.currentText()
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItems(items)
+            idx = combo.findText(current)
+            combo.setCurrentIndex(idx if idx >= 0 else max(default, 0))
+            combo.blockSignals(False)
+        self.refresh()
+
+    def current_change(self) -> YearChange | None:
+        if self.df is None or not self.combo_start.currentText():
+            return None
+        return year_change(
+            panel_for(self.df),
+            int(self.combo_start.currentText()),
+            int(self.combo_end.currentText()),
+        )
+
+    def refresh(self, *_):
+        change = self.current_change()
+        indicator = self.combo_indicator.currentText()
+        if change is None or indicator not in change.indicator_index:
+            self.risers_table.setRowCount(0)
+            self.fallers_table.setRowCount(0)
+            return
+        metric = METRICS[self.combo_metric.currentText()]
+        k = self.spin_top.value()
+        for table, largest in ((self.risers_table, True), (self.fallers_table, False)):
+            rows = change.rows(indicator, change.top(indicator, metric, k, largest))
+            table.setRowCount(len(rows))
+            for r, row in enumerate(rows):
+                rank = "-"
+                if not np.isnan(row["rank_start"]) and not np.isnan(row["rank_end"]):
+                    rank = (
+                        f"#{row['rank_start']:.0f} → #{row['rank_end']:.0f}"
+                        f" ({row['rank_shift']:+.0f})"
+                    )
+                cells = [
+                    row["country"],
+                    _fmt(row["first"]),
+                    _fmt(row["last"]),
+                    _fmt(row["delta"], "{:+.2f}"),
+                    _fmt(row["pct"], "{:+.1f}"),
+                    rank,
+                ]
+                for col, text in enumerate(cells):
+                    table.setItem(r, col, QTableWidgetItem(text))
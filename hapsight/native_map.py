@@ -0,0 +1,375 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+from dataclasses import dataclass
+
+import numpy as np
+from PySide6.QtCore import QPointF, Qt, QTimer, Signal
+from PySide6.QtGui import QBrush, QColor, QPainter, QPainterPath, QPen, QPolygonF
+from PySide6.QtWidgets import QGraphicsPathItem, QGraphicsScene, QGraphicsView
+
+from hapsight.animation import PALETTE, YearFrames
+from hapsight.cache import (
+    GEOJSON_URL,
+    asset_path,
+    cache_dir,
+    geometry_hash,
+    store_asset,
+)
+from hapsight.prefetch import HOVER_DELAY_MS
+from hapsight.tracing import span, traced
+from hapsight.workers import run_in_background
+
+logger = logging.getLogger("hapsight.native_map")
+
+MAX_LAT = 85.0
+GRID_COLS, GRID_ROWS = 72, 36
+MAX_LOD = 4
+# Tolérance de simplification au niveau 0 (unités de la scène ~ degrés)
+BASE_TOLERANCE = 0.8
+
+DEFAULT_FILL = QColor("#D6EAF8")
+NO_DATA_FILL = QColor("#EEEEEE")
+SELECTED_FILL = QColor("#2E86C1")
+BORDER = QColor("#5DADE2")
+SELECTED_BORDER = QColor("#154360")
+# Opacité des pays hors de la sélection du nuage de points
+BRUSHED_OUT_ALPHA = 50
+
+
+def project(lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+    "Mercator sphérique, en degrés ; y vers le bas comme dans la scène Qt"
+    lat = np.clip(lat, -MAX_LAT, MAX_LAT)
+    y = np.degrees(np.log(np.tan(np.pi / 4 + np.radians(lat) / 2)))
+    return np.column_stack([lon, -y]).astype(np.float32)
+
+
+@dataclass
+class CountryGeometry:
+    """Contours des pays en tableaux plats.
+
+    ``coords[ring_offsets[i]:ring_offsets[i + 1]]`` est l'anneau ``i``
+    (projeté), qui appartient au pays ``ring_country[i]``.
+    """
+
+    names: list[str]
+    coords: np.ndarray
+    ring_offsets: np.ndarray
+    ring_country: np.ndarray
+
+    @classmethod
+    def from_geojson(cls, data: dict) -> CountryGeometry:
+        names: list[str] = []
+        rings: list[np.ndarray] = []
+        ring_country: list[int] = []
+        for feature in data.get("features", []):
+            geom = feature.get("geometry") or {}
+            if geom.get("type") == "Polygon":
+                polygons = [geom["coordinates"]]
+            elif geom.get("type") == "MultiPolygon":
+                polygons = geom["coordinates"]
+            else:
+                continue
+            country = len(names)
+            names.append(str(feature.get("properties", {}).get("name", "")))
+            for polygon in polygons:
+                for ring in polygon:
+                    xy = np.asarray(ring, dtype=float)
+                    rings.append(project(xy[:, 0], xy[:, 1]))
+                    ring_country.append(country)
+
+        lengths = [len(r) for r in rings]
+        offsets = np.zeros(len(rings) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(lengths)
+        coords = np.concatenate(rings) if rings else np.zeros((0, 2), np.float32)
+        return cls(names, coords, offsets, np.asarray(ring_country, dtype=np.int32))
+
+    def ring(self, i: int) -> np.ndarray:
+        return self.coords[self.ring_offsets[i] : self.ring_offsets[i + 1]]
+
+    def save(self, path: str):
+        np.savez(
+            path,
+            names=np.asarray(self.names, dtype=str),
+            coords=self.coords,
+            ring_offsets=self.ring_offsets,
+            ring_country=self.ring_country,
+        )
+
+    @classmethod
+    def load(cls, path: str) -> CountryGeometry:
+        with np.load(path) as data:
+            return cls(
+                [str(n) for n in data["names"]],
+                data["coords"],
+                data["ring_offsets"],
+                data["ring_country"],
+            )
+
+
+@traced("map.native_geometry")
+def load_geometry(url: str = GEOJSON_URL) -> CountryGeometry:
+    "GeoJSON prétraité (.npz en cache), téléchargé une fois si nécessaire"
+    if not os.path.exists(asset_path(url)):
+        import requests
+
+        r = requests.get(url, timeout=30)
+        r.raise_for_status()
+        store_asset(url, r.content)
+
+    npz = os.path.join(cache_dir(), f"geometry-{geometry_hash(url)[:16]}.npz")
+    if os.path.exists(npz):
+        return CountryGeometry.load(npz)
+    with open(asset_path(url), encoding="utf-8") as f:
+        geometry = CountryGeometry.from_geojson(json.load(f))
+    geometry.save(npz)
+    return geometry
+
+
+class GridIndex:
+    "Index spatial en grille régulière : cellule -> anneaux qui la recouvrent"
+
+    def __init__(self, geometry: CountryGeometry):
+        self.geometry = geometry
+        n = len(geometry.ring_country)
+        mins = np.zeros((n, 2), np.float32)
+        maxs = np.zeros((n, 2), np.float32)
+        for i in range(n):
+            ring = geometry.ring(i)
+            mins[i], maxs[i] = ring.min(axis=0), ring.max(axis=0)
+        self.origin = geometry.coords.min(axis=0) if n else np.zeros(2)
+        extent = (geometry.coords.max(axis=0) - self.origin) if n else np.ones(2)
+        self.cell = np.maximum(extent / (GRID_COLS, GRID_ROWS), 1e-6)
+
+        lo = self._cell_of(mins)
+        hi = self._cell_of(maxs)
+        self.cells: dict[tuple[int, int], list[int]] = {}
+        for i in range(n):
+            for cx in range(lo[i, 0], hi[i, 0] + 1):
+                for cy in range(lo[i, 1], hi[i, 1] + 1):
+                    self.cells.setdefault((cx, cy), []).append(i)
+
+    def _cell_of(self, xy: np.ndarray) -> np.ndarray:
+        cells = np.floor((xy - self.origin) / self.cell).astype(int)
+        return np.clip(cells, 0, (GRID_COLS - 1, GRID_ROWS - 1))
+
+    def country_at(self, x: float, y: float) -> int | None:
+        "Pays sous le point (règle pair-impair sur ses anneaux)"
+        cx, cy = self._cell_of(np.array([[x, y]]))[0]
+        crossings: dict[int, int] = {}
+        for i in self.cells.get((int(cx), int(cy)), ()):
+            ring = self.geometry.ring(i)
+            x1, y1 = ring[:-1, 0], ring[:-1, 1]
+            x2, y2 = ring[1:, 0], ring[1:, 1]
+            straddle = (y1 > y) != (y2 > y)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                x_cross = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+            n = int(np.count_nonzero(straddle & (x < x_cross)))
+            country = int(self.geometry.ring_country[i])
+            crossings[country] = crossings.get(country, 0) + n
+        for country, n in crossings.items():
+            if n % 2 == 1:
+                return country
+        return None
+
+
+class PathCache:
+    "QPainterPath par pays et par niveau de détail, construits à la demande"
+
+    def __init__(self, geometry: CountryGeometry):
+        self.geometry = geometry
+        self._rings_of: dict[int, list[int]] = {}
+        for i, country in enumerate(geometry.ring_country):
+            self._rings_of.setdefault(int(country), []).append(i)
+        self._paths: dict[tuple[int, int], QPainterPath] = {}
+
+    def path(self, country: int, lod: int) -> QPainterPath:
+        key = (country, lod)
+        cached = self._paths.get(key)
+        if cached is not None:
+            return cached
+        tolerance = BASE_TOLERANCE / (2**lod)
+        path = QPainterPath()
+        path.setFillRule(Qt.FillRule.OddEvenFill)
+        for i in self._rings_of.get(country, ()):
+            ring = simplify(self.geometry.ring(i), tolerance)
+            if len(ring) < 3:
+                continue
+            path.addPolygon(QPolygonF([QPointF(x, y) for x, y in ring.tolist()]))
+            path.closeSubpath()
+        self._paths[key] = path
+        return path
+
+
+def simplify(ring: np.ndarray, tolerance: float) -> np.ndarray:
+    "Supprime les points consécutifs tombant dans la même cellule de tolérance"
+    if len(ring) <= 4 or tolerance <= 0:
+        return ring
+    snapped = np.floor(ring / tolerance)
+    keep = np.ones(len(ring), dtype=bool)
+    keep[1:] = np.any(snapped[1:] != snapped[:-1], axis=1)
+    keep[-1] = True
+    return ring[keep]
+
+
+class NativeMapView(QGraphicsView):
+    """Carte dessinée par Qt (sans QtWebEngine).
+
+    Émet ``countryClicked`` avec le nom du GeoJSON, comme la page web, et
+    ``countryHovered`` quand la souris s'arrête sur un pays.
+    """
+
+    countryClicked = Signal(str)
+    countryHovered = Signal(str)
+    geometryLoaded = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setScene(QGraphicsScene(self))
+        self.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self.setDragMode(QGraphicsView.DragMode.ScrollHandDrag)
+        self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+        self.setBackgroundBrush(QBrush(QColor("#F4F6F6")))
+
+        self.geometry: CountryGeometry | None = None
+        self.index: GridIndex | None = None
+        self.paths: PathCache | None = None
+        self.items: list[QGraphicsPathItem] = []
+        self.lod = 0
+        self.selected: int | None = None
+        self.brushed: set[str] | None = None
+        self._fills: dict[str, QColor] = {}
+        self._press_pos = None
+        self._loader = None
+
+        # Survol temporisé (préchargement du dashboard)
+        self.setMouseTracking(True)
+        self._hovered: int | None = None
+        self._hover_timer = QTimer(self)
+        self._hover_timer.setSingleShot(True)
+        self._hover_timer.setInterval(HOVER_DELAY_MS)
+        self._hover_timer.timeout.connect(self._emit_hover)
+
+    def load_async(self, url: str = GEOJSON_URL):
+        self._loader = run_in_background(
+            load_geometry, url, on_done=self.set_geometry, on_error=self._on_error
+        )
+
+    def _on_error(self, message: str):
+        logger.warning("Contours des pays indisponibles : %s", message)
+
+    def set_geometry(self, geometry: CountryGeometry):
+        self.geometry = geometry
+        with span("map.native_scene"):
+            self.index = GridIndex(geometry)
+            self.paths = PathCache(geometry)
+            self.scene().clear()
+            self.items = []
+            pen = QPen(BORDER, 0.7)
+            pen.setCosmetic(True)
+            for country, name in enumerate(geometry.names):
+                item = self.scene().addPath(self.paths.path(country, self.lod), pen)
+                item.setToolTip(name)
+                self.items.append(item)
+            self._apply_fills()
+        self.fitInView(self.scene().sceneRect(), Qt.AspectRatioMode.KeepAspectRatio)
+        self.geometryLoaded.emit()
+
+    # Couleurs
+    def show_frame(self, frames: YearFrames, year: int):
+        "Coloration choroplèthe à partir des codes précalculés de l'année"
+        codes = frames.codes.get(year)
+        if codes is None:
+            return
+        palette = [QColor(c) for c in PALETTE]
+        self._fills = {
+            name: palette[int(code)] if code.isdigit() else NO_DATA_FILL
+            for name, code in zip(frames.names, codes)
+        }
+        self._apply_fills()
+
+    def _apply_fills(self):
+        if self.geometry is None:
+            return
+        default = NO_DATA_FILL if self._fills else DEFAULT_FILL
+        for country, item in enumerate(self.items):
+            if country == self.selected:
+                item.setBrush(QBrush(SELECTED_FILL))
+                pen = QPen(SELECTED_BORDER, 2)
+            else:
+                name = self.geometry.names[country]
+                fill = QColor(self._fills.get(name, default))
+                if self.brushed is not None and name not in self.brushed:
+                    fill.setAlpha(BRUSHED_OUT_ALPHA)
+                item.setBrush(QBrush(fill))
+                pen = QPen(BORDER, 0.7)
+            pen.setCosmetic(True)
+            item.setPen(pen)
+
+    def set_brushed(self, names: set[str] | None):
+        "Estompe les pays hors de la sélection du nuage de points"
+        self.brushed = names
+        self._apply_fills()
+
+    # Zoom et niveau de détail
+    def wheelEvent(self, event):
+        factor = 1.25 if event.angleDelta().y() > 0 else 0.8
+        self.scale(factor, factor)
+        self._update_lod()
+
+    def _update_lod(self):
+        if self.paths is None or not self.items:
+            return
+        base = self.viewport().width() / max(self.scene().sceneRect().width(), 1)
+        zoom = self.transform().m11() / max(base, 1e-9)
+        lod = min(max(int(math.log2(max(zoom, 1.0))), 0), MAX_LOD)
+        if lod == self.lod:
+            return
+        self.lod = lod
+        for country, item in enumerate(self.items):
+            item.setPath(self.paths.path(country, lod))
+
+    # Sélection
+    def mousePressEvent(self, event):
+        self._press_pos = event.position()
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        super().mouseMoveEvent(event)
+        if self.index is None or event.buttons():
+            return
+        pos = self.mapToScene(event.position().toPoint())
+        country = self.index.country_at(pos.x(), pos.y())
+        if country != self._hovered:
+            self._hovered = country
+            self._hover_timer.start()
+
+    def _emit_hover(self):
+        if self._hovered is not None and self.geometry is not None:
+            self.countryHovered.emit(self.geometry.names[self._hovered])
+
+    def mouseReleaseEvent(self, event):
+        super().mouseReleaseEvent(event)
+        if self._press_pos is None or self.index is None:
+            return
+        moved = (event.position() - self._press_pos).manhattanLength()
+        self._press_pos = None
+        if moved > 4:
+            return  # déplacement de la carte, pas un clic
+        pos = self.mapToScene(event.position().toPoint())
+        self.select_at(pos.x(), pos.y())
+
+    def select_at(self, x: float, y: float) -> str | None:
+        if self.index is None or self.geometry is None:
+            return None
+        country = self.index.country_at(x, y)
+        if country is None:
+            return None
+        self.selected = country
+        self._apply_fills()
+        name = self.geometry.names[country]
+        self.countryClicked.emit(name)
+        return name
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import logging
+import mimetypes
+
+from PySide6.QtCore import QBuffer, QByteArray, QCoreApplication, QIODevice, QUrl
+from PySide6.QtWebEngineCore import (
+    QWebEngineUrlRequestInterceptor,
+    QWebEngineUrlRequestJob,
+    QWebEngineUrlScheme,
+    QWebEngineUrlSchemeHandler,
+)
+
+from hapsight.cache import ASSET_SCHEME, TileStore, parse_tile_url, read_asset
+
+logger = logging.getLogger("hapsight.offline")
+
+_SCHEME = ASSET_SCHEME.encode()
+
+
+def register_scheme():
+    "Déclare le schéma local ; doit précéder la création de la QApplication"
+    if QWebEngineUrlScheme.schemeByName(QByteArray(_SCHEME)).name():
+        return
+    if QCoreApplication.instance() is not None:
+        logger.warning("Schéma %s déclaré trop tard, ignoré", ASSET_SCHEME)
+        return
+    scheme = QWebEngineUrlScheme(QByteArray(_SCHEME))
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    scheme.setFlags(
+        QWebEngineUrlScheme.Flag.SecureScheme
+        | QWebEngineUrlScheme.Flag.LocalAccessAllowed
+        | QWebEngineUrlScheme.Flag.CorsEnabled
+    )
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+
+class AssetSchemeHandler(QWebEngineUrlSchemeHandler):
+    "Sert hapsight://assets/<fichier> et hapsight://tiles/<z>/<x>/<y>.png"
+
+    def __init__(self, tiles: TileStore, parent=None):
+        super().__init__(parent)
+        self.tiles = tiles
+
+    def requestStarted(self, job: QWebEngineUrlRequestJob):
+        url = job.requestUrl()
+        name = url.path().lstrip("/")
+        data, mime = None, "application/octet-stream"
+        if url.host() == "assets":
+            data = read_asset(name)
+            mime = mimetypes.guess_type(name)[0] or mime
+            if name.endswith(".json"):
+                mime = "application/json"
+        elif url.host() == "tiles":
+            try:
+                z, x, y = (int(p) for p in name.removesuffix(".png").split("/"))
+                data = self.tiles.get(z, x, y)
+            except ValueError:
+                data = None
+            mime = "image/png"
+
+        if data is None:
+            job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+        if hasattr(job, "setAdditionalResponseHeaders"):
+            # fetch() du GeoJSON depuis une page qrc:/
+            job.setAdditionalResponseHeaders(
+                {QByteArray(b"Access-Control-Allow-Origin"): QByteArray(b"*")}
+            )
+        buffer = QBuffer(job)
+        buffer.setData(QByteArray(data))
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        job.reply(QByteArray(mime.encode()), buffer)
+
+
+class TileInterceptor(QWebEngineUrlRequestInterceptor):
+    """Redirige les tuiles présentes dans le cache vers le schéma local.
+
+    Appelé sur le thread IO de Chromium : la recherche se fait dans
+    l'ensemble des clés en mémoire de ``TileStore``.
+    """
+
+    def __init__(self, tiles: TileStore, parent=None):
+        super().__init__(parent)
+        self.tiles = tiles
+
+    def interceptRequest(self, info):
+        key = parse_tile_url(info.requestUrl().toString())
+        if key is not None and self.tiles.has(*key):
+            z, x, y = key
+            info.redirect(QUrl(f"{ASSET_SCHEME}://tiles/{z}/{x}/{y}.png"))
+
+
+def install_offline_assets(profile):
+    "Installe gestionnaire et intercepteur sur le profil (une seule fois)"
+    if profile.property("hapsightOffline"):
+        return
+    tiles = TileStore()
+    handler = AssetSchemeHandler(tiles, profile)
+    interceptor = TileInterceptor(tiles, profile)
+    profile.installUrlSchemeHandler(QByteArray(_SCHEME), handler)
+    profile.setUrlRequestInterceptor(interceptor)
+    profile.setProperty("hapsightOffline", True)
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from hapsight.tracing import traced
+from hapsight.versioned import cached
+
+COUNTRY_COL = "Country"
+YEAR_COL = "Year"
+CONTINENT_COL = "continent"
+
+
+def panel_indicators(df: pd.DataFrame) -> list[str]:
+    return [
+        col
+        for col in df.columns
+        if col != YEAR_COL and pd.api.types.is_numeric_dtype(df[col])
+    ]
+
+
+@dataclass
+class Panel:
+    """Données pivotées une fois en un tableau [pays, année, indicateur].
+
+    ``values`` est contigu (NaN pour une cellule absente, cf. ``mask``) ;
+    séries temporelles, valeurs d'une année et écarts entre années sont de
+    simples tranches ou opérations vectorisées.
+    """
+
+    countries: list[str]
+    years: np.ndarray
+    indicators: list[str]
+    values: np.ndarray
+    continents: list[str]
+    mask: np.ndarray = field(init=False)
+    country_index: dict[str, int] = field(init=False)
+    year_index: dict[int, int] = field(init=False)
+    indicator_index: dict[str, int] = field(init=False)
+
+    def __post_init__(self):
+        self.mask = np.isnan(self.values)
+        self.country_index = {c: i for i, c in enumerate(self.countries)}
+        self.year_index = {int(y): i for i, y in enumerate(self.years)}
+        self.indicator_index = {c: i for i, c in enumerate(self.indicators)}
+
+    @classmethod
+    @traced("panel.build")
+    def from_frame(cls, df: pd.DataFrame, indicators: list[str] | None = None) -> Panel:
+        cols = indicators if indicators is not None else panel_indicators(df)
+        if COUNTRY_COL not in df.columns or YEAR_COL not in df.columns:
+            return cls(
+                [], np.array([], dtype=int), cols, np.empty((0, 0, len(cols))), []
+            )
+
+        country_codes, countries = pd.factorize(df[COUNTRY_COL], sort=True)
+        year_codes, years = pd.factorize(df[YEAR_COL], sort=True)
+        valid = (country_codes >= 0) & (year_codes >= 0)
+
+        values = np.full((len(countries), len(years), len(cols)), np.nan)
+        if cols:
+            flat = df[cols].to_numpy(dtype=float, na_value=np.nan)
+            values[country_codes[valid], year_codes[valid]] = flat[valid]
+
+        continents = [""] * len(countries)
+        if CONTINENT_COL in df.columns:
+            known = country_codes >= 0
+            owner = pd.Series(
+                df[CONTINENT_COL].to_numpy()[known], index=country_codes[known]
+            )
+            owner = owner[~owner.index.duplicated()].dropna()
+            for code, continent in owner.items():
+                continents[int(code)] = str(continent)  # type: ignore
+
+        return cls(
+            [str(c) for c in countries],
+            np.asarray(years, dtype=int),
+            list(cols),
+            values,
+            continents,
+        )
+
+    def matrix(self, indicator: str) -> np.ndarray:
+        "Tableau (pays × année) d'un indicateur"
+        return self.values[:, :, self.indicator_index[indicator]]
+
+    def series(self, country: str, indicator: str) -> np.ndarray | None:
+        "Valeurs d'un pays pour chaque année de ``years`` (NaN si absente)"
+        c = self.country_index.get(country)
+        i = self.indicator_index.get(indicator)
+        if c is None or i is None:
+            return None
+        return self.values[c, :, i]
+
+    def year_values(self, year: int, indicator: str) -> np.ndarray | None:
+        "Valeurs de tous les pays pour une année"
+        y = self.year_index.get(int(year))
+        if y is None or indicator not in self.indicator_index:
+            return None
+        return self.values[:, y, self.indicator_index[indicator]]
+
+    def deltas(self, indicator: str) -> np.ndarray:
+        "Écarts d'une année à la suivante (pays × années - 1)"
+        return np.diff(self.matrix(indicator), axis=1)
+
+    def change(self, indicator: str, start: int, end: int) -> np.ndarray | None:
+        "Évolution de chaque pays entre deux années"
+        first = self.year_values(start, indicator)
+        last = self.year_values(end, indicator)
+        if first is None or last is None:
+            return None
+        return last - first
+
+    def history(self, country: str, indicators: list[str]) -> pd.DataFrame:
+        "Petit DataFrame (Year + indicateurs) des années renseignées d'un pays"
+        c = self.country_index.get(country)
+        cols = [col for col in indicators if col in self.indicator_index]
+        if c is None or not cols:
+            return pd.DataFrame(columns=[YEAR_COL, *indicators])
+        idx = [self.indicator_index[col] for col in cols]
+        block = self.values[c][:, idx]
+        present = ~self.mask[c][:, idx].all(axis=1)
+        frame = pd.DataFrame(block[present], columns=cols)
+        frame.insert(0, YEAR_COL, self.years[present])
+        return frame
+
+
+def panel_for(df: pd.DataFrame) -> Panel:
+    "Panel construit une seule fois par version des données"
+    return cached(df, "panel", lambda: Panel.from_frame(df))
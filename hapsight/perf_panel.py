@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import time
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import (
+    QCheckBox,
+    QFileDialog,
+    QGroupBox,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QMessageBox,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from hapsight.tracing import HIST_EDGES_MS, TRACER
+
+BARS = " ▁▂▃▄▅▆▇█"
+RECENT_LIMIT = 200
+
+
+def sparkline(counts: list[int]) -> str:
+    "Histogramme compact en caractères unicode"
+    top = max(counts) if counts else 0
+    if top == 0:
+        return ""
+    return "".join(BARS[round(c / top * (len(BARS) - 1))] for c in counts)
+
+
+class PerformancePanel(QWidget):
+    "Panneau (caché par défaut) listant les spans récents et les histogrammes"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        self.chk_enabled = QCheckBox("Traçage actif")
+        self.chk_enabled.setChecked(TRACER.enabled)
+        self.chk_enabled.toggled.connect(TRACER.enable)
+        self.btn_clear = QPushButton("Vider")
+        self.btn_clear.clicked.connect(self.clear)
+        self.btn_export = QPushButton("Exporter (Chrome trace)…")
+        self.btn_export.clicked.connect(self.export_trace)
+        controls.addWidget(self.chk_enabled)
+        controls.addStretch()
+        controls.addWidget(self.btn_clear)
+        controls.addWidget(self.btn_export)
+        layout.addLayout(controls)
+
+        # Histogrammes par handler
+        hist_box = QGroupBox("Handlers")
+        hist_layout = QVBoxLayout(hist_box)
+        edges = " | ".join(f"{e:g}" for e in HIST_EDGES_MS)
+        hist_layout.addWidget(QLabel(f"Classes (ms) : {edges} | +"))
+        self.handlers_table = QTableWidget(0, 5)
+        self.handlers_table.setHorizontalHeaderLabels(
+            ["Handler", "Appels", "Moyenne (ms)", "Max (ms)", "Histogramme"]
+        )
+        self.handlers_table.horizontalHeader().setSectionResizeMode(
+            0, QHeaderView.ResizeMode.Stretch
+        )
+        self.handlers_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        hist_layout.addWidget(self.handlers_table)
+        layout.addWidget(hist_box, 1)
+
+        # Spans récents
+        recent_box = QGroupBox("Spans récents")
+        recent_layout = QVBoxLayout(recent_box)
+        self.recent_table = QTableWidget(0, 4)
+        self.recent_table.setHorizontalHeaderLabels(
+            ["Span", "Durée (ms)", "Début (s)", "Thread"]
+        )
+        self.recent_table.horizontalHeader().setSectionResizeMode(
+            0, QHeaderView.ResizeMode.Stretch
+        )
+        self.recent_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        recent_layout.addWidget(self.recent_table)
+        layout.addWidget(recent_box, 1)
+
+        # Blocages de la boucle d'événements (si le watchdog est actif)
+        self.watchdog = None
+        self.stalls_box = QGroupBox("Blocages de la boucle Qt")
+        stalls_layout = QVBoxLayout(self.stalls_box)
+        self.stalls_label = QLabel("")
+        stalls_layout.addWidget(self.stalls_label)
+        self.stalls_table = QTableWidget(0, 4)
+        self.stalls_table.setHorizontalHeaderLabels(
+            ["Coupable", "Blocages", "Total (ms)", "Max (ms)"]
+        )
+        self.stalls_table.horizontalHeader().setSectionResizeMode(
+            0, QHeaderView.ResizeMode.Stretch
+        )
+        self.stalls_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        stalls_layout.addWidget(self.stalls_table)
+        layout.addWidget(self.stalls_box, 1)
+        self.stalls_box.hide()
+
+        # Rafraîchi uniquement quand le panneau est visible
+        self._timer = QTimer(self)
+        self._timer.setInterval(500)
+        self._timer.timeout.connect(self.refresh)
+
+    def set_watchdog(self, watchdog):
+        self.watchdog = watchdog
+        self.stalls_box.setVisible(watchdog is not None)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.chk_enabled.setChecked(TRACER.enabled)
+        self.refresh()
+        self._timer.start()
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        stats = sorted(
+            TRACER.stats().items(), key=lambda kv: kv[1]["total_ms"], reverse=True
+        )
+        self.handlers_table.setRowCount(len(stats))
+        for row, (name, s) in enumerate(stats):
+            cells = [
+                name,
+                str(s["count"]),
+                f"{s['mean_ms']:.2f}",
+                f"{s['max_ms']:.2f}",
+                sparkline(s["histogram"]),
+            ]
+            for col, text in enumerate(cells):
+                self.handlers_table.setItem(row, col, QTableWidgetItem(text))
+
+        recent = TRACER.recent(RECENT_LIMIT)[::-1]
+        self.recent_table.setRowCount(len(recent))
+        for row, span in enumerate(recent):
+            cells = [
+                span.name,
+                f"{span.duration_ms:.2f}",
+                f"{(span.start_ns - TRACER.epoch_ns) / 1e9:.3f}",
+                str(span.thread_id),
+            ]
+            for col, text in enumerate(cells):
+                self.recent_table.setItem(row, col, QTableWidgetItem(text))
+
+        if self.watchdog is not None:
+            self._refresh_stalls()
+
+    def _refresh_stalls(self):
+        wd = self.watchdog
+        self.stalls_label.setText(
+            f"{wd.stall_count} blocage(s) > {wd.threshold * 1000:.0f} ms"
+        )
+        offenders = wd.top_offenders()
+        self.stalls_table.setRowCount(len(offenders))
+        for row, o in enumerate(offenders):
+            cells = [o.key, str(o.count), f"{o.total_ms:.0f}", f"{o.max_ms:.0f}"]
+            for col, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                item.setToolTip("".join(o.stack))
+                self.stalls_table.setItem(row, col, item)
+
+    def clear(self):
+        TRACER.clear()
+        self.refresh()
+
+    def export_trace(self):
+        default = time.strftime("hapsight-trace-%Y%m%d-%H%M%S.json")
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Exporter la trace", default, "Chrome trace (*.json)"
+        )
+        if not path:
+            return
+        try:
+            TRACER.export_chrome_trace(path)
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Impossible d'exporter.\n\n{e}")
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import io
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import pandas as pd
+import requests
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PySide6.QtCore import QObject, QThreadPool, Signal
+
+from hapsight.tracing import span
+from hapsight.workers import Worker, run_in_background
+
+PREFETCH_CAPACITY = 16
+# Pool dédié : les requêtes spéculatives (réseau lent, hors ligne) ne bloquent
+# pas le pool global (filtres, chargements)
+PREFETCH_THREADS = 1
+# Délai de survol avant préchargement (évite les requêtes en balayant la carte)
+HOVER_DELAY_MS = 120
+FLAG_URL = "https://flagcdn.com/h80/{iso}.png"
+
+
+def fetch_flag(iso_code: str | None) -> bytes | None:
+    "Image du drapeau (PNG) ou None si indisponible"
+    if not iso_code:
+        return None
+    try:
+        with span("map.flag_fetch"):
+            r = requests.get(FLAG_URL.format(iso=iso_code), timeout=2)
+    except Exception:
+        return None
+    return r.content if r.status_code == 200 else None
+
+
+def draw_sparkline(figure: Figure, histo: pd.DataFrame, year: int | None):
+    "Courbe du score par année avec les rangs ; renvoie le marqueur d'année"
+    ax = figure.add_subplot(111)
+    ax.plot(
+        histo["Year"],
+        histo["happiness_score"],
+        marker="o",
+        linestyle="-",
+        color="#2E86C1",
+        linewidth=2,
+        markersize=5,
+    )
+
+    for _, row in histo.iterrows():
+        try:
+            rank_val = int(row["Calculated Rank"])
+            ax.annotate(
+                f"#{rank_val}",
+                xy=(row["Year"], row["happiness_score"]),
+                xytext=(0, 8),
+                textcoords="offset points",
+                ha="center",
+                va="bottom",
+                fontsize=7,
+                color="#333",
+                fontweight="bold",
+            )
+        except Exception:  # noqa: E722
+            continue
+
+    # Année affichée (suit l'animation sans redessiner la courbe)
+    marker = None
+    if year is not None:
+        marker = ax.axvline(year, color="#E67E22", linewidth=1, linestyle="--")
+
+    ax.set_title("Évolution (2015-2020)", fontsize=6, color="#444")
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    ax.tick_params(labelsize=7, colors="#555")
+    ax.set_xticks(histo["Year"].unique())
+    ax.set_facecolor("#FAFAFA")
+    figure.tight_layout()
+    return marker
+
+
+def render_sparkline_png(
+    histo: pd.DataFrame, year: int, size: tuple[int, int], dpi: float
+) -> bytes:
+    "Même graphique que le dashboard, rendu hors écran (Agg, sans pyplot)"
+    width, height = size
+    figure = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+    figure.patch.set_alpha(0)
+    FigureCanvasAgg(figure)
+    draw_sparkline(figure, histo, year)
+    buf = io.BytesIO()
+    figure.savefig(buf, format="png", dpi=dpi, transparent=True)
+    return buf.getvalue()
+
+
+@dataclass
+class DashboardEntry:
+    country: str
+    year: int
+    record: pd.Series | None
+    history: pd.DataFrame
+    flag: bytes | None
+    sparkline: bytes | None
+
+
+def build_entry(
+    data: pd.DataFrame,
+    country: str,
+    year: int,
+    iso_lookup: Callable[[str], str | None],
+    size: tuple[int, int],
+    dpi: float,
+) -> DashboardEntry:
+    "Tout ce qu'affiche le dashboard pour un pays (exécuté sur un worker)"
+    with span("prefetch.build"):
+        history = data[data["Country"] == country].sort_values("Year")
+        rows = history[history["Year"] == year]
+        record = rows.iloc[0] if not rows.empty else None
+        flag = fetch_flag(iso_lookup(country))
+        sparkline = (
+            render_sparkline_png(history, year, size, dpi)
+            if not history.empty
+            else None
+        )
+    return DashboardEntry(country, year, record, history, flag, sparkline)
+
+
+class DashboardPrefetcher(QObject):
+    """Prépare en arrière-plan les données du dashboard (LRU).
+
+    Appelé au survol d'un pays ou au déplacement de la sélection ; le clic
+    n'a plus qu'à afficher l'entrée prête. Les entrées sont liées à une
+    version des données (``invalidate`` à chaque changement). Seule la
+    dernière demande reste en file : les précédentes non démarrées sont
+    abandonnées.
+    """
+
+    ready = Signal(str)
+
+    def __init__(self, capacity: int = PREFETCH_CAPACITY, parent=None):
+        super().__init__(parent)
+        self.capacity = capacity
+        self._entries: OrderedDict[tuple[str, int], DashboardEntry] = OrderedDict()
+        self._pending: dict[tuple[str, int], Worker] = {}
+        self._version = 0
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(PREFETCH_THREADS)
+
+    def invalidate(self):
+        self._entries.clear()
+        self._drop_queued()
+        self._pending.clear()
+        self._version += 1
+
+    def _drop_queued(self):
+        "Retire de la file les demandes pas encore démarrées"
+        for key, worker in list(self._pending.items()):
+            if self.pool.tryTake(worker):
+                del self._pending[key]
+
+    def get(self, country: str, year: int) -> DashboardEntry | None:
+        entry = self._entries.get((country, year))
+        if entry is not None:
+            self._entries.move_to_end((country, year))
+        return entry
+
+    def request(
+        self,
+        data: pd.DataFrame,
+        country: str,
+        year: int,
+        iso_lookup: Callable[[str], str | None],
+        size: tuple[int, int],
+        dpi: float,
+    ):
+        key = (country, year)
+        if key in self._entries or key in self._pending:
+            return
+        self._drop_queued()
+        version = self._version
+        self._pending[key] = run_in_background(
+            build_entry,
+            data,
+            country,
+            year,
+            iso_lookup,
+            size,
+            dpi,
+            on_done=lambda entry: self._store(key, version, entry),
+            on_error=lambda _: self._pending.pop(key, None),
+            pool=self.pool,
+        )
+
+    def _store(self, key, version: int, entry: DashboardEntry):
+        if version != self._version:
+            return  # données remplacées entre-temps
+        self._pending.pop(key, None)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+        self.ready.emit(entry.country)
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+from PySide6.QtCore import QPointF, QRectF, QSize, Qt, Signal
+from PySide6.QtGui import QBrush, QColor, QPainter, QPen
+from PySide6.QtWidgets import QHBoxLayout, QLabel, QVBoxLayout, QWidget
+
+HIST_BINS = 24
+HANDLE_RADIUS = 6
+IN_RANGE = QColor("#5DADE2")
+OUT_OF_RANGE = QColor("#D5D8DC")
+HANDLE = QColor("#154360")
+
+
+@dataclass
+class ColumnDistribution:
+    """Valeurs triées et histogramme d'une colonne (une fois par données).
+
+    ``count_between`` compte les valeurs d'un intervalle par deux
+    ``searchsorted`` : O(log n), assez rapide pour suivre la souris.
+    """
+
+    sorted_values: np.ndarray
+    edges: np.ndarray
+    counts: np.ndarray
+
+    @classmethod
+    def from_values(cls, values) -> ColumnDistribution:
+        data = np.asarray(values, dtype=float)
+        data = np.sort(data[~np.isnan(data)])
+        if not len(data):
+            return cls(data, np.array([0.0, 1.0]), np.zeros(1, dtype=int))
+        low, high = data[0], data[-1]
+        if low == high:
+            high = low + 1.0
+        counts, edges = np.histogram(data, bins=HIST_BINS, range=(low, high))
+        return cls(data, edges, counts)
+
+    @property
+    def low(self) -> float:
+        return float(self.edges[0])
+
+    @property
+    def high(self) -> float:
+        return float(self.edges[-1])
+
+    def count_between(self, vmin: float | None, vmax: float | None) -> int:
+        "Nombre de valeurs (non manquantes) dans [vmin, vmax]"
+        start = 0 if vmin is None else np.searchsorted(self.sorted_values, vmin, "left")
+        stop = (
+            len(self.sorted_values)
+            if vmax is None
+            else np.searchsorted(self.sorted_values, vmax, "right")
+        )
+        return int(max(stop - start, 0))
+
+
+class RangeSlider(QWidget):
+    """Curseur à deux poignées dessiné sur l'histogramme de la colonne.
+
+    Une poignée en butée signifie « pas de borne » (None). ``rangeChanged``
+    suit le glissement ; ``rangeCommitted`` n'est émis qu'au relâchement.
+    """
+
+    rangeChanged = Signal(object, object)
+    rangeCommitted = Signal(object, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.distribution = ColumnDistribution.from_values([])
+        self._low: float | None = None
+        self._high: float | None = None
+        self._dragging: str | None = None
+        self.setMinimumHeight(36)
+        self.setMouseTracking(False)
+
+    def sizeHint(self) -> QSize:
+        return QSize(160, 40)
+
+    def set_distribution(self, distribution: ColumnDistribution):
+        "Nouvelles données : on garde les bornes encore dans l'étendue"
+        self.distribution = distribution
+        self._low = self._clamp(self._low)
+        self._high = self._clamp(self._high)
+        self.update()
+
+    def _clamp(self, value: float | None) -> float | None:
+        d = self.distribution
+        if value is None or value <= d.low or value >= d.high:
+            return None
+        return value
+
+    def range(self) -> tuple[float | None, float | None]:
+        return self._low, self._high
+
+    def set_range(self, vmin: float | None, vmax: float | None):
+        self._low, self._high = self._clamp(vmin), self._clamp(vmax)
+        if self._low is not None and self._high is not None and self._low > self._high:
+            self._low, self._high = self._high, self._low
+        self.update()
+        self.rangeChanged.emit(self._low, self._high)
+
+    def reset(self):
+        "Retour à l'étendue complète, sans signal"
+        self._low = self._high = None
+        self.update()
+
+    # Géométrie
+    def _to_x(self, value: float) -> float:
+        d = self.distribution
+        span = self.width() - 2 * HANDLE_RADIUS
+        return HANDLE_RADIUS + (value - d.low) / (d.high - d.low) * span
+
+    def _to_value(self, x: float) -> float:
+        d = self.distribution
+        span = max(self.width() - 2 * HANDLE_RADIUS, 1)
+        ratio = min(max((x - HANDLE_RADIUS) / span, 0.0), 1.0)
+        return d.low + ratio * (d.high - d.low)
+
+    def _handle_values(self) -> tuple[float, float]:
+        d = self.distribution
+        low = d.low if self._low is None else self._low
+        high = d.high if self._high is None else self._high
+        return low, high
+
+    # Dessin
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        d = self.distribution
+        low, high = self._handle_values()
+        track_y = self.height() - HANDLE_RADIUS - 1
+        top = max(int(d.counts.max()), 1)
+        bar_height = track_y - HANDLE_RADIUS - 2
+
+        painter.setPen(Qt.PenStyle.NoPen)
+        for count, left, right in zip(d.counts, d.edges[:-1], d.edges[1:]):
+            h = bar_height * count / top
+            inside = right > low and left < high
+            painter.setBrush(QBrush(IN_RANGE if inside else OUT_OF_RANGE))
+            x0, x1 = self._to_x(left), self._to_x(right)
+            painter.drawRect(QRectF(x0, track_y - h, max(x1 - x0 - 1, 1), h))
+
+        painter.setPen(QPen(OUT_OF_RANGE, 2))
+        painter.drawLine(
+            QPointF(HANDLE_RADIUS, track_y),
+            QPointF(self.width() - HANDLE_RADIUS, track_y),
+        )
+        painter.setPen(QPen(IN_RANGE, 3))
+        painter.drawLine(
+            QPointF(self._to_x(low), track_y), QPointF(self._to_x(high), track_y)
+        )
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QBrush(HANDLE))
+        for value in (low, high):
+            painter.drawEllipse(
+                QPointF(self._to_x(value), track_y), HANDLE_RADIUS, HANDLE_RADIUS
+            )
+
+    # Souris
+    def _move_handle(self, x: float):
+        value = self._to_value(x)
+        low, high = self._handle_values()
+        if self._dragging == "low":
+            self.set_range(min(value, high), self._high)
+        else:
+            self.set_range(self._low, max(value, low))
+
+    def mousePressEvent(self, event):
+        x = event.position().x()
+        low, high = self._handle_values()
+        near_low = abs(x - self._to_x(low)) <= abs(x - self._to_x(high))
+        self._dragging = "low" if near_low else "high"
+        self._move_handle(x)
+
+    def mouseMoveEvent(self, event):
+        if self._dragging is not None:
+            self._move_handle(event.position().x())
+
+    def mouseReleaseEvent(self, event):
+        if self._dragging is None:
+            return
+        self._move_handle(event.position().x())
+        self._dragging = None
+        self.rangeCommitted.emit(self._low, self._high)
+
+
+class RangeFilter(QWidget):
+    "Curseur d'intervalle avec bornes et nombre de valeurs retenues"
+
+    rangeCommitted = Signal(object, object)
+
+    def __init__(self, label: str = "", parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        header = QHBoxLayout()
+        self.title = QLabel(label)
+        self.bounds_label = QLabel("")
+        self.bounds_label.setStyleSheet("color: #555;")
+        self.count_label = QLabel("")
+        self.count_label.setStyleSheet("color: #555;")
+        header.addWidget(self.title)
+        header.addWidget(self.bounds_label, 1)
+        header.addWidget(self.count_label)
+        layout.addLayout(header)
+
+        self.slider = RangeSlider(self)
+        self.slider.rangeChanged.connect(self._update_labels)
+        self.slider.rangeCommitted.connect(self.rangeCommitted)
+        layout.addWidget(self.slider)
+
+    def set_values(self, values):
+        self.slider.set_distribution(ColumnDistribution.from_values(values))
+        self._update_labels(*self.slider.range())
+
+    def range(self) -> tuple[float | None, float | None]:
+        return self.slider.range()
+
+    def reset(self):
+        self.slider.reset()
+        self._update_labels(None, None)
+
+    def _update_labels(self, vmin: float | None, vmax: float | None):
+        d = self.slider.distribution
+        low = "—" if vmin is None else f"{vmin:.3f}"
+        high = "—" if vmax is None else f"{vmax:.3f}"
+        self.bounds_label.setText(f"{low} – {high}")
+        total = len(d.sorted_values)
+        self.count_label.setText(f"{d.count_between(vmin, vmax)} / {total}")
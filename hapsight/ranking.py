@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from hapsight.tracing import traced
+from hapsight.versioned import cached, lookup, store
+
+TIE_METHODS = ("min", "dense", "first", "average", "max")
+DEFAULT_METHOD = "min"
+GROUP_COL = "Year"
+EXCLUDED_COLUMNS = {GROUP_COL, "Calculated Rank"}
+
+
+def rank_column(indicator: str) -> str:
+    return f"rank_{indicator}"
+
+
+def pct_column(indicator: str) -> str:
+    return f"pct_{indicator}"
+
+
+def rank_indicators(df: pd.DataFrame) -> list[str]:
+    return [
+        col
+        for col in df.columns
+        if col not in EXCLUDED_COLUMNS
+        and not col.startswith(("rank_", "pct_"))
+        and pd.api.types.is_numeric_dtype(df[col])
+    ]
+
+
+@traced("ranking.compute")
+def compute_ranks(
+    df: pd.DataFrame,
+    indicators: list[str] | None = None,
+    method: str = DEFAULT_METHOD,
+) -> pd.DataFrame:
+    """Rangs (1 = meilleur) et centiles par année pour chaque indicateur.
+
+    Un seul ``groupby(...).rank`` vectorisé couvre toutes les colonnes ;
+    ``method`` choisit le traitement des ex æquo (cf. ``TIE_METHODS``).
+    """
+    if method not in TIE_METHODS:
+        raise ValueError(f"Méthode de rang inconnue : {method}")
+    cols = indicators if indicators is not None else rank_indicators(df)
+    if GROUP_COL not in df.columns or not cols:
+        return pd.DataFrame(index=df.index)
+
+    grouped = df.groupby(GROUP_COL)[cols]
+    ranks = grouped.rank(method=method, ascending=False)
+    pcts = grouped.rank(method="average", pct=True) * 100
+    ranks.columns = [rank_column(c) for c in cols]
+    pcts.columns = [pct_column(c) for c in cols]
+    if method != "average":
+        ranks = ranks.astype("Int64")
+    return pd.concat([ranks, pcts], axis=1)
+
+
+def ranks_for(df: pd.DataFrame, method: str = DEFAULT_METHOD) -> pd.DataFrame:
+    "Table des rangs calculée une seule fois par version des données"
+    return cached(df, ("ranks", method), lambda: compute_ranks(df, method=method))
+
+
+@traced("ranking.update_years")
+def update_ranks(
+    previous: pd.DataFrame,
+    df: pd.DataFrame,
+    years: set[int],
+    method: str = DEFAULT_METHOD,
+) -> pd.DataFrame:
+    """Rangs de ``df`` en ne recalculant que les années ``years``.
+
+    Les autres années sont reprises de la table de ``previous`` (même index
+    pour les lignes conservées, cf. ``diff_frames``).
+    """
+    old_table = lookup(previous, ("ranks", method))
+    if old_table is None or list(previous.columns) != list(df.columns):
+        return ranks_for(df, method)
+
+    touched = df[GROUP_COL].isin(years)
+    fresh = compute_ranks(df[touched], method=method)
+    kept = old_table.reindex(df.index[~touched])
+    table = pd.concat([kept, fresh]).reindex(df.index)
+    return store(df, ("ranks", method), table)
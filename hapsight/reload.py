@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import os
+
+import pandas as pd
+from PySide6.QtCore import QFileSystemWatcher, QObject, QTimer, Signal
+
+from hapsight.dataset import DatasetDiff, diff_frames
+from hapsight.ingest import read_dataset
+from hapsight.tracing import traced
+from hapsight.workers import run_in_background
+
+DEBOUNCE_MS = 300
+
+
+@traced("data.reload_diff")
+def _load_and_diff(path: str, current: pd.DataFrame) -> DatasetDiff:
+    return diff_frames(current, read_dataset(path))
+
+
+class DatasetWatcher(QObject):
+    """Surveille le fichier de données et émet le diff avec les données chargées.
+
+    Lecture et diff se font sur un thread ; les écritures en rafale sont
+    regroupées par un délai de ``DEBOUNCE_MS``.
+    """
+
+    datasetChanged = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self, path: str, current: pd.DataFrame, parent=None):
+        super().__init__(parent)
+        self.path = os.path.abspath(path)
+        self.current = current
+        self._worker = None
+        self._pending = False
+
+        self._watcher = QFileSystemWatcher([self.path], self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(DEBOUNCE_MS)
+        self._debounce.timeout.connect(self.reload)
+
+    def _on_file_changed(self, _path: str):
+        # Beaucoup d'éditeurs remplacent le fichier : il faut le resurveiller
+        if self.path not in self._watcher.files() and os.path.exists(self.path):
+            self._watcher.addPath(self.path)
+        self._debounce.start()
+
+    def reload(self):
+        if self._worker is not None:
+            # Un rechargement est en cours : on relancera à la fin
+            self._pending = True
+            return
+        self._worker = run_in_background(
+            _load_and_diff,
+            self.path,
+            self.current,
+            on_done=self._on_diff,
+            on_error=self._on_error,
+        )
+
+    def _on_diff(self, diff: DatasetDiff):
+        self._worker = None
+        if not diff.is_empty:
+            self.current = diff.merged
+            self.datasetChanged.emit(diff)
+        self._rerun_if_pending()
+
+    def _on_error(self, message: str):
+        # Fichier en cours d'écriture ou invalide : on garde les données
+        self._worker = None
+        self.failed.emit(message)
+        self._rerun_if_pending()
+
+    def _rerun_if_pending(self):
+        if self._pending:
+            self._pending = False
+            self.reload()
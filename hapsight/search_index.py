@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections import defaultdict
+from collections.abc import Iterable
+
+import numpy as np
+import pandas as pd
+
+from hapsight.tracing import traced
+
+# Noms alternatifs (abréviations, noms français, anciennes appellations)
+COUNTRY_ALIASES = {
+    "United States": ["USA", "US", "Etats-Unis", "Amérique", "America"],
+    "United Kingdom": ["UK", "Royaume-Uni", "Grande-Bretagne", "Angleterre"],
+    "United Arab Emirates": ["UAE", "EAU", "Emirats arabes unis"],
+    "Congo (Kinshasa)": ["RDC", "DRC", "République démocratique du Congo"],
+    "Congo (Brazzaville)": ["République du Congo"],
+    "Czech Republic": ["Czechia", "Tchéquie", "République tchèque"],
+    "South Korea": ["Corée du Sud", "Korea"],
+    "Turkey": ["Türkiye", "Turquie"],
+    "Russia": ["Russie", "Russian Federation"],
+    "Germany": ["Allemagne"],
+    "Spain": ["Espagne"],
+    "Italy": ["Italie"],
+    "Switzerland": ["Suisse"],
+    "Belgium": ["Belgique"],
+    "Netherlands": ["Pays-Bas", "Holland", "Hollande"],
+    "Sweden": ["Suède"],
+    "Norway": ["Norvège"],
+    "Denmark": ["Danemark"],
+    "Finland": ["Finlande"],
+    "Iceland": ["Islande"],
+    "Ireland": ["Irlande"],
+    "Greece": ["Grèce"],
+    "Poland": ["Pologne"],
+    "China": ["Chine"],
+    "Japan": ["Japon"],
+    "India": ["Inde"],
+    "Brazil": ["Brésil"],
+    "Mexico": ["Mexique"],
+    "Egypt": ["Egypte"],
+    "Morocco": ["Maroc"],
+    "Algeria": ["Algérie"],
+    "Tunisia": ["Tunisie"],
+    "South Africa": ["Afrique du Sud"],
+    "New Zealand": ["Nouvelle-Zélande"],
+    "Saudi Arabia": ["Arabie saoudite"],
+    "Ivory Coast": ["Côte d'Ivoire"],
+    "Myanmar": ["Burma", "Birmanie"],
+    "Vietnam": ["Viet Nam"],
+}
+
+MIN_FUZZY_SCORE = 0.35
+_TERMINAL = ""
+
+
+def fold(text: str) -> str:
+    "Minuscules, sans accents ni ponctuation"
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return re.sub(r"[^a-z0-9]+", " ", stripped.lower()).strip()
+
+
+def trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """Index de recherche des pays (noms canoniques + alias).
+
+    Un index inversé de trigrammes sert aux recherches par sous-chaîne et à
+    la recherche approchée ; un trie des débuts de mots classe les
+    préfixes en tête. Une requête qui prolonge la précédente ne réexamine
+    que les résultats de celle-ci.
+    """
+
+    def __init__(self, names: Iterable[str], aliases=COUNTRY_ALIASES):
+        codes, uniques = pd.factorize(pd.Series(list(names), dtype=object))
+        self.codes = codes
+        self.names: list[str] = [str(n) for n in uniques]
+        self._name_ids = {name: i for i, name in enumerate(self.names)}
+
+        # Clés repliées (nom + alias) -> identifiant du nom canonique
+        self.keys: list[str] = []
+        self.key_owner: list[int] = []
+        for name_id, name in enumerate(self.names):
+            for key in {fold(name), *(fold(a) for a in aliases.get(name, ()))}:
+                if key:
+                    self.keys.append(key)
+                    self.key_owner.append(name_id)
+
+        self._grams: dict[str, set[int]] = defaultdict(set)
+        self._trie: dict = {}
+        for key_id, key in enumerate(self.keys):
+            for gram in trigrams(key):
+                self._grams[gram].add(key_id)
+            words = key.split(" ")
+            for i in range(len(words)):
+                self._insert(" ".join(words[i:]), key_id)
+
+        self._last_query = ""
+        self._last_keys: set[int] = set(range(len(self.keys)))
+
+    def _insert(self, text: str, key_id: int):
+        node = self._trie
+        for char in text:
+            node = node.setdefault(char, {})
+            node.setdefault(_TERMINAL, set()).add(key_id)
+
+    def _prefix_keys(self, query: str) -> set[int]:
+        node = self._trie
+        for char in query:
+            node = node.get(char)
+            if node is None:
+                return set()
+        return node.get(_TERMINAL, set())
+
+    def _substring_keys(self, query: str) -> set[int]:
+        if self._last_query and self._last_query in query:
+            # Requête plus précise : sous-ensemble des résultats précédents
+            candidates = self._last_keys
+        elif len(query) >= 3:
+            grams = [
+                self._grams.get(query[i : i + 3], set()) for i in range(len(query) - 2)
+            ]
+            candidates = set.intersection(*grams)
+        else:
+            candidates = range(len(self.keys))  # type: ignore
+        hits = {k for k in candidates if query in self.keys[k]}
+        self._last_query, self._last_keys = query, hits
+        return hits
+
+    def _fuzzy_scores(self, query: str) -> dict[int, float]:
+        grams = trigrams(query)
+        shared: dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for key_id in self._grams.get(gram, ()):
+                shared[key_id] += 1
+        scores = {}
+        for key_id, n in shared.items():
+            # Coefficient de Dice sur les trigrammes
+            score = 2 * n / (len(grams) + len(trigrams(self.keys[key_id])))
+            if score >= MIN_FUZZY_SCORE:
+                scores[key_id] = score
+        return scores
+
+    @traced("search.query")
+    def search(self, query: str, fuzzy: bool = True) -> list[str]:
+        "Noms canoniques correspondant à la requête, les meilleurs d'abord"
+        q = fold(query)
+        if not q:
+            self._last_query = ""
+            self._last_keys = set(range(len(self.keys)))
+            return list(self.names)
+
+        scores: dict[int, float] = {}
+        for key_id in self._substring_keys(q):
+            key = self.keys[key_id]
+            if key == q:
+                score = 4.0
+            elif key.startswith(q):
+                score = 3.0
+            else:
+                score = 1.0
+            scores[key_id] = score + len(q) / len(key)
+        for key_id in self._prefix_keys(q):
+            if scores.get(key_id, 0) < 2.0:
+                scores[key_id] = 2.0 + len(q) / len(self.keys[key_id])
+        if not scores and fuzzy:
+            scores = self._fuzzy_scores(q)
+
+        best: dict[int, float] = {}
+        for key_id, score in scores.items():
+            owner = self.key_owner[key_id]
+            best[owner] = max(best.get(owner, 0.0), score)
+        ranked = sorted(best, key=lambda n: (-best[n], self.names[n]))
+        return [self.names[n] for n in ranked]
+
+    def rows(self, query: str, fuzzy: bool = True) -> np.ndarray:
+        "Positions des lignes dont le pays correspond à la requête"
+        matched = self.search(query, fuzzy=fuzzy)
+        ids = [self._name_ids[name] for name in matched]
+        return np.flatnonzero(np.isin(self.codes, ids))
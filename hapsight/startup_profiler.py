@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import json
+import os
+import platform
+import sys
+import threading
+import time
+
+from PySide6.QtCore import QEvent, QObject, QTimer
+from PySide6.QtWidgets import QApplication
+
+from hapsight.tracing import TRACER
+
+# Spans tracés -> phases du profil de démarrage
+SPAN_PHASES = {
+    "data.load": "load_data",
+    "data.normalize": "normalize_data",
+    "window.MapWidget": "MapWidget",
+    "map.load_folium": "folium_html",
+    "map.native_geometry": "native_geometry",
+    "map.native_scene": "native_scene",
+    "window.StatsWidget": "StatsWidget",
+    "window.CountriesWidget": "CountriesWidget",
+}
+# Une seule des deux cartes est construite (QtWebEngine ou rendu natif) :
+# le profil attend la phase finale de l'une ou de l'autre
+MAP_PHASES = {"folium_html", "native_geometry", "native_scene"}
+MAP_READY_PHASES = {"folium_html", "native_scene"}
+
+
+def process_age_ns() -> int | None:
+    "Âge du processus (Linux uniquement), pour estimer le démarrage de Python"
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime_s = float(f.read().split()[0])
+        age_s = uptime_s - start_ticks / os.sysconf("SC_CLK_TCK")
+        return int(max(age_s, 0.0) * 1e9)
+    except Exception:
+        return None
+
+
+class StartupProfiler(QObject):
+    """Découpe le démarrage en phases puis quitte l'application.
+
+    Les phases viennent des spans de ``hapsight.tracing`` (traçage activé le
+    temps du démarrage), du chargement de la page QWebEngine et du premier
+    paint de la fenêtre.
+    """
+
+    def __init__(
+        self,
+        output: str,
+        import_ns: tuple[int, int] | None = None,
+        timeout_s: float = 60.0,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.output = output
+        self.timeout_s = timeout_s
+        self.phases: list[dict] = []
+        self.origin_ns = import_ns[0] if import_ns else time.perf_counter_ns()
+
+        if import_ns:
+            age = process_age_ns()
+            if age is not None:
+                self._add("interpreter", self.origin_ns - age, self.origin_ns)
+            self._add("imports", *import_ns)
+
+        self._painted = False
+        self._page_loaded = None
+        self._show_ns: int | None = None
+        self._page_start_ns: int | None = None
+        self._done = False
+
+        self._tracing_was_enabled = TRACER.enabled
+        TRACER.add_listener(self._on_span)
+        TRACER.enable(True)
+
+    def _add(self, name: str, start_ns: int, end_ns: int, **extra):
+        self.phases.append(
+            {
+                "name": name,
+                "start_ms": round((start_ns - self.origin_ns) / 1e6, 3),
+                "duration_ms": round((end_ns - start_ns) / 1e6, 3),
+                **extra,
+            }
+        )
+
+    def _on_span(self, span):
+        phase = SPAN_PHASES.get(span.name)
+        if phase is None or any(p["name"] == phase for p in self.phases):
+            return
+        self._add(phase, span.start_ns, span.start_ns + span.dur_ns)
+        if span.name == "map.load_folium":
+            # setHtml est asynchrone : le chargement commence ici
+            self._page_start_ns = span.start_ns + span.dur_ns
+        if threading.current_thread() is threading.main_thread():
+            QTimer.singleShot(0, self._maybe_finish)
+
+    def watch(self, window, web_view=None):
+        "À appeler juste avant d'afficher la fenêtre"
+        self._show_ns = time.perf_counter_ns()
+        window.installEventFilter(self)
+        if web_view is not None:
+            web_view.loadFinished.connect(self._on_page_loaded)
+        else:
+            self._page_loaded = True
+        QTimer.singleShot(int(self.timeout_s * 1000), self._on_timeout)
+
+    def eventFilter(self, obj, event):
+        if not self._painted and event.type() == QEvent.Type.Paint:
+            self._painted = True
+            self._add(
+                "first_paint", self._show_ns or self.origin_ns, time.perf_counter_ns()
+            )
+            QTimer.singleShot(0, self._maybe_finish)
+        return False
+
+    def _on_page_loaded(self, ok: bool):
+        if self._page_loaded is not None:
+            return
+        self._page_loaded = ok
+        start = self._page_start_ns or self._show_ns or self.origin_ns
+        self._add("webengine_load", start, time.perf_counter_ns(), ok=bool(ok))
+        self._maybe_finish()
+
+    def _maybe_finish(self):
+        # Les onglets de données peuvent être remplis après le premier paint
+        recorded = {p["name"] for p in self.phases}
+        if (
+            self._painted
+            and self._page_loaded is not None
+            and recorded.issuperset(set(SPAN_PHASES.values()) - MAP_PHASES)
+            and recorded & MAP_READY_PHASES
+        ):
+            self.finish()
+
+    def _on_timeout(self):
+        if not self._done:
+            self.finish(timed_out=True)
+
+    def report(self, timed_out: bool = False) -> dict:
+        return {
+            "total_ms": round((time.perf_counter_ns() - self.origin_ns) / 1e6, 3),
+            "timed_out": timed_out,
+            "phases": sorted(self.phases, key=lambda p: p["start_ms"]),
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "qpa": os.environ.get("QT_QPA_PLATFORM", ""),
+            },
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+
+    def finish(self, timed_out: bool = False):
+        if self._done:
+            return
+        self._done = True
+        TRACER.remove_listener(self._on_span)
+        TRACER.enable(self._tracing_was_enabled)
+
+        report = self.report(timed_out)
+        with open(self.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+        for p in report["phases"]:
+            print(
+                f"{p['name']:<16} +{p['start_ms']:>9.1f} ms  {p['duration_ms']:>9.1f} ms",
+                file=sys.stderr,
+            )
+        print(
+            f"{'total':<16} {report['total_ms']:>22.1f} ms -> {self.output}",
+            file=sys.stderr,
+        )
+        QApplication.quit()
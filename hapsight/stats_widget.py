@@ -3,6 +3,7 @@ import pandas as pd
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QStandardItem, QStandardItemModel
 from PySide6.QtWidgets import (
+    QCheckBox,
     QComboBox,
     QFileDialog,
     QGridLayout,
@@ -15,24 +16,54 @@ from PySide6.QtWidgets import (
 )
 
 matplotlib.use("QtAgg")
+import warnings
+
 import numpy as np
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+from matplotlib.collections import LineCollection, PolyCollection
 from matplotlib.figure import Figure
+from matplotlib.widgets import LassoSelector, RectangleSelector
 from scipy.stats import gaussian_kde
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
 
+from hapsight.brushing import Brush, points_in_polygon, points_in_rect
+from hapsight.computed import ComputedColumns
+from hapsight.cube import cube_for
+from hapsight.panel import panel_for
+from hapsight.tracing import traced
+
+# Nombre de courbes au-delà duquel la légende du comparatif est masquée
+MAX_LEGEND_ENTRIES = 12
+# Bande affichée par continent dans la vue « tous les pays » (quantiles)
+BAND_QUANTILES = (0.25, 0.75)
+BAND_COLORS = ["#E74C3C", "#3498DB", "#2ECC71", "#F39C12", "#9B59B6", "#1ABC9C"]
+# Outils de sélection du nuage de points (brushing)
+BRUSH_MODES = ["Aucune", "Lasso", "Rectangle"]
+BRUSH_COLOR = "#E74C3C"
+
 
 class StatsWidget(QWidget):
-    def __init__(self, df: pd.DataFrame, parent=None):
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        parent=None,
+        computed: ComputedColumns | None = None,
+        brush: Brush | None = None,
+    ):
         super().__init__(parent)
-        self.df = df.copy()
-        self.df.columns = self.df.columns.str.strip()
-
-        self._normalize_columns()
-        self._ensure_types()
+        self.computed = computed
+        self.brush = brush
+        self._selector = None
+        self._brush_overlay = None
+        self._load(df)
 
+        # Comparatif : une courbe par pays coché, séries lues dans le panel
         self.selected_countries = set()
+        self._multi_lines = {}
+        self._multi_ax = None
+        self._multi_batch = False
+        self._spaghetti: list = []
 
         root = QGridLayout(self)
         root.setSpacing(10)
@@ -113,6 +144,16 @@ class StatsWidget(QWidget):
 
         controls2D.addWidget(self.var2Danalyse, 5, 0, 1, 2)
 
+        # Sélection au lasso / rectangle, partagée avec la table et la carte
+        self.brush_mode = QComboBox()
+        self.brush_mode.addItems(BRUSH_MODES)
+        self.brush_mode.currentTextChanged.connect(lambda _: self._install_selector())
+        self.brush_clear = QPushButton("Effacer la sélection")
+        self.brush_clear.clicked.connect(self.clear_brush)
+        controls2D.addWidget(QLabel("Sélection :"), 6, 0)
+        controls2D.addWidget(self.brush_mode, 6, 1)
+        controls2D.addWidget(self.brush_clear, 7, 0, 1, 2)
+
         # HISTOGRAMMES
         # control
         controlshist = QGridLayout(controls_hist)
@@ -175,6 +216,7 @@ class StatsWidget(QWidget):
         self.varcomp = QComboBox()
         nums = self._numeric_columns_candidates()
         self.varcomp.addItems(nums)
+        self.varcomp.currentTextChanged.connect(self._on_varcomp_changed)
 
         # bouttons
         self.varcompclear = QPushButton("Clear")
@@ -182,6 +224,10 @@ class StatsWidget(QWidget):
         self.varcompsave = QPushButton("Save")
         self.varcompsave.clicked.connect(self.savecomp_png)
 
+        # Tous les pays en fond, pays cochés par-dessus
+        self.chk_all_countries = QCheckBox("Tous les pays")
+        self.chk_all_countries.toggled.connect(lambda _: self._rebuild_multi_plot())
+
         # layout
 
         controlscomp.addWidget(QLabel("Variable :"), 0, 0)
@@ -189,53 +235,248 @@ class StatsWidget(QWidget):
         controlscomp.addWidget(QLabel("Pays :"), 1, 0)
         controlscomp.addWidget(self.cmb_multi, 1, 1)
 
-        controlscomp.addWidget(self.varcompclear, 2, 0)
-        controlscomp.addWidget(self.varcompsave, 2, 1)
+        controlscomp.addWidget(self.chk_all_countries, 2, 0, 1, 2)
+        controlscomp.addWidget(self.varcompclear, 3, 0)
+        controlscomp.addWidget(self.varcompsave, 3, 1)
+
+        if computed is not None:
+            computed.changed.connect(lambda: self.set_data(self._source))
+
+    def _load(self, df: pd.DataFrame):
+        "Copie de travail des données, complétée par les colonnes calculées"
+        self._source = df
+        augmented = df if self.computed is None else self.computed.augment(df)
+        self.df = augmented.copy()
+        self.df.columns = self.df.columns.str.strip()
+        self._normalize_columns()
+        self._ensure_types()
+        # Panel et cube partagés avec les autres onglets (même DataFrame) ;
+        # propres à ce widget seulement s'il y a des colonnes calculées
+        self._panel_df = df if augmented is df else self.df
+        self.panel = panel_for(self._panel_df)
+
+    def set_data(self, df: pd.DataFrame):
+        "Remplace les données en gardant les sélections encore valides"
+        self._load(df)
+        self._refresh_variable_combos()
+
+        checked = set()
+        for index in range(self._multi_model.rowCount()):
+            item = self._multi_model.item(index)
+            if item.checkState() == Qt.CheckState.Checked:
+                checked.add(item.text())
+        countries = (
+            sorted(self.df["Country"].dropna().unique().tolist())
+            if "Country" in self.df.columns
+            else []
+        )
+        self._build_checkable_country_list(countries)
+        self._multi_model.blockSignals(True)
+        for index in range(self._multi_model.rowCount()):
+            item = self._multi_model.item(index)
+            if item.text() in checked:
+                item.setCheckState(Qt.CheckState.Checked)
+        self._multi_model.blockSignals(False)
+
+        if "Year" in self.df.columns and self.df["Year"].notna().any():
+            y_min = int(self.df["Year"].min())
+            y_max = int(self.df["Year"].max())
+            for spin in (self.spin_year_max, self.spinhist_year_max):
+                at_max = spin.value() == spin.maximum()
+                spin.setRange(y_min, y_max)
+                if at_max:
+                    spin.setValue(y_max)
+
+        if "continent" in self.df.columns:
+            current = self.varcontinent.currentText()
+            self.varcontinent.blockSignals(True)
+            self.varcontinent.clear()
+            self.varcontinent.addItem("Tous")
+            for c in sorted(self.df["continent"].dropna().unique().tolist()):
+                self.varcontinent.addItem(str(c))
+            self.varcontinent.setCurrentIndex(
+                max(self.varcontinent.findText(current), 0)
+            )
+            self.varcontinent.blockSignals(False)
+
+        self.update_multi_plot()
 
+    def _refresh_variable_combos(self):
+        "Variables proposées (colonnes calculées comprises), sélection gardée"
+        nums = self._numeric_columns_candidates()
+        for combo in (self.var2D_x, self.var2D_y, self.varhist, self.varcomp):
+            current = combo.currentText()
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItems(nums)
+            combo.setCurrentIndex(max(combo.findText(current), 0))
+            combo.blockSignals(False)
+
+    # COMPARATIF MULTIPAYS
+
+    def _series(self, country: str, variable: str):
+        "(x, y) d'un pays : tranche du panel, sans parcourir le DataFrame"
+        y_data = self.panel.series(country, variable)
+        if y_data is None:
+            return None
+        return self.panel.years, y_data
+
+    @traced("stats.multi_plot")
     def update_multi_plot(self, item=None):
-        "Update le plot lorsque l'on coche une nouvelle case"
+        "Ajoute ou retire seulement la courbe du pays coché"
+        if self._multi_batch:
+            return
+        if item is None:
+            self._rebuild_multi_plot()
+            return
 
-        checked_countries = []
+        country = item.text()
+        if item.checkState() == Qt.CheckState.Checked:
+            self.selected_countries.add(country)
+            if country not in self._multi_lines:
+                self._add_multi_line(country, self.varcomp.currentText())
+        else:
+            self.selected_countries.discard(country)
+            line = self._multi_lines.pop(country, None)
+            if line is not None:
+                line.remove()
+        self._finish_multi_plot()
+
+    def _rebuild_multi_plot(self):
+        "Reconstruit toutes les courbes (changement de données ou remise à zéro)"
+        self.selected_countries = set()
         for index in range(self._multi_model.rowCount()):
             item = self._multi_model.item(index)
-            if item.checkState() == Qt.Checked:  # type: ignore
-                checked_countries.append(item.text())
+            if item.checkState() == Qt.CheckState.Checked:
+                self.selected_countries.add(item.text())
 
+        self._multi_lines = {}
+        self._multi_ax = None
+        self._spaghetti = []
+        self.canvasautre.figure.clear()
         variable = self.varcomp.currentText()
-        if not variable or not checked_countries:
+        if self.chk_all_countries.isChecked():
+            self._draw_all_countries(variable)
+        for country in sorted(self.selected_countries):
+            self._add_multi_line(country, variable)
+        self._finish_multi_plot()
+
+    def _comparison_axes(self):
+        if self._multi_ax is None:
             self.canvasautre.figure.clear()
-            self.canvasautre.draw()
+            self._multi_ax = self.canvasautre.figure.add_subplot(111)
+            self._multi_ax.set_xlabel("Année")
+            self._multi_ax.grid(True)
+        return self._multi_ax
+
+    @traced("stats.all_countries")
+    def _draw_all_countries(self, variable: str):
+        """Toutes les séries en une LineCollection, quantiles par continent.
+
+        Les bandes sont calculées sur le même tableau (pays × année) et
+        regroupées dans une seule PolyCollection.
+        """
+        for artist in self._spaghetti:
+            artist.remove()
+        self._spaghetti = []
+        panel = self.panel
+        if variable not in panel.indicator_index or not panel.countries:
             return
+        years, matrix = panel.years.astype(float), panel.matrix(variable)
+        continent_codes, continents = pd.factorize(
+            pd.Series(panel.continents).replace("", None)
+        )
 
-        self.canvasautre.figure.clear()
-        ax = self.canvasautre.figure.add_subplot(111)
-
-        for country in checked_countries:
-            df_subset = self.df[self.df["Country"] == country]
-            if "Year" in df_subset.columns:
-                df_subset = df_subset.sort_values("Year")
-                x_data = df_subset["Year"]
-            else:
-                x_data = range(len(df_subset))
+        ax = self._comparison_axes()
+        segments = np.stack([np.broadcast_to(years, matrix.shape), matrix], axis=-1)
+        lines = LineCollection(
+            segments, colors="#95A5A6", linewidths=0.6, alpha=0.35, zorder=1
+        )
+        ax.add_collection(lines)
+        self._spaghetti.append(lines)
+
+        bands, colors = [], []
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # années sans donnée
+            for code, name in enumerate(continents):
+                low, high = np.nanquantile(
+                    matrix[continent_codes == code], BAND_QUANTILES, axis=0
+                )
+                ok = ~(np.isnan(low) | np.isnan(high))
+                if not ok.any():
+                    continue
+                bands.append(
+                    np.concatenate(
+                        [
+                            np.column_stack([years[ok], low[ok]]),
+                            np.column_stack([years[ok], high[ok]])[::-1],
+                        ]
+                    )
+                )
+                colors.append(BAND_COLORS[code % len(BAND_COLORS)])
+        if bands:
+            polys = PolyCollection(
+                bands, facecolors=colors, edgecolors="none", alpha=0.15, zorder=0
+            )
+            ax.add_collection(polys)
+            self._spaghetti.append(polys)
 
-            y_data = df_subset[variable]
+    def _add_multi_line(self, country: str, variable: str):
+        series = self._series(country, variable) if variable else None
+        if series is None:
+            return
+        (line,) = self._comparison_axes().plot(
+            *series, label=country, marker="o", zorder=3
+        )
+        self._multi_lines[country] = line
 
-            ax.plot(x_data, y_data, label=country, marker="o")
+    def _on_varcomp_changed(self, variable: str):
+        "Nouvelle variable : mise à jour des ordonnées, sans recréer les courbes"
+        if not variable or not (self._multi_lines or self._spaghetti):
+            self._rebuild_multi_plot()
+            return
+        if self._spaghetti:
+            self._draw_all_countries(variable)
+        for country, line in self._multi_lines.items():
+            series = self._series(country, variable)
+            if series is not None:
+                line.set_ydata(series[1])
+        self._finish_multi_plot()
+
+    def _finish_multi_plot(self):
+        if not self._multi_lines and not self._spaghetti:
+            self._multi_ax = None
+            self.canvasautre.figure.clear()
+            self.canvasautre.draw_idle()
+            return
 
+        ax = self._multi_ax
+        variable = self.varcomp.currentText()
         ax.set_title(f"Évolution de {variable}")
-        ax.set_xlabel("Année")
         ax.set_ylabel(variable)
-        ax.legend()
-        ax.grid(True)
-        self.canvasautre.draw()
+        ax.relim()
+        for artist in self._spaghetti:  # relim ignore les collections
+            ax.update_datalim(artist.get_datalim(ax.transData))
+        ax.autoscale_view()
+        # Au-delà de quelques pays la légende masque le graphique
+        if self._multi_lines and len(self._multi_lines) <= MAX_LEGEND_ENTRIES:
+            ax.legend()
+        elif ax.get_legend() is not None:
+            ax.get_legend().remove()
+        self.canvasautre.draw_idle()
 
     def clear_multi_selection(self):
         "Décoche tous les pays + nettoie le canvas"
-        for index in range(self._multi_model.rowCount()):
-            item = self._multi_model.item(index)
-            item.setCheckState(Qt.Unchecked)  # type: ignore
+        self._multi_batch = True
+        try:
+            for index in range(self._multi_model.rowCount()):
+                item = self._multi_model.item(index)
+                item.setCheckState(Qt.Unchecked)  # type: ignore
+        finally:
+            self._multi_batch = False
         self.update_multi_plot()
 
+    @traced("stats.scatter")
     def plot2D(self):
         "Permet le plot 2D"
         self.figurecorr.clear()
@@ -243,6 +484,7 @@ class StatsWidget(QWidget):
         self.figurecorr.tight_layout()
         self.canvascorr.draw()
 
+    @traced("stats.hist")
     def plothist(self):
         "Permet le plot des hists"
         self.figurehist.clear()
@@ -282,10 +524,18 @@ class StatsWidget(QWidget):
                     dff[col_cont].dropna().unique().tolist()
                 )
 
+                cube = cube_for(self._panel_df)
                 for cont in continents_disponibles:
                     vals = dff.loc[dff[col_cont] == cont, var].values  # type: ignore
                     if len(vals) > 0:
-                        self.ax.hist(vals, bins="auto", alpha=0.5, label=str(cont))
+                        # Moyenne lue dans le cube (pas de nouveau parcours)
+                        mean_val = cube.value(str(cont), year, var, "mean")
+                        self.ax.hist(
+                            vals,
+                            bins="auto",
+                            alpha=0.5,
+                            label=f"{cont} (moy. {mean_val:.2f})",
+                        )
 
                 self.ax.set_title(f"Distribution de '{var}'\npar Continent ({year})")
                 self.ax.legend(title="Continent", fontsize="small")
@@ -311,7 +561,9 @@ class StatsWidget(QWidget):
                     alpha=0.7,
                 )
 
-                mean_val = dff_single[var].mean()
+                mean_val = cube_for(self._panel_df).value(
+                    continent_filter, year, var, "mean"
+                )
                 self.ax.axvline(
                     mean_val,
                     color="red",
@@ -339,6 +591,7 @@ class StatsWidget(QWidget):
         self.dff_current = (
             self.df[self.df["Year"] == year].dropna(subset=[x_col, y_col]).copy()
         )
+        self._scatter_year = year
 
         self.figurecorr.clear()
         self.ax = self.figurecorr.add_subplot(111)
@@ -376,8 +629,10 @@ class StatsWidget(QWidget):
 
         self._cid = self.canvascorr.mpl_connect("pick_event", self._on_pick)
 
+        self._install_selector()
         self.canvascorr.draw()
 
+    @traced("stats.kmeans")
     def _apply_clustering(self):
         "Permet le clustering sur le plot 2D"
         if not hasattr(self, "dff_current") or self.dff_current.empty:
@@ -443,8 +698,73 @@ class StatsWidget(QWidget):
         )
         self.annot.set_visible(False)
 
+        self._install_selector()
         self.canvascorr.draw()
 
+    # SÉLECTION (BRUSHING)
+
+    def _install_selector(self):
+        "(Re)crée l'outil de sélection sur les axes du nuage de points"
+        if self._selector is not None:
+            self._selector.set_active(False)
+            self._selector.disconnect_events()
+            self._selector = None
+        if not hasattr(self, "dff_current") or self.dff_current.empty:
+            return
+        if self._brush_overlay is None or self._brush_overlay.axes is not self.ax:
+            self._brush_overlay = self.ax.scatter(
+                np.empty(0),
+                np.empty(0),
+                s=70,
+                facecolors="none",
+                edgecolors=BRUSH_COLOR,
+                linewidths=1.5,
+                zorder=3,
+            )
+        mode = self.brush_mode.currentText()
+        if mode == "Lasso":
+            self._selector = LassoSelector(self.ax, self._on_lasso)
+        elif mode == "Rectangle":
+            self._selector = RectangleSelector(
+                self.ax, self._on_rectangle, useblit=True, minspanx=0, minspany=0
+            )
+
+    def _brush_points(self) -> np.ndarray:
+        "Coordonnées (n × 2) des points affichés"
+        columns = [self.var2D_x.currentText(), self.var2D_y.currentText()]
+        return self.dff_current[columns].to_numpy(dtype=float)
+
+    def _on_lasso(self, vertices):
+        self.apply_brush(points_in_polygon(self._brush_points(), vertices))
+
+    def _on_rectangle(self, press, release):
+        self.apply_brush(
+            points_in_rect(
+                self._brush_points(),
+                (press.xdata, press.ydata),
+                (release.xdata, release.ydata),
+            )
+        )
+
+    @traced("stats.brush")
+    def apply_brush(self, mask: np.ndarray):
+        "Met en évidence les points sélectionnés et publie les pays retenus"
+        points = self._brush_points()
+        if self._brush_overlay is not None:
+            self._brush_overlay.set_offsets(points[mask])
+            self.canvascorr.draw_idle()
+        if self.brush is not None:
+            countries = self.dff_current["Country"].to_numpy()[mask]
+            self.brush.select(countries.tolist(), self._scatter_year)
+
+    def clear_brush(self):
+        if self._brush_overlay is not None:
+            self._brush_overlay.set_offsets(np.empty((0, 2)))
+            self.canvascorr.draw_idle()
+        if self.brush is not None:
+            self.brush.clear()
+
+    @traced("stats.kde")
     def _analyze_histogram(self):
         "Outil d'analyse de l'histogramme"
         if not hasattr(self, "dff_currenthist") or self.dff_currenthist.empty:
@@ -646,6 +966,8 @@ class StatsWidget(QWidget):
             "social_support",
             "cpi_score",
         ]
+        if self.computed is not None:
+            candidates += self.computed.names()
         return [c for c in candidates if c in self.df.columns]
 
     def _build_checkable_country_list(self, countries):
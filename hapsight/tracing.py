@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+# Bornes (en ms) des classes de l'histogramme par handler
+HIST_EDGES_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+@dataclass(frozen=True)
+class Span:
+    name: str
+    start_ns: int
+    dur_ns: int
+    thread_id: int
+
+    @property
+    def duration_ms(self) -> float:
+        return self.dur_ns / 1e6
+
+
+class _HandlerStats:
+    __slots__ = ("count", "total_ns", "max_ns", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * (len(HIST_EDGES_MS) + 1)
+
+    def add(self, dur_ns: int):
+        self.count += 1
+        self.total_ns += dur_ns
+        self.max_ns = max(self.max_ns, dur_ns)
+        self.buckets[bisect.bisect_left(HIST_EDGES_MS, dur_ns / 1e6)] += 1
+
+
+class Tracer:
+    "Collecte les spans récents et des histogrammes par handler"
+
+    def __init__(self, capacity: int = 5000):
+        self.enabled = False
+        self.epoch_ns = time.perf_counter_ns()
+        self._spans: deque[Span] = deque(maxlen=capacity)
+        self._stats: dict[str, _HandlerStats] = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def enable(self, enabled: bool = True):
+        self.enabled = enabled
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+            self._stats.clear()
+
+    def add_listener(self, callback):
+        "callback(span) est appelé pour chaque span terminé"
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def record(self, name: str, start_ns: int, dur_ns: int):
+        span = Span(name, start_ns, dur_ns, threading.get_ident())
+        with self._lock:
+            self._spans.append(span)
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = _HandlerStats()
+            stats.add(dur_ns)
+        for callback in self._listeners:
+            callback(span)
+
+    def recent(self, limit: int | None = None) -> list[Span]:
+        with self._lock:
+            spans = list(self._spans)
+        return spans if limit is None else spans[-limit:]
+
+    def stats(self) -> dict[str, dict]:
+        "Statistiques agrégées par nom de span"
+        with self._lock:
+            items = list(self._stats.items())
+        return {
+            name: {
+                "count": s.count,
+                "mean_ms": s.total_ns / s.count / 1e6,
+                "max_ms": s.max_ns / 1e6,
+                "total_ms": s.total_ns / 1e6,
+                "histogram": list(s.buckets),
+            }
+            for name, s in items
+        }
+
+    def chrome_trace(self) -> dict:
+        "Spans au format Chrome trace (chrome://tracing, Perfetto)"
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name,
+                "cat": span.name.split(".", 1)[0],
+                "ph": "X",
+                "ts": (span.start_ns - self.epoch_ns) / 1e3,
+                "dur": span.dur_ns / 1e3,
+                "pid": pid,
+                "tid": span.thread_id,
+            }
+            for span in self.recent()
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _ActiveSpan:
+    __slots__ = ("_name", "_start")
+
+    def __init__(self, name: str):
+        self._name = name
+        self._start = 0
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        TRACER.record(self._name, self._start, end - self._start)
+        return False
+
+
+TRACER = Tracer()
+TRACER.enable(os.environ.get("HAPSIGHT_TRACE", "") not in ("", "0"))
+
+
+def span(name: str):
+    """Context manager mesurant un bloc.
+
+    Quand le traçage est désactivé, un objet no-op partagé est retourné :
+    ni horloge ni allocation.
+    """
+    if not TRACER.enabled:
+        return _NULL_SPAN
+    return _ActiveSpan(name)
+
+
+def traced(name: str | None = None):
+    "Décorateur mesurant chaque appel de la fonction"
+
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                TRACER.record(label, start, time.perf_counter_ns() - start)
+
+        return wrapper
+
+    return decorator
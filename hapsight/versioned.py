@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import weakref
+from collections.abc import Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+# (id(obj), clé) -> (référence faible vers obj, résultat) ; l'entrée disparaît
+# avec obj, un id réutilisé par un autre objet ne donne donc jamais de faux succès
+_CACHE: dict[tuple[int, Hashable], tuple[weakref.ref, Any]] = {}
+
+
+def lookup(obj, key: Hashable, default=None):
+    "Résultat mémorisé pour cette version des données (``obj``), sinon default"
+    hit = _CACHE.get((id(obj), key))
+    if hit is not None and hit[0]() is obj:
+        return hit[1]
+    return default
+
+
+def store(obj, key: Hashable, value: T) -> T:
+    "Mémorise ``value`` tant que ``obj`` existe"
+    entry = (id(obj), key)
+    _CACHE[entry] = (weakref.ref(obj, lambda _: _CACHE.pop(entry, None)), value)
+    return value
+
+
+def cached(obj, key: Hashable, build: Callable[[], T]) -> T:
+    "``build()`` une seule fois par version des données et par clé"
+    missing = object()
+    value = lookup(obj, key, missing)
+    if value is missing:
+        value = store(obj, key, build())
+    return value
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from dataclasses import dataclass, field
+
+from PySide6.QtCore import QObject, QTimer
+
+logger = logging.getLogger("hapsight.watchdog")
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+STACK_DEPTH = 25
+
+
+def _frame_label(frame: traceback.FrameSummary) -> str:
+    return f"{os.path.basename(frame.filename)}:{frame.lineno} {frame.name}"
+
+
+def offender_key(stack: traceback.StackSummary) -> str:
+    "Identifie le coupable : dernier frame de l'appli -> frame feuille"
+    leaf = stack[-1]
+    app_frame = None
+    for frame in reversed(stack):
+        if frame.filename.startswith(PACKAGE_DIR):
+            app_frame = frame
+            break
+    if app_frame is None or app_frame is leaf:
+        return _frame_label(leaf)
+    return f"{_frame_label(app_frame)} -> {_frame_label(leaf)}"
+
+
+@dataclass
+class Offender:
+    key: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    stack: list[str] = field(default_factory=list)
+
+
+class StallWatchdog(QObject):
+    """Détecte les blocages de la boucle d'événements Qt.
+
+    Un QTimer du thread GUI émet un battement régulier ; un thread de
+    surveillance échantillonne la pile Python du thread principal tant que
+    le battement est en retard de plus de ``threshold_ms`` (au-delà de sa
+    période). Les deux threads appliquent ce même critère (``_lateness``).
+    """
+
+    def __init__(self, threshold_ms: float = 50, heartbeat_ms: int = 10, parent=None):
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000.0
+        self.heartbeat = heartbeat_ms / 1000.0
+        self.stall_count = 0
+        self.offenders: dict[str, Offender] = {}
+
+        self._main_ident = threading.main_thread().ident
+        self._last_beat = time.perf_counter()
+        self._samples: list[traceback.StackSummary] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(heartbeat_ms)
+        self._timer.timeout.connect(self._beat)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._last_beat = time.perf_counter()
+        self._stop.clear()
+        self._timer.start()
+        self._thread = threading.Thread(
+            target=self._monitor, name="hapsight-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._timer.stop()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _lateness(self, beat: float, now: float) -> float:
+        "Retard (s) du battement ``beat`` au-delà de la période du timer"
+        return now - beat - self.heartbeat
+
+    # Thread GUI
+    def _beat(self):
+        now = time.perf_counter()
+        with self._lock:
+            late = self._lateness(self._last_beat, now)
+            self._last_beat = now
+            # Vidés à chaque battement : rien n'est reporté sur le blocage suivant
+            samples, self._samples = self._samples, []
+        if late > self.threshold:
+            self._record_stall(late * 1000.0, samples)
+
+    def _record_stall(self, duration_ms: float, samples):
+        self.stall_count += 1
+        if not samples:
+            key = "(pile non capturée)"
+            stack = []
+        else:
+            keys = Counter(offender_key(s) for s in samples)
+            key = keys.most_common(1)[0][0]
+            stack = next(s for s in samples if offender_key(s) == key).format()
+
+        offender = self.offenders.get(key)
+        if offender is None:
+            offender = self.offenders[key] = Offender(key, stack=stack)
+        offender.count += 1
+        offender.total_ms += duration_ms
+        offender.max_ms = max(offender.max_ms, duration_ms)
+        logger.warning("Boucle Qt bloquée %.0f ms : %s", duration_ms, key)
+
+    # Thread de surveillance
+    def _monitor(self):
+        poll = max(self.threshold / 4, 0.002)
+        while not self._stop.wait(poll):
+            self._sample()
+
+    def _sample(self):
+        "Capture la pile du thread principal si le battement est en retard"
+        beat = self._last_beat
+        if self._lateness(beat, time.perf_counter()) <= self.threshold:
+            return
+        frame = sys._current_frames().get(self._main_ident)  # type: ignore
+        if frame is None:
+            return
+        stack = traceback.extract_stack(frame, limit=STACK_DEPTH)
+        del frame
+        with self._lock:
+            if self._last_beat == beat:  # sinon le blocage est déjà terminé
+                self._samples.append(stack)
+
+    # Rapport
+    def top_offenders(self, limit: int | None = None) -> list[Offender]:
+        offenders = sorted(
+            self.offenders.values(), key=lambda o: o.total_ms, reverse=True
+        )
+        return offenders if limit is None else offenders[:limit]
+
+    def report(self, limit: int = 10) -> str:
+        lines = [
+            f"{self.stall_count} blocage(s) > {self.threshold * 1000:.0f} ms",
+        ]
+        for o in self.top_offenders(limit):
+            lines.append(
+                f"  {o.count:>4}x  total {o.total_ms:>8.0f} ms"
+                f"  max {o.max_ms:>6.0f} ms  {o.key}"
+            )
+        return "\n".join(lines)
+
+    def report_dict(self) -> dict:
+        return {
+            "threshold_ms": self.threshold * 1000,
+            "stalls": self.stall_count,
+            "offenders": [
+                {
+                    "key": o.key,
+                    "count": o.count,
+                    "total_ms": round(o.total_ms, 1),
+                    "max_ms": round(o.max_ms, 1),
+                    "stack": o.stack,
+                }
+                for o in self.top_offenders()
+            ],
+        }
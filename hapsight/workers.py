@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import traceback
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class WorkerSignals(QObject):
+    finished = Signal(object)
+    failed = Signal(str)
+
+
+class Worker(QRunnable):
+    "Exécute fn(*args, **kwargs) sur le pool de threads Qt"
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        # Durée de vie gérée côté Python : l'appelant garde une référence
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        # Les signaux vivent dans le thread qui crée le worker (thread GUI)
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception:
+            self.signals.failed.emit(traceback.format_exc())
+        else:
+            self.signals.finished.emit(result)
+
+
+def run_in_background(
+    fn, *args, on_done=None, on_error=None, pool: QThreadPool | None = None, **kwargs
+) -> Worker:
+    "Lance fn sur ``pool`` (par défaut le pool global de Qt)"
+    worker = Worker(fn, *args, **kwargs)
+    if on_done is not None:
+        worker.signals.finished.connect(on_done)
+    if on_error is not None:
+        worker.signals.failed.connect(on_error)
+    (pool or QThreadPool.globalInstance()).start(worker)
+    return worker
@@ -0,0 +1,34 @@
+from hapsight.animation import PALETTE, compute_year_frames
+from hapsight.mapwidget import MapWidget
+
+
+def test_frames_precomputed(sample_df):
+    """Vérifie qu'une image est calculée par année avec la légende"""
+    frames = compute_year_frames(sample_df)
+    assert frames.years == [2019, 2020]
+    assert frames.names == ["Chile", "France", "Peru", "United States of America"]
+    assert len(frames.legend()) == len(frames.edges) + 1 <= len(PALETTE)
+    # Pérou (3e) absent en 2019, plus faible score en 2020
+    assert frames.frames[2019].split('"')[1][2] == "-"
+    assert frames.frames[2020].split('"')[1][2] == "0"
+
+
+def test_frames_comparable_across_years(sample_df):
+    """Vérifie que les classes sont les mêmes pour toutes les années"""
+    frames = compute_year_frames(sample_df)
+    code_2019 = frames.frames[2019].split('"')[1]
+    code_2020 = frames.frames[2020].split('"')[1]
+    assert code_2020[1] >= code_2019[1]
+
+
+def test_playback_advances_year(qapp, sample_df):
+    """Vérifie que la lecture fait avancer l'année jusqu'à la dernière"""
+    w = MapWidget(sample_df)
+    w._refresh_years()
+    w.combo_annee.setCurrentIndex(0)
+    w.btn_play.setChecked(True)
+    assert w.play_timer.isActive()
+    w.next_frame()
+    assert w.combo_annee.currentText() == "2020"
+    assert not w.btn_play.isChecked()
+    assert not w.play_timer.isActive()
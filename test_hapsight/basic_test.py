@@ -1,6 +1,4 @@
 import pandas as pd
-import pytest
-from PySide6.QtWidgets import QApplication
 
 from hapsight.countrieswidget import CountriesWidget
 from hapsight.mainwindow import MainWindow, load_data
@@ -36,15 +34,6 @@ def test_load_data_years():
     assert data["Year"].max() <= 2020
 
 
-@pytest.fixture
-def qapp():
-    """Fixture pour créer une QApplication une seule fois"""
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication([])
-    return app
-
-
 def test_mainwindow(qapp):
     """Vérifie que la fenêtre principale se crée sans erreur"""
     window = MainWindow()
@@ -120,3 +109,14 @@ def test_continent_not_null():
     data = load_data()
     null_continents = data["continent"].isnull().sum()
     assert null_continents == 0, f"Il y a {null_continents} continents vides"
+
+
+def test_mainwindow_deferred_populate(qapp):
+    """Vérifie le remplissage différé des onglets de données"""
+    window = MainWindow(deferred=True)
+    assert window.countries_tab is None
+    assert window.tab_manager.count() == 3
+    window.populate(load_data())
+    assert isinstance(window.countries_tab, CountriesWidget)
+    assert isinstance(window.PaoloStats_tab, StatsWidget)
+    assert window.tab_manager.tabText(2) == "Pays"
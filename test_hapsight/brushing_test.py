@@ -0,0 +1,59 @@
+import numpy as np
+
+from hapsight.brushing import Brush, BrushSelection, points_in_polygon, points_in_rect
+from hapsight.countrieswidget import CountriesWidget
+from hapsight.stats_widget import StatsWidget
+
+
+def test_point_selection_vectorized():
+    """Vérifie la sélection au lasso et au rectangle sur tous les points"""
+    points = np.array([[0.5, 0.5], [2.0, 2.0], [0.1, 0.9], [1.2, 0.5]])
+    triangle = [(0, 0), (1.5, 0), (0, 1.5)]
+    assert points_in_polygon(points, triangle).tolist() == [True, False, True, False]
+    assert not points_in_polygon(points, [(0, 0), (1, 1)]).any()
+    assert points_in_rect(points, (2.5, 2.5), (0.4, 0.1)).tolist() == [
+        True,
+        True,
+        False,
+        True,
+    ]
+
+
+def test_selection_mask_uses_country_and_year(sample_df):
+    """Vérifie le masque (pays, année) appliqué à la table"""
+    selection = BrushSelection(frozenset({"France", "Chile"}), 2020)
+    assert selection.mask(sample_df).tolist() == [
+        True,
+        False,
+        False,
+        True,
+        False,
+        False,
+    ]
+
+
+def test_lasso_cross_filters_table(qapp, sample_df):
+    """Vérifie qu'une sélection au lasso filtre la table liée"""
+    brush = Brush()
+    stats = StatsWidget(sample_df, brush=brush)
+    table = CountriesWidget(sample_df, brush=brush)
+    stats.var2D_x.setCurrentText("gdp_per_capita")
+    stats.var2D_y.setCurrentText("happiness_score")
+    stats.spin_year_max.setValue(2020)
+    stats.brush_mode.setCurrentText("Lasso")
+    stats.plot2D()
+    assert stats._selector is not None
+
+    # Tout 2020 : le Chili, sans PIB cette année-là, n'est pas un point
+    stats._on_lasso([(0.5, 5.5), (1.6, 5.5), (1.6, 7.0), (0.5, 7.0)])
+    assert brush.selection == BrushSelection(frozenset({"France", "Peru"}), 2020)
+    assert len(stats._brush_overlay.get_offsets()) == 2
+
+    table.proxy.flush()
+    assert table.proxy.rowCount() == 2
+
+    stats.clear_brush()
+    table.proxy.flush()
+    assert brush.selection is None
+    assert table.proxy.rowCount() == 6
+    qapp.processEvents()
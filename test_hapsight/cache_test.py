@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+import hapsight.cache as cache_module
+from hapsight.cache import (
+    TileStore,
+    asset_name,
+    local_asset_url,
+    map_cache_key,
+    parse_tile_url,
+    read_asset,
+    read_cached_html,
+    store_asset,
+    store_cached_html,
+)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """Fixture pour isoler le dossier de cache"""
+    monkeypatch.setenv("HAPSIGHT_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_local_asset_url(cache):
+    """Vérifie la redirection vers le schéma local une fois en cache"""
+    url = "https://cdn.example.org/npm/leaflet@1.9.3/dist/leaflet.js"
+    assert local_asset_url(url) == url
+    store_asset(url, b"var L;")
+    assert local_asset_url(url) == f"hapsight://assets/{asset_name(url)}"
+    assert read_asset(asset_name(url)) == b"var L;"
+    assert read_asset("../" + asset_name(url)) is None
+
+
+def test_tile_store_roundtrip(cache):
+    """Vérifie l'écriture et la relecture d'une tuile (lignes TMS)"""
+    store = TileStore()
+    assert not store.has(3, 1, 2)
+    store.put(3, 1, 2, b"png")
+    assert store.get(3, 1, 2) == b"png"
+    store.close()
+
+    reopened = TileStore()
+    assert reopened.has(3, 1, 2)
+    assert len(reopened) == 1
+    row = reopened._conn.execute("SELECT tile_row FROM tiles").fetchone()[0]
+    assert row == 5
+    reopened.close()
+    assert os.path.exists(reopened.path)
+
+
+def test_parse_tile_url():
+    """Vérifie la reconnaissance des URL de tuiles CartoDB"""
+    url = "https://b.basemaps.cartocdn.com/light_all/4/3/5@2x.png"
+    assert parse_tile_url(url) == (4, 3, 5)
+    assert parse_tile_url("https://example.org/4/3/5.png") is None
+
+
+def test_map_cache_key():
+    """Vérifie que la clé dépend de chaque composante"""
+    key = map_cache_key(folium="0.20", options={"zoom": 2})
+    assert key == map_cache_key(options={"zoom": 2}, folium="0.20")
+    assert key != map_cache_key(folium="0.21", options={"zoom": 2})
+    assert key != map_cache_key(folium="0.20", options={"zoom": 3})
+
+
+def test_html_cache_pruned(cache, monkeypatch):
+    """Vérifie la relecture des pages et la limite du cache"""
+    monkeypatch.setattr(cache_module, "HTML_CACHE_LIMIT", 2)
+    assert read_cached_html("a") is None
+    for key in ["a", "b", "c"]:
+        store_cached_html(key, f"<html>{key}</html>")
+    assert read_cached_html("c") == "<html>c</html>"
+    assert len(os.listdir(cache / "html")) == 2
+
+
+def test_map_page_rendered_once(cache, monkeypatch):
+    """Vérifie que la page de la carte est relue depuis le cache"""
+    from PySide6.QtWidgets import QApplication
+
+    from hapsight.mapwidget import MapWidget
+
+    if QApplication.instance() is None:
+        QApplication([])
+    calls = []
+    render = MapWidget.render_folium_html
+    monkeypatch.setattr(
+        MapWidget,
+        "render_folium_html",
+        staticmethod(lambda geo_url: calls.append(geo_url) or render(geo_url)),
+    )
+    MapWidget(None)
+    MapWidget(None)
+    assert len(calls) == 1
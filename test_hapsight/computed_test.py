@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hapsight.computed import ComputedColumns, evaluate
+from hapsight.countrieswidget import CountriesWidget
+from hapsight.stats_widget import StatsWidget
+
+
+def make_df():
+    return pd.DataFrame(
+        {
+            "Country": ["France", "Spain", "Chile", "Peru"],
+            "Year": [2020, 2020, 2020, 2020],
+            "continent": ["Europe", "Europe", "America", "America"],
+            "happiness_score": [6.0, 5.0, 4.0, 3.0],
+            "gdp_per_capita": [1.0, 2.0, 3.0, np.nan],
+            "health": [0.5, 0.5, 1.0, 1.0],
+        }
+    )
+
+
+def test_evaluate_whole_columns():
+    """Vérifie l'évaluation vectorisée et les moyennes par continent"""
+    df = make_df()
+    product = evaluate(df, "gdp_per_capita * health")
+    np.testing.assert_allclose(product, [0.5, 1.0, 3.0, np.nan])
+    gap = evaluate(df, "happiness_score - happiness_score_continent_mean")
+    np.testing.assert_allclose(gap, [0.5, -0.5, 0.5, -0.5])
+
+    for expression in ("inconnue + 1", "health >", "Country"):
+        with pytest.raises(ValueError):
+            evaluate(df, expression)
+
+
+def test_memoized_per_data_version():
+    """Vérifie que chaque colonne n'est évaluée qu'une fois par DataFrame"""
+    df = make_df()
+    computed = ComputedColumns()
+    computed.add("wealth", "gdp_per_capita * health", df)
+    assert computed.column(df, "wealth") is computed.column(df, "wealth")
+    other = df.copy()
+    assert computed.column(other, "wealth") is not computed.column(df, "wealth")
+    assert list(computed.augment(df).columns)[-1] == "wealth"
+
+    with pytest.raises(ValueError):
+        computed.add("health", "gdp_per_capita", df)  # colonne existante
+    with pytest.raises(ValueError):
+        computed.add("2x", "gdp_per_capita * 2", df)
+
+
+def test_columns_reach_table_filters_and_stats(qapp):
+    """Vérifie que la colonne apparaît dans la table, les filtres et les stats"""
+    df = make_df()
+    computed = ComputedColumns()
+    table = CountriesWidget(df, computed=computed)
+    stats = StatsWidget(df, computed=computed)
+    computed.add("wealth", "gdp_per_capita * health", df)
+
+    assert table.model.virtual_columns() == ["wealth"]
+    assert table.custom_col_combo.findText("wealth") > 0
+    table.proxy.set_range("wealth", 0.8, None)
+    table.proxy.flush()
+    assert table.proxy.rowCount() == 2
+
+    assert stats.varhist.findText("wealth") >= 0
+    assert "wealth" in stats.panel.indicators
+
+    computed.remove("wealth")
+    assert table.model.virtual_columns() == []
+    assert stats.varcomp.findText("wealth") < 0
+    qapp.processEvents()
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+from PySide6.QtWidgets import QApplication
+
+
+@pytest.fixture
+def qapp():
+    """Fixture pour créer une QApplication une seule fois"""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+@pytest.fixture
+def sample_df():
+    """Petit jeu de données : 4 pays sur 2019-2020, avec trous.
+
+    Pérou absent en 2019, États-Unis absents en 2020 (nom GeoJSON différent),
+    PIB du Chili manquant en 2020.
+    """
+    return pd.DataFrame(
+        {
+            "Country": ["France", "Chile", "France", "Chile", "Peru", "United States"],
+            "Year": [2020, 2019, 2019, 2020, 2020, 2019],
+            "continent": ["Europe", "America", "Europe"] + ["America"] * 3,
+            "happiness_score": [6.7, 6.4, 6.5, 6.2, 5.8, 7.0],
+            "gdp_per_capita": [1.4, 1.1, 1.3, np.nan, 0.9, 1.5],
+        }
+    )
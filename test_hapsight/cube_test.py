@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from hapsight.countrieswidget import CountriesWidget
+from hapsight.cube import WORLD, cube_for
+
+
+def make_df():
+    return pd.DataFrame(
+        {
+            "Country": ["A", "B", "C", "A", "B", "C"],
+            "Year": [2019, 2019, 2019, 2020, 2020, 2020],
+            "continent": ["Africa", "Africa", "Europe"] * 2,
+            "happiness_score": [4.0, 5.0, 7.0, 4.5, np.nan, 7.2],
+        }
+    )
+
+
+def test_cell_aggregates():
+    """Vérifie les agrégats d'une cellule (continent, année, indicateur)"""
+    df = make_df()
+    cube = cube_for(df)
+    assert cube is cube_for(df)
+    assert cube.continents == ["Africa", "Europe", WORLD]
+    assert cube.value("Africa", 2019, "happiness_score", "mean") == 4.5
+    assert cube.value("Africa", 2019, "happiness_score", "std") == 0.5
+    assert cube.value("Africa", 2020, "happiness_score", "count") == 1
+    assert cube.value(WORLD, 2019, "happiness_score", "max") == 7.0
+    assert cube.value(WORLD, 2019, "happiness_score", "median") == 5.0
+    assert cube.quantile(WORLD, 2019, "happiness_score", 0.25) == 4.5
+    assert np.isnan(cube.value("Asia", 2019, "happiness_score", "mean"))
+    assert np.isnan(cube.value("Africa", 2031, "happiness_score", "mean"))
+
+
+def test_quantile_missing_cell():
+    """Vérifie qu'un quantile hors du cube vaut NaN, comme value()"""
+    df = make_df()
+    df = df[df["Year"] != 2020].assign(Year=[2019, 2019, 2021])
+    cube = cube_for(df)
+    assert np.isnan(cube.quantile("Asia", 2019, "happiness_score", 0.5))
+    assert np.isnan(cube.quantile("Africa", 2019, "gdp", 0.5))
+    assert np.isnan(cube.quantile("Africa", 2031, "happiness_score", 0.5))
+    # 2020 est dans l'intervalle mais absente : pas les déciles de 2021
+    assert np.isnan(cube.quantile("Europe", 2020, "happiness_score", 0.5))
+    assert cube.quantile("Europe", 2021, "happiness_score", 0.5) == 7.0
+
+
+def test_pivot_view(qapp):
+    """Vérifie la vue pivot du tableau des pays"""
+    w = CountriesWidget(make_df())
+    w.pivot_stat.setCurrentText("Nombre")
+    w.chk_pivot.setChecked(True)
+    assert w.views.currentIndex() == 1
+    pivot = w.pivot_model.df()
+    assert list(pivot.columns) == ["Continent", "2019", "2020"]
+    assert pivot["2020"].tolist() == [1, 1, 2]
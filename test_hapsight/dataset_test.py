@@ -0,0 +1,53 @@
+import time
+
+import pandas as pd
+import pytest
+
+from hapsight.dataset import diff_frames, load_normalized, normalize_data
+from hapsight.workers import run_in_background
+
+
+def test_normalize_data():
+    """Vérifie le nettoyage des colonnes et des types"""
+    raw = pd.DataFrame(
+        {" country ": ["A"], "year": ["2019"], "happiness_score": ["7.5"]}
+    )
+    df = normalize_data(raw)
+    assert list(df.columns) == ["Country", "Year", "happiness_score"]
+    assert df["Year"].dtype.kind == "i"
+    assert df["happiness_score"].iloc[0] == pytest.approx(7.5)
+
+
+def test_load_in_background(qapp):
+    """Vérifie le chargement des données sur un thread du pool"""
+    results = []
+    worker = run_in_background(load_normalized, on_done=results.append)
+    deadline = time.perf_counter() + 10
+    while not results and time.perf_counter() < deadline:
+        qapp.processEvents()
+    assert worker is not None
+    assert isinstance(results[0], pd.DataFrame)
+    assert len(results[0]) > 0
+
+
+def test_diff_frames_appended_year():
+    """Vérifie le diff quand une nouvelle année est ajoutée"""
+    old = load_normalized()
+    added = old[old["Year"] == 2020].assign(Year=2021)
+    new = pd.concat([old, added], ignore_index=True)
+    new.loc[0, "happiness_score"] = 0.5
+
+    diff = diff_frames(old, new)
+    assert not diff.full_reload
+    assert diff.inserted == len(added)
+    assert diff.changed_rows == [0]
+    assert diff.removed_rows == []
+    assert diff.years == {int(old.loc[0, "Year"]), 2021}
+    assert len(diff.merged) == len(new)
+
+
+def test_diff_frames_schema_change():
+    """Vérifie qu'un changement de colonnes force un rechargement complet"""
+    old = load_normalized()
+    diff = diff_frames(old, old.drop(columns=["cpi_score"]))
+    assert diff.full_reload
@@ -0,0 +1,76 @@
+import threading
+import time
+
+import numpy as np
+
+from hapsight.countrieswidget import (
+    CountriesWidget,
+    FilterState,
+    evaluate_filters,
+)
+
+
+def wait_for(qapp, condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.005)
+    return condition()
+
+
+def test_evaluate_filters_reuses_cached_parts(sample_df):
+    """Vérifie que seuls les filtres non mémorisés sont recalculés"""
+    df = sample_df
+    state = FilterState("", None, "America", 2020, (("happiness_score", 4.5, None),))
+    cached = {"continent": np.array([True, False, False, False, False, False])}
+    masks, mask = evaluate_filters(df, state, cached)
+    assert masks["continent"] is cached["continent"]
+    assert masks["name"] is None
+    assert mask.tolist() == [True, False, False, False, False, False]
+
+    cancelled = threading.Event()
+    cancelled.set()
+    assert evaluate_filters(df, state, {}, cancelled) is None
+
+
+def test_changes_are_coalesced(qapp, sample_df):
+    """Vérifie que des changements rapprochés donnent un seul passage"""
+    w = CountriesWidget(sample_df)
+    passes = []
+    w.proxy.filtersApplied.connect(lambda: passes.append(w.proxy.rowCount()))
+
+    w.continent_combo.setCurrentText("America")
+    w.year_combo.setCurrentText("2020")
+    w.name_input.setText("chi")
+    assert w.proxy.rowCount() == 6  # rien d'appliqué pendant le délai
+
+    assert wait_for(qapp, lambda: w.proxy.rowCount() == 1)
+    assert passes == [1]
+
+
+def test_stale_evaluation_is_dropped(qapp, sample_df):
+    """Vérifie qu'une évaluation dépassée n'est jamais appliquée"""
+    w = CountriesWidget(sample_df)
+    w.continent_combo.setCurrentText("Europe")
+    w.proxy._evaluate()  # worker lancé avec l'ancien état
+    w.continent_combo.setCurrentText("America")
+    w.proxy.flush()
+    assert w.proxy.rowCount() == 4
+
+    assert wait_for(qapp, lambda: not w.proxy._workers)
+    assert w.proxy.rowCount() == 4
+
+
+def test_reset_is_single_transaction(qapp, sample_df):
+    """Vérifie que la réinitialisation ne filtre qu'une fois"""
+    w = CountriesWidget(sample_df)
+    w.continent_combo.setCurrentText("America")
+    w.proxy.set_range("happiness_score", 6.3, None)
+    w.proxy.flush()
+    assert w.proxy.rowCount() == 2
+
+    passes = []
+    w.proxy.filtersApplied.connect(lambda: passes.append(w.proxy.rowCount()))
+    w.reset_filters()
+    assert wait_for(qapp, lambda: w.proxy.rowCount() == 6)
+    assert passes == [6]
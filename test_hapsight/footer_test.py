@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+from PySide6.QtCore import Qt
+
+from hapsight.countrieswidget import CountriesWidget, column_summary
+
+
+def make_df():
+    "Un score manquant et une colonne entièrement vide"
+    return pd.DataFrame(
+        {
+            "Country": ["France", "Chile", "Peru", "Spain"],
+            "Year": [2020, 2020, 2020, 2019],
+            "continent": ["Europe", "America", "America", "Europe"],
+            "happiness_score": [6.0, 5.0, 4.0, np.nan],
+            "generosity": [np.nan] * 4,
+        }
+    )
+
+
+def test_column_summary():
+    """Vérifie les réductions sur les lignes du masque"""
+    values = np.array([[1.0, 10.0], [2.0, np.nan], [6.0, 30.0]])
+    stats = column_summary(values, np.array([True, True, False]))
+    np.testing.assert_array_equal(stats[:, 0], [1.5, 1.0, 2.0, 1.5])
+    np.testing.assert_array_equal(stats[:, 1], [10.0, 10.0, 10.0, 10.0])
+    assert np.isnan(column_summary(values, np.zeros(3, dtype=bool))).all()
+
+
+def test_footer_follows_filters(qapp):
+    """Vérifie que le pied de tableau suit les filtres"""
+    df = make_df()
+    w = CountriesWidget(df)
+    col = list(df.columns).index("happiness_score")
+    empty = list(df.columns).index("generosity")
+    footer = w.footer_model
+    assert footer.headerData(0, Qt.Orientation.Vertical) == "Moyenne"
+    assert footer.data(footer.index(0, col)) == "5.000"
+    for row in range(footer.rowCount()):
+        assert footer.data(footer.index(row, empty)) == ""  # que des NaN
+
+    w.continent_combo.setCurrentText("America")
+    w.proxy.flush()
+    qapp.processEvents()
+    assert footer.data(footer.index(0, col)) == "4.500"
+    assert footer.data(footer.index(1, col)) == "4.000"
+    assert footer.data(footer.index(0, 0)) == ""  # colonne texte
+
+    w.name_input.setText("spa")
+    w.proxy.flush()
+    qapp.processEvents()
+    assert w.proxy.rowCount() == 0
+    assert footer.data(footer.index(0, col)) == ""
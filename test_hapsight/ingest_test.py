@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from hapsight.dataset import load_normalized
+from hapsight.ingest import (
+    IngestCancelled,
+    IngestController,
+    IngestError,
+    map_columns,
+    read_dataset,
+)
+
+
+@pytest.fixture
+def kaggle_like(tmp_path):
+    """CSV avec les noms de colonnes du World Happiness Report"""
+    df = load_normalized().rename(
+        columns={
+            "Country": "Country name",
+            "happiness_score": "Ladder score",
+            "gdp_per_capita": "Economy (GDP per Capita)",
+            "continent": "Regional indicator",
+            "Year": "year",
+        }
+    )
+    path = tmp_path / "whr.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+def test_map_columns_aliases():
+    """Vérifie la correspondance des colonnes vers le schéma attendu"""
+    mapping = map_columns(["Country name", "Ladder score", "year", "Other"])
+    assert mapping == {
+        "Country name": "Country",
+        "Ladder score": "happiness_score",
+        "year": "Year",
+    }
+    with pytest.raises(IngestError):
+        map_columns(["Country", "Year"])
+
+
+def test_read_dataset_chunked_csv(kaggle_like):
+    """Vérifie la lecture par blocs avec progression"""
+    steps = []
+    df = read_dataset(str(kaggle_like), progress=steps.append, chunk_rows=100)
+    assert len(df) == len(load_normalized())
+    assert {"Country", "Year", "happiness_score", "continent"} <= set(df.columns)
+    assert steps[-1] == 100
+    assert steps == sorted(steps)
+
+
+def test_read_dataset_parquet(tmp_path):
+    """Vérifie la lecture d'un fichier Parquet"""
+    path = tmp_path / "data.parquet"
+    load_normalized().to_parquet(path)
+    df = read_dataset(str(path), chunk_rows=200)
+    assert len(df) == len(load_normalized())
+
+
+def test_read_dataset_cancel(kaggle_like):
+    """Vérifie l'annulation entre deux blocs"""
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(IngestCancelled):
+        read_dataset(str(kaggle_like), cancel=cancel, chunk_rows=100)
+
+
+def test_ingest_controller(qapp, kaggle_like):
+    """Vérifie le chargement en arrière-plan via le contrôleur"""
+    controller = IngestController()
+    loaded = []
+    controller.loaded.connect(loaded.append)
+    controller.start(str(kaggle_like))
+    deadline = time.perf_counter() + 10
+    while not loaded and time.perf_counter() < deadline:
+        qapp.processEvents()
+    assert isinstance(loaded[0], pd.DataFrame)
+    assert not controller.is_running()
@@ -0,0 +1,41 @@
+import pytest
+
+from hapsight.latency_harness import (
+    LatencyStats,
+    compare_reports,
+    format_comparison,
+    run_harness,
+)
+
+
+def test_latency_stats_percentiles():
+    """Vérifie le calcul des percentiles"""
+    stats = LatencyStats()
+    for v in range(1, 101):
+        stats.add(float(v))
+    s = stats.summary()
+    assert s["n"] == 100
+    assert s["p50_ms"] == pytest.approx(50.5)
+    assert s["p50_ms"] <= s["p95_ms"] <= s["p99_ms"] <= s["max_ms"]
+
+
+def test_compare_reports_flags_regression():
+    """Vérifie qu'une hausse du p95 au-delà du seuil est signalée"""
+    base = {"interactions": {"a": {"n": 5, "p50_ms": 1, "p95_ms": 2, "p99_ms": 3}}}
+    cur = {"interactions": {"a": {"n": 5, "p50_ms": 1, "p95_ms": 4, "p99_ms": 3}}}
+    rows = compare_reports(base, cur, threshold=0.1)
+    assert rows[0]["regression"]
+    assert "REGRESSION" in format_comparison(rows)
+
+
+def test_harness_search_keystroke(qapp):
+    """Vérifie que le harnais pilote la recherche et produit un rapport"""
+    import pandas as pd
+
+    df = pd.read_csv("dataset/happiness.csv")
+    report = run_harness(df, interactions=["search_keystroke"], repeat=1)
+    summary = report["interactions"]["search_keystroke"]
+    assert summary["n"] > 0
+    assert summary["p99_ms"] >= summary["p50_ms"]
+    # Mesuré jusqu'au filtre appliqué, sans court-circuiter le délai
+    assert summary["p50_ms"] >= report["filter_debounce_ms"]
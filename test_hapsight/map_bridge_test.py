@@ -0,0 +1,49 @@
+import json
+
+import pandas as pd
+
+from hapsight.map_bridge import tooltip_payload
+from hapsight.mapwidget import MapWidget
+
+
+def test_tooltip_payload(sample_df):
+    """Vérifie la table compacte envoyée à la page"""
+    js = tooltip_payload(
+        sample_df,
+        [("Bonheur", "happiness_score"), ("PIB", "gdp_per_capita"), ("X", "absent")],
+    )
+    assert js.startswith("hapsightSetData(") and js.endswith(");")
+    payload = json.loads(js[len("hapsightSetData(") : -2])
+    assert payload["names"] == ["Chile", "France", "Peru", "United States of America"]
+    assert payload["labels"] == ["Bonheur", "PIB"]
+    assert payload["values"]["2019"] == [[6.4, 6.5, None, 7.0], [1.1, 1.3, None, 1.5]]
+    assert payload["values"]["2020"] == [
+        [6.2, 6.7, 5.8, None],
+        [None, 1.4, 0.9, None],
+    ]
+
+
+def test_tooltip_payload_missing_rank():
+    """Vérifie qu'un score NaN et des rangs Int64 manquants (pd.NA) donnent null"""
+    df = pd.DataFrame(
+        {
+            "Country": ["France", "Chile", "Peru"],
+            "Year": [2020, 2019, 2019],
+            "happiness_score": [6.5, 6.0, float("nan")],
+            "Calculated Rank": pd.array([pd.NA, 1, pd.NA], dtype="Int64"),
+        }
+    )
+    js = tooltip_payload(
+        df, [("Bonheur", "happiness_score"), ("Rang", "Calculated Rank")]
+    )
+    payload = json.loads(js[len("hapsightSetData(") : -2])
+    assert payload["values"]["2019"] == [[6.0, None, None], [1.0, None, None]]
+    assert payload["values"]["2020"] == [[None, 6.5, None], [None, None, None]]
+
+
+def test_bridge_selects_country(qapp, sample_df):
+    """Vérifie qu'un clic transmis par QWebChannel met à jour le dashboard"""
+    w = MapWidget(sample_df)
+    w.bridge.select("France")
+    assert w.pays_actuel == "France"
+    assert w.lbl_score_valeur.text() == "6.70"
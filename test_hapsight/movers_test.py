@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from hapsight.movers import top_k, year_change
+from hapsight.movers_panel import MoversPanel
+from hapsight.panel import Panel
+
+
+def make_df():
+    return pd.DataFrame(
+        {
+            "Country": ["A", "B", "C", "D"] * 2,
+            "Year": [2019] * 4 + [2020] * 4,
+            "happiness_score": [5.0, 6.0, 7.0, 4.0, 6.0, 5.0, 7.5, np.nan],
+        }
+    )
+
+
+def test_top_k():
+    """Vérifie la sélection partielle (NaN ignorés, ordre décroissant)"""
+    values = np.array([3.0, np.nan, 9.0, -1.0, 5.0])
+    assert top_k(values, 2).tolist() == [2, 4]
+    assert top_k(values, 2, largest=False).tolist() == [3, 0]
+    assert top_k(values, 10).tolist() == [2, 4, 0, 3]
+
+
+def test_year_change():
+    """Vérifie écarts, variations et rangs entre deux années"""
+    panel = Panel.from_frame(make_df())
+    change = year_change(panel, 2019, 2020)
+    assert change is year_change(panel, 2019, 2020)
+    assert year_change(panel, 2019, 2031) is None
+
+    rows = change.rows("happiness_score", change.top("happiness_score", k=2))
+    assert [r["country"] for r in rows] == ["A", "C"]
+    assert rows[0]["delta"] == 1.0 and rows[0]["pct"] == 20.0
+    assert rows[0]["rank_start"] == 3 and rows[0]["rank_end"] == 2
+
+    shifts = change.top("happiness_score", "rank_shift", k=1, largest=False)
+    assert change.countries[shifts[0]] == "B"  # 2e -> 3e
+
+
+def test_panel_widget(qapp):
+    """Vérifie les tables du panneau des évolutions"""
+    w = MoversPanel()
+    w.set_data(make_df())
+    w.show()
+    assert w.combo_start.currentText() == "2019"
+    assert w.combo_end.currentText() == "2020"
+    assert w.risers_table.item(0, 0).text() == "A"
+    assert w.fallers_table.item(0, 0).text() == "B"
+    assert w.fallers_table.rowCount() == 3
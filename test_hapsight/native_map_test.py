@@ -0,0 +1,155 @@
+import importlib
+import json
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from hapsight.animation import compute_year_frames
+from hapsight.cache import GEOJSON_URL, store_asset
+from hapsight.native_map import (
+    CountryGeometry,
+    GridIndex,
+    NativeMapView,
+    PathCache,
+    load_geometry,
+    project,
+    simplify,
+)
+
+# Deux pays : un carré troué et un pays en deux morceaux
+GEOJSON = {
+    "type": "FeatureCollection",
+    "features": [
+        {
+            "type": "Feature",
+            "properties": {"name": "France"},
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [
+                    [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]],
+                    [[4, 4], [6, 4], [6, 6], [4, 6], [4, 4]],
+                ],
+            },
+        },
+        {
+            "type": "Feature",
+            "properties": {"name": "United States of America"},
+            "geometry": {
+                "type": "MultiPolygon",
+                "coordinates": [
+                    [[[20, 0], [30, 0], [30, 10], [20, 10], [20, 0]]],
+                    [[[40, 0], [45, 0], [45, 5], [40, 5], [40, 0]]],
+                ],
+            },
+        },
+    ],
+}
+
+
+def at(lon, lat):
+    x, y = project(np.array([lon]), np.array([lat]))[0]
+    return float(x), float(y)
+
+
+def test_flat_arrays():
+    """Vérifie la conversion du GeoJSON en tableaux plats"""
+    geometry = CountryGeometry.from_geojson(GEOJSON)
+    assert geometry.names == ["France", "United States of America"]
+    assert list(geometry.ring_country) == [0, 0, 1, 1]
+    assert list(geometry.ring_offsets) == [0, 5, 10, 15, 20]
+    assert geometry.coords.dtype == np.float32
+
+
+def test_hit_testing():
+    """Vérifie la recherche du pays sous un point (trous compris)"""
+    index = GridIndex(CountryGeometry.from_geojson(GEOJSON))
+    assert index.country_at(*at(2, 2)) == 0
+    assert index.country_at(*at(5, 5)) is None
+    assert index.country_at(*at(42, 2)) == 1
+    assert index.country_at(*at(35, 5)) is None
+
+
+def test_paths_cached_per_level():
+    """Vérifie la mise en cache des tracés par niveau de détail"""
+    paths = PathCache(CountryGeometry.from_geojson(GEOJSON))
+    assert paths.path(0, 0) is paths.path(0, 0)
+    assert paths.path(0, 0) is not paths.path(0, 1)
+    ring = np.array([[0, 0], [0.01, 0], [0.02, 0], [5, 0], [5, 5], [0, 0]])
+    assert len(simplify(ring, 1.0)) < len(ring)
+
+
+def test_geometry_cached(tmp_path, monkeypatch):
+    """Vérifie le prétraitement une seule fois (.npz en cache)"""
+    monkeypatch.setenv("HAPSIGHT_CACHE_DIR", str(tmp_path))
+    store_asset(GEOJSON_URL, json.dumps(GEOJSON).encode())
+    first = load_geometry()
+    assert list(tmp_path.glob("geometry-*.npz"))
+    second = load_geometry()
+    assert second.names == first.names
+    np.testing.assert_array_equal(second.coords, first.coords)
+
+
+def test_view_click_and_colors(qapp):
+    """Vérifie le clic et la coloration de la carte native"""
+    view = NativeMapView()
+    view.set_geometry(CountryGeometry.from_geojson(GEOJSON))
+    clicked = []
+    view.countryClicked.connect(clicked.append)
+    assert view.select_at(*at(2, 2)) == "France"
+    assert clicked == ["France"]
+
+    df = pd.DataFrame(
+        {
+            "Country": ["France", "United States"],
+            "Year": [2020, 2020],
+            "happiness_score": [6.5, 7.0],
+        }
+    )
+    frames = compute_year_frames(df)
+    view.show_frame(frames, 2020)
+    usa = view.items[1].brush().color().name()
+    assert usa != view.items[0].brush().color().name()
+
+
+def test_mapwidget_native(qapp, tmp_path, monkeypatch):
+    """Vérifie le mode natif du MapWidget, sans QtWebEngine"""
+    from hapsight.mapwidget import MapWidget
+
+    monkeypatch.setenv("HAPSIGHT_CACHE_DIR", str(tmp_path))
+    store_asset(GEOJSON_URL, json.dumps(GEOJSON).encode())
+    df = pd.DataFrame(
+        {
+            "Country": ["France"],
+            "Year": [2020],
+            "continent": ["Europe"],
+            "happiness_score": [6.5],
+        }
+    )
+    w = MapWidget(df, native=True)
+    assert w.web_view is None
+    deadline = time.perf_counter() + 10
+    while w.map_view.geometry is None and time.perf_counter() < deadline:
+        qapp.processEvents()
+    w.map_view.select_at(*at(2, 2))
+    assert w.pays_actuel == "France"
+
+
+def test_mapwidget_native_without_webengine(qapp, tmp_path, monkeypatch):
+    """Vérifie que le mode natif ne charge jamais QtWebEngine"""
+    for name in [
+        "PySide6.QtWebEngineCore",
+        "PySide6.QtWebEngineWidgets",
+        "PySide6.QtWebChannel",
+    ]:
+        monkeypatch.setitem(sys.modules, name, None)  # import -> ImportError
+    for name in ["hapsight.mapwidget", "hapsight.offline"]:
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    mapwidget = importlib.import_module("hapsight.mapwidget")
+
+    monkeypatch.setenv("HAPSIGHT_CACHE_DIR", str(tmp_path))
+    df = pd.DataFrame({"Country": ["France"], "Year": [2020], "happiness_score": [6.5]})
+    w = mapwidget.MapWidget(df, native=True)
+    assert w.web_view is None and w.map_view is not None
+    assert "hapsight.offline" not in sys.modules
@@ -0,0 +1,40 @@
+import numpy as np
+
+from hapsight.panel import Panel, panel_for
+
+
+def test_axes_and_mask(sample_df):
+    """Vérifie les axes du tableau et le masque des cellules absentes"""
+    panel = Panel.from_frame(sample_df)
+    assert panel.countries == ["Chile", "France", "Peru", "United States"]
+    assert panel.years.tolist() == [2019, 2020]
+    assert panel.indicators == ["happiness_score", "gdp_per_capita"]
+    assert panel.values.shape == (4, 2, 2)
+    assert panel.values.flags["C_CONTIGUOUS"]
+    assert panel.continents == ["America", "Europe", "America", "America"]
+    assert panel.mask[2, 0].all()  # Peru 2019
+    assert panel.mask[3, 1].all()  # États-Unis 2020
+    assert panel.mask[0, 1, 1]  # PIB du Chili en 2020
+
+
+def test_slices(sample_df):
+    """Vérifie séries, valeurs d'une année et écarts"""
+    panel = Panel.from_frame(sample_df)
+    np.testing.assert_array_equal(panel.series("France", "happiness_score"), [6.5, 6.7])
+    np.testing.assert_array_equal(
+        panel.year_values(2020, "happiness_score"), [6.2, 6.7, 5.8, np.nan]
+    )
+    np.testing.assert_allclose(panel.deltas("happiness_score")[:2, 0], [-0.2, 0.2])
+    assert np.isnan(panel.change("happiness_score", 2019, 2020)[2])
+    assert panel.series("Atlantis", "happiness_score") is None
+
+    history = panel.history("Peru", ["happiness_score"])
+    assert history["Year"].tolist() == [2020]
+    assert history["happiness_score"].tolist() == [5.8]
+
+
+def test_cached_per_data_version(sample_df):
+    """Vérifie que le panel n'est construit qu'une fois par DataFrame"""
+    df = sample_df
+    assert panel_for(df) is panel_for(df)
+    assert panel_for(df.copy()) is not panel_for(df)
@@ -0,0 +1,94 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+from PySide6.QtCore import QThreadPool
+
+from hapsight.mapwidget import MapWidget
+from hapsight.prefetch import (
+    PREFETCH_THREADS,
+    DashboardEntry,
+    DashboardPrefetcher,
+    build_entry,
+)
+from hapsight.ranking import ranks_for
+
+
+def wait_for(qapp, condition, timeout=10):
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        qapp.processEvents()
+        time.sleep(0.01)
+    return condition()
+
+
+def test_build_entry(sample_df):
+    """Vérifie le contenu préparé pour un pays (sans réseau)"""
+    data = MapWidget._prepare_df(sample_df, ranks_for(sample_df))
+    entry = build_entry(data, "France", 2020, lambda _: None, (200, 150), 100)
+    assert entry.record["happiness_score"] == 6.7
+    assert entry.history["Year"].tolist() == [2019, 2020]
+    assert entry.flag is None
+    assert entry.sparkline is not None and entry.sparkline.startswith(b"\x89PNG")
+
+
+def test_lru_eviction(qapp):
+    """Vérifie l'éviction des entrées les plus anciennes"""
+    prefetcher = DashboardPrefetcher(capacity=2)
+    empty = pd.DataFrame()
+    for name in ["A", "B", "C"]:
+        entry = DashboardEntry(name, 2020, None, empty, None, None)
+        prefetcher._store((name, 2020), prefetcher._version, entry)
+    assert prefetcher.get("A", 2020) is None
+    assert prefetcher.get("C", 2020) is not None
+
+    prefetcher.invalidate()
+    assert prefetcher.get("C", 2020) is None
+
+
+def test_hover_then_click_uses_prefetch(qapp, monkeypatch, sample_df):
+    """Vérifie que le clic réutilise le drapeau et la courbe préchargés"""
+    fetched = []
+    monkeypatch.setattr(
+        "hapsight.prefetch.fetch_flag", lambda iso: fetched.append(iso) or None
+    )
+    w = MapWidget(sample_df)
+    w.combo_annee.setCurrentText("2020")
+    w.bridge.hover("France")
+    assert wait_for(qapp, lambda: w.prefetcher.get("France", 2020) is not None)
+    assert fetched == ["fr"]
+
+    monkeypatch.setattr(
+        "hapsight.mapwidget.fetch_flag", lambda iso: pytest.fail("requête au clic")
+    )
+    w.bridge.select("France")
+    assert w.lbl_score_valeur.text() == "6.70"
+    assert w.graph_stack.currentWidget() is w.lbl_sparkline
+
+
+def test_only_latest_request_stays_queued(qapp, monkeypatch):
+    """Vérifie le pool dédié et l'abandon des demandes périmées en file"""
+    release = threading.Event()
+    built = []
+
+    def slow_build(data, country, year, *args):
+        release.wait(5)
+        built.append(country)
+        return DashboardEntry(country, year, None, pd.DataFrame(), None, None)
+
+    monkeypatch.setattr("hapsight.prefetch.build_entry", slow_build)
+    prefetcher = DashboardPrefetcher()
+    assert prefetcher.pool is not QThreadPool.globalInstance()
+    assert prefetcher.pool.maxThreadCount() == PREFETCH_THREADS
+
+    for name in ["A", "B", "C"]:
+        prefetcher.request(None, name, 2020, lambda _: None, (200, 150), 100)
+        if name == "A":
+            assert wait_for(qapp, lambda: prefetcher.pool.activeThreadCount() == 1)
+    assert set(prefetcher._pending) == {("A", 2020), ("C", 2020)}
+
+    release.set()
+    assert wait_for(qapp, lambda: not prefetcher._pending)
+    assert built == ["A", "C"]
+    assert prefetcher.get("B", 2020) is None
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+from PySide6.QtCore import QPoint, Qt
+from PySide6.QtTest import QTest
+
+from hapsight.countrieswidget import CountriesWidget
+from hapsight.range_slider import ColumnDistribution, RangeSlider
+
+
+def make_df():
+    "Un score à valeur unique (étendue nulle) et un PIB manquant"
+    return pd.DataFrame(
+        {
+            "Country": ["France", "Chile", "Peru", "Spain"],
+            "Year": [2020, 2020, 2020, 2019],
+            "continent": ["Europe", "America", "America", "Europe"],
+            "happiness_score": [5.0, 5.0, 5.0, 5.0],
+            "gdp_per_capita": [1.0, 1.2, 1.4, np.nan],
+        }
+    )
+
+
+def test_count_between():
+    """Vérifie le comptage par searchsorted (bornes incluses, NaN exclus)"""
+    dist = ColumnDistribution.from_values([3.0, 1.0, np.nan, 2.0, 2.0])
+    assert dist.sorted_values.tolist() == [1.0, 2.0, 2.0, 3.0]
+    assert dist.counts.sum() == 4
+    assert dist.count_between(None, None) == 4
+    assert dist.count_between(2.0, 2.0) == 2
+    assert dist.count_between(1.5, None) == 3
+    assert dist.count_between(None, 1.0) == 1
+    assert dist.count_between(2.5, 1.5) == 0
+
+
+def test_drag_updates_then_commits(qapp):
+    """Vérifie que le glissement n'émet rangeCommitted qu'au relâchement"""
+    slider = RangeSlider()
+    slider.resize(200, 40)
+    slider.set_distribution(ColumnDistribution.from_values(np.arange(11.0)))
+    changed, committed = [], []
+    slider.rangeChanged.connect(lambda lo, hi: changed.append((lo, hi)))
+    slider.rangeCommitted.connect(lambda lo, hi: committed.append((lo, hi)))
+
+    QTest.mousePress(slider, Qt.MouseButton.LeftButton, pos=QPoint(100, 30))
+    assert changed and not committed
+    QTest.mouseRelease(slider, Qt.MouseButton.LeftButton, pos=QPoint(100, 30))
+    assert len(committed) == 1
+    low, high = committed[0]
+    assert low is not None and 4.0 < low < 6.0
+    assert high is None
+
+    slider.reset()
+    assert slider.range() == (None, None)
+
+
+def test_filter_applied_on_release(qapp):
+    """Vérifie que le tableau n'est refiltré qu'au relâchement du curseur"""
+    widget = CountriesWidget(make_df())
+    range_filter = widget.range_filters["gdp_per_capita"]
+    range_filter.slider.set_range(1.1, None)
+    assert range_filter.count_label.text() == "2 / 3"
+    assert widget.proxy.rowCount() == 4
+
+    range_filter.slider.rangeCommitted.emit(*range_filter.range())
+    widget.proxy.flush()
+    assert widget.proxy.rowCount() == 2
+
+    widget.reset_filters()
+    widget.proxy.flush()
+    assert widget.proxy.rowCount() == 4
+    assert range_filter.range() == (None, None)
+
+
+def test_single_value_column(qapp):
+    """Vérifie une colonne à valeur unique : étendue élargie, bornes cohérentes"""
+    dist = ColumnDistribution.from_values([5.0, 5.0, 5.0])
+    assert (dist.low, dist.high) == (5.0, 6.0)
+    assert dist.count_between(5.0, 5.0) == 3
+
+    widget = CountriesWidget(make_df())
+    range_filter = widget.range_filters["happiness_score"]
+    assert range_filter.count_label.text() == "4 / 4"
+    range_filter.slider.set_range(5.0, None)  # en butée : pas de borne
+    assert range_filter.range() == (None, None)
+    range_filter.slider.set_range(5.5, None)
+    assert range_filter.count_label.text() == "0 / 4"
+    range_filter.slider.rangeCommitted.emit(*range_filter.range())
+    widget.proxy.flush()
+    assert widget.proxy.rowCount() == 0
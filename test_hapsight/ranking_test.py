@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+
+from hapsight.countrieswidget import CountriesWidget
+from hapsight.dataset import diff_frames
+from hapsight.ranking import (
+    compute_ranks,
+    pct_column,
+    rank_column,
+    ranks_for,
+    update_ranks,
+)
+
+
+def make_df():
+    return pd.DataFrame(
+        {
+            "Country": ["A", "B", "C", "A", "B", "C"],
+            "Year": [2019, 2019, 2019, 2020, 2020, 2020],
+            "continent": ["Europe"] * 6,
+            "happiness_score": [7.0, 7.0, 5.0, 6.0, 8.0, 4.0],
+        }
+    )
+
+
+def test_tie_methods():
+    """Vérifie le traitement des ex æquo selon la méthode"""
+    df = make_df()
+    col = rank_column("happiness_score")
+    assert list(compute_ranks(df, method="min")[col][:3]) == [1, 1, 3]
+    assert list(compute_ranks(df, method="dense")[col][:3]) == [1, 1, 2]
+    assert list(compute_ranks(df, method="first")[col][:3]) == [1, 2, 3]
+    assert list(compute_ranks(df, method="average")[col][:3]) == [1.5, 1.5, 3.0]
+    with pytest.raises(ValueError):
+        compute_ranks(df, method="inconnue")
+
+
+def test_percentiles_per_year():
+    """Vérifie que les centiles sont calculés année par année"""
+    pcts = compute_ranks(make_df())[pct_column("happiness_score")]
+    assert pcts[4] == pytest.approx(100.0)
+    assert pcts[5] == pytest.approx(100 / 3)
+
+
+def test_update_ranks_matches_full_recompute():
+    """Vérifie que le recalcul partiel donne le même résultat qu'un complet"""
+    old = make_df()
+    new = old.copy()
+    new.loc[5, "happiness_score"] = 9.0
+    diff = diff_frames(old, new)
+    ranks_for(old)
+    partial = update_ranks(old, diff.merged, diff.years)
+    full = compute_ranks(diff.merged)
+    pd.testing.assert_frame_equal(partial, full)
+
+
+def test_virtual_rank_columns(qapp):
+    """Vérifie l'ajout des colonnes de rang dans la table des pays"""
+    df = make_df()
+    w = CountriesWidget(df)
+    n = w.model.columnCount()
+    w.chk_ranks.setChecked(True)
+    assert w.model.columnCount() == n + 2
+    assert w.model.virtual_columns() == [
+        rank_column("happiness_score"),
+        pct_column("happiness_score"),
+    ]
+    assert w.model.data(w.model.index(2, n)) == "3"
+
+    w.tie_combo.setCurrentText("dense")
+    assert w.model.data(w.model.index(2, n)) == "2"
+
+    w.chk_ranks.setChecked(False)
+    assert w.model.columnCount() == n
@@ -0,0 +1,48 @@
+import time
+
+import pandas as pd
+
+from hapsight.countrieswidget import CountriesWidget
+from hapsight.dataset import diff_frames, load_normalized
+from hapsight.reload import DatasetWatcher
+
+
+def test_model_apply_diff_inserts_rows(qapp):
+    """Vérifie que le diff est poussé au modèle sans reset"""
+    old = load_normalized()
+    widget = CountriesWidget(old)
+    events = []
+    widget.model.modelReset.connect(lambda: events.append("reset"))
+    widget.model.rowsInserted.connect(lambda *a: events.append("insert"))
+    widget.model.dataChanged.connect(lambda *a: events.append("changed"))
+
+    new = pd.concat([old, old[old["Year"] == 2020].assign(Year=2021)])
+    new = new.reset_index(drop=True)
+    new.loc[3, "happiness_score"] = 1.0
+    widget.apply_diff(diff_frames(old, new))
+
+    assert events == ["changed", "insert"]
+    assert widget.model.rowCount() == len(new)
+    assert widget.year_combo.findText("2021") > 0
+
+
+def test_watcher_emits_diff(qapp, tmp_path):
+    """Vérifie qu'une modification du CSV produit un diff incrémental"""
+    path = tmp_path / "happiness.csv"
+    old = load_normalized()
+    old.to_csv(path, index=False)
+
+    watcher = DatasetWatcher(str(path), load_normalized(str(path)))
+    diffs = []
+    watcher.datasetChanged.connect(diffs.append)
+
+    pd.concat([old, old[old["Year"] == 2020].assign(Year=2021)]).to_csv(
+        path, index=False
+    )
+    deadline = time.perf_counter() + 10
+    while not diffs and time.perf_counter() < deadline:
+        qapp.processEvents()
+        time.sleep(0.01)
+
+    assert diffs and diffs[0].years == {2021}
+    assert len(watcher.current) == len(diffs[0].merged)
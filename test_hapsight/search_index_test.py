@@ -0,0 +1,68 @@
+import pandas as pd
+
+from hapsight.countrieswidget import CountriesWidget
+from hapsight.search_index import SearchIndex, fold
+
+NAMES = ["France", "Finland", "United States", "Côte d'Ivoire", "Ireland", "France"]
+
+
+def test_fold():
+    """Vérifie la suppression des accents et de la ponctuation"""
+    assert fold("  Côte d'Ivoire ") == "cote d ivoire"
+    assert fold("ÉTATS-Unis") == "etats unis"
+
+
+def test_aliases_and_accents():
+    """Vérifie la recherche par alias et sans accents"""
+    index = SearchIndex(NAMES)
+    assert index.search("USA") == ["United States"]
+    assert index.search("etats") == ["United States"]
+    assert index.search("cote") == ["Côte d'Ivoire"]
+
+
+def test_prefix_ranked_first():
+    """Vérifie que les préfixes passent avant les sous-chaînes"""
+    index = SearchIndex(NAMES)
+    assert index.search("fr") == ["France"]
+    assert index.search("land") == ["Finland", "Ireland"]
+    assert index.search("i")[0] == "Ireland"
+
+
+def test_fuzzy_match():
+    """Vérifie la tolérance aux fautes de frappe"""
+    index = SearchIndex(NAMES)
+    assert index.search("Frnace")[0] == "France"
+    assert index.search("Frnace", fuzzy=False) == []
+
+
+def test_narrowing_reuses_previous_results():
+    """Vérifie qu'une requête plus longue donne le même résultat qu'à froid"""
+    index = SearchIndex(NAMES)
+    for query in ["f", "fi", "fin", "finl"]:
+        assert index.search(query) == SearchIndex(NAMES).search(query)
+    assert index._last_query == "finl"
+
+
+def test_rows():
+    """Vérifie les positions des lignes renvoyées"""
+    index = SearchIndex(NAMES)
+    assert list(index.rows("france")) == [0, 5]
+
+
+def test_countries_filter_uses_index(qapp):
+    """Vérifie que le filtre par nom de la table passe par l'index"""
+    df = pd.DataFrame(
+        {
+            "Country": ["United States", "France", "Finland"],
+            "Year": [2020, 2020, 2020],
+            "continent": ["America", "Europe", "Europe"],
+            "happiness_score": [7.0, 6.5, 7.8],
+        }
+    )
+    w = CountriesWidget(df)
+    w.name_input.setText("Etats-Unis")
+    w.proxy.flush()
+    assert w.proxy.rowCount() == 1
+    w.name_input.setText("")
+    w.proxy.flush()
+    assert w.proxy.rowCount() == 3
@@ -0,0 +1,32 @@
+import json
+import time
+
+from PySide6.QtWidgets import QWidget
+
+from hapsight.startup_profiler import SPAN_PHASES, StartupProfiler
+from hapsight.tracing import TRACER, span
+
+
+def test_startup_profile_phases(qapp, tmp_path):
+    """Vérifie le découpage en phases et l'écriture du rapport JSON"""
+    output = tmp_path / "profile.json"
+    t0 = time.perf_counter_ns()
+    profiler = StartupProfiler(str(output), import_ns=(t0, t0 + 1_000_000))
+
+    for name in SPAN_PHASES:
+        with span(name):
+            pass
+
+    window = QWidget()
+    profiler.watch(window)
+    window.show()
+    deadline = time.perf_counter() + 5
+    while not output.exists() and time.perf_counter() < deadline:
+        qapp.processEvents()
+
+    report = json.loads(output.read_text())
+    names = [p["name"] for p in report["phases"]]
+    for phase in ("imports", "load_data", "StatsWidget", "first_paint"):
+        assert phase in names
+    assert not report["timed_out"]
+    assert TRACER.enabled is profiler._tracing_was_enabled
@@ -0,0 +1,80 @@
+import numpy as np
+from PySide6.QtCore import Qt
+
+from hapsight.computed import ComputedColumns
+from hapsight.cube import cube_for
+from hapsight.panel import panel_for
+from hapsight.stats_widget import StatsWidget
+
+
+def item(widget, name):
+    model = widget._multi_model
+    return next(
+        model.item(i) for i in range(model.rowCount()) if model.item(i).text() == name
+    )
+
+
+def test_multi_plot_toggles_single_line(qapp, sample_df):
+    """Vérifie qu'une case cochée n'ajoute ou ne retire que sa courbe"""
+    w = StatsWidget(sample_df)
+    w.varcomp.setCurrentText("happiness_score")
+    item(w, "France").setCheckState(Qt.CheckState.Checked)
+    france = w._multi_lines["France"]
+    np.testing.assert_array_equal(france.get_xdata(), [2019, 2020])
+    np.testing.assert_array_equal(france.get_ydata(), [6.5, 6.7])
+
+    item(w, "Chile").setCheckState(Qt.CheckState.Checked)
+    assert w._multi_lines["France"] is france
+    assert len(w._multi_ax.lines) == 2
+
+    item(w, "Chile").setCheckState(Qt.CheckState.Unchecked)
+    assert set(w._multi_lines) == {"France"}
+    assert w._multi_ax.lines[0] is france
+    qapp.processEvents()
+
+
+def test_multi_plot_variable_in_place(qapp, sample_df):
+    """Vérifie le changement de variable sans recréer les courbes"""
+    w = StatsWidget(sample_df)
+    w.varcomp.setCurrentText("happiness_score")
+    item(w, "France").setCheckState(Qt.CheckState.Checked)
+    france = w._multi_lines["France"]
+    w.varcomp.setCurrentText("gdp_per_capita")
+    assert w._multi_lines["France"] is france
+    np.testing.assert_array_equal(france.get_ydata(), [1.3, 1.4])
+
+    w.clear_multi_selection()
+    assert not w._multi_lines and not w.selected_countries
+    qapp.processEvents()  # dessins différés (draw_idle) avant le test suivant
+
+
+def test_all_countries_single_collection(qapp, sample_df):
+    """Vérifie la vue « tous les pays » : une LineCollection et les bandes"""
+    w = StatsWidget(sample_df)
+    w.varcomp.setCurrentText("happiness_score")
+    w.chk_all_countries.setChecked(True)
+    lines, bands = w._spaghetti
+    assert len(w._multi_ax.collections) == 2
+    segments = lines.get_segments()
+    assert len(segments) == 4  # Pérou et États-Unis : un seul point
+    np.testing.assert_array_equal(segments[0], [[2019, 6.4], [2020, 6.2]])  # Chile
+    np.testing.assert_array_equal(segments[1], [[2019, 6.5], [2020, 6.7]])
+    assert len(bands.get_paths()) == 2  # Europe et Amérique
+
+    item(w, "France").setCheckState(Qt.CheckState.Checked)
+    assert w._spaghetti[0] is lines
+    assert w._multi_lines["France"].get_zorder() > lines.get_zorder()
+    qapp.processEvents()
+
+
+def test_shares_panel_and_cube_with_source(qapp, sample_df):
+    """Vérifie que panel et cube sont ceux du DataFrame partagé"""
+    df = sample_df
+    computed = ComputedColumns()
+    w = StatsWidget(df, computed=computed)
+    assert w.panel is panel_for(df)
+    assert cube_for(w._panel_df) is cube_for(df)
+
+    computed.add("wealth", "gdp_per_capita * 2", df)
+    assert w.panel is not panel_for(df)
+    assert "wealth" in w.panel.indicators
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from hapsight.perf_panel import PerformancePanel
+from hapsight.tracing import TRACER, span, traced
+
+
+@pytest.fixture
+def tracer():
+    """Active le traceur global le temps d'un test"""
+    previous = TRACER.enabled
+    TRACER.clear()
+    TRACER.enable(True)
+    yield TRACER
+    TRACER.enable(previous)
+    TRACER.clear()
+
+
+def test_span_disabled_is_noop():
+    """Vérifie qu'aucun span n'est enregistré quand le traçage est coupé"""
+    previous = TRACER.enabled
+    TRACER.enable(False)
+    TRACER.clear()
+    with span("test.off"):
+        pass
+    assert TRACER.recent() == []
+    TRACER.enable(previous)
+
+
+def test_span_and_decorator_recorded(tracer):
+    """Vérifie l'enregistrement des spans et des appels décorés"""
+
+    @traced("test.deco")
+    def f(x):
+        return x * 2
+
+    with span("test.block"):
+        assert f(2) == 4
+
+    names = [s.name for s in tracer.recent()]
+    assert names == ["test.deco", "test.block"]
+    stats = tracer.stats()
+    assert stats["test.deco"]["count"] == 1
+    assert sum(stats["test.block"]["histogram"]) == 1
+
+
+def test_chrome_trace_export(tracer, tmp_path):
+    """Vérifie l'export au format Chrome trace"""
+    with span("test.export"):
+        pass
+    path = tmp_path / "trace.json"
+    tracer.export_chrome_trace(str(path))
+    events = json.loads(path.read_text())["traceEvents"]
+    assert events[0]["name"] == "test.export"
+    assert events[0]["ph"] == "X"
+
+
+def test_perf_panel_refresh(qapp, tracer):
+    """Vérifie que le panneau affiche les handlers tracés"""
+    with span("test.panel"):
+        pass
+    panel = PerformancePanel()
+    panel.refresh()
+    assert panel.handlers_table.rowCount() == 1
+    assert panel.recent_table.item(0, 0).text() == "test.panel"
@@ -0,0 +1,28 @@
+import gc
+
+import pandas as pd
+
+from hapsight import versioned
+from hapsight.versioned import cached, lookup
+
+
+def test_cached_per_object_and_key():
+    """Vérifie le calcul unique par (objet, clé) et l'oubli avec l'objet"""
+    calls = []
+
+    def build():
+        calls.append(1)
+        return None  # un résultat None est mémorisé aussi
+
+    df = pd.DataFrame({"a": [1]})
+    assert cached(df, "k", build) is None
+    assert cached(df, "k", build) is None
+    assert len(calls) == 1
+    assert cached(df, ("k", 2), lambda: 2) == 2
+    assert cached(df.copy(), "k", lambda: 3) == 3
+    assert lookup(df, "absente", "défaut") == "défaut"
+
+    key = (id(df), "k")
+    del df
+    gc.collect()
+    assert key not in versioned._CACHE
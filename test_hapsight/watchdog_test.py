@@ -0,0 +1,60 @@
+import threading
+import time
+
+from PySide6.QtCore import QTimer
+
+from hapsight.watchdog import StallWatchdog
+
+
+def blocking_handler():
+    time.sleep(0.2)
+
+
+def test_watchdog_detects_stall(qapp):
+    """Vérifie qu'un blocage du thread GUI est détecté et attribué"""
+    watchdog = StallWatchdog(threshold_ms=50)
+    watchdog.start()
+
+    deadline = time.perf_counter() + 0.6
+    QTimer.singleShot(50, blocking_handler)
+    while time.perf_counter() < deadline:
+        qapp.processEvents()
+        time.sleep(0.005)
+    watchdog.stop()
+
+    assert watchdog.stall_count >= 1
+    top = watchdog.top_offenders(1)[0]
+    assert "blocking_handler" in top.key
+    assert top.max_ms >= 150
+    assert "blocage" in watchdog.report()
+
+
+def short_handler():
+    time.sleep(0.05)
+
+
+def long_handler():
+    time.sleep(0.05)
+
+
+def stall(watchdog, late_s, handler):
+    "Bloque le thread principal dans handler, battement en retard de late_s"
+    watchdog._last_beat = time.perf_counter() - watchdog.heartbeat - late_s
+    sampler = threading.Timer(0.01, watchdog._sample)
+    sampler.start()
+    handler()
+    sampler.join()
+    watchdog._beat()
+
+
+def test_short_stall_not_blamed_on_next(qapp):
+    """Vérifie qu'un retard sous le seuil n'est pas imputé au blocage suivant"""
+    watchdog = StallWatchdog(threshold_ms=200, heartbeat_ms=100)
+    stall(watchdog, 0.12, short_handler)  # ~170 ms de retard : sous le seuil
+    assert watchdog.stall_count == 0
+    assert watchdog._samples == []
+
+    stall(watchdog, 0.3, long_handler)
+    assert watchdog.stall_count == 1
+    (key,) = watchdog.offenders
+    assert "long_handler" in key